@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import alerts, appointments, auth, insurance, patient_portal, patients, ws
+from app.api.v1 import admin, alerts, appointments, auth, changes, exports, health, insurance, patient_portal, patients, rules, stats, ws
 
 api_router = APIRouter()
 
@@ -9,5 +9,11 @@ api_router.include_router(appointments.router)
 api_router.include_router(patients.router)
 api_router.include_router(insurance.router)
 api_router.include_router(alerts.router)
+api_router.include_router(changes.router)
 api_router.include_router(ws.router)
 api_router.include_router(patient_portal.router)
+api_router.include_router(stats.router)
+api_router.include_router(rules.router)
+api_router.include_router(exports.router)
+api_router.include_router(health.router)
+api_router.include_router(admin.router)
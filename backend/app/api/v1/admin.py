@@ -0,0 +1,23 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.v1.auth import get_super_admin
+from app.core.principals import UserPrincipal
+from app.core.profiling import profile_buffer
+from app.schemas.profiling import ProfileDetail, ProfileSummary
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def list_profiles(user: UserPrincipal = Depends(get_super_admin)) -> List[ProfileSummary]:
+    return [ProfileSummary(**profile) for profile in profile_buffer.list()]
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileDetail)
+async def get_profile(profile_id: int, user: UserPrincipal = Depends(get_super_admin)) -> ProfileDetail:
+    profile = profile_buffer.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or already evicted")
+    return ProfileDetail(**profile)
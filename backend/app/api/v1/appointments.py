@@ -1,14 +1,27 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.auth import get_current_user
-from app.db.models import Appointment, InsuranceRecord, Patient, User, VerificationStatus
-from app.db.session import get_session
-from app.schemas.appointment import AppointmentCreate, AppointmentList, AppointmentRead, InsuranceSummary, PatientSummary
+from app.core.columnar import ColumnarResponse, columnar_payload, wants_columnar
+from app.core.config import settings
+from app.core.loader import RecordLoader, parse_id_list
+from app.core.principals import UserPrincipal
+from app.db.models import Appointment, AppointmentBoardEntry, InsuranceRecord, Patient, VerificationStatus
+from app.db.session import get_read_session
+from app.schemas.appointment import (
+    AppointmentAvailability,
+    AppointmentCreate,
+    AppointmentList,
+    AppointmentRead,
+    InsuranceSummary,
+    PatientSummary,
+)
+from app.services.availability import slot_index
+from app.services.insurance import current_insurance_record
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 
@@ -32,39 +45,24 @@ def _normalize_status(value: Optional[str]) -> VerificationStatus:
     return VerificationStatus.needs_review
 
 
-@router.get("/", response_model=AppointmentList)
-async def list_appointments(
-    from_time: Optional[str] = None,
-    to_time: Optional[str] = None,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
-) -> AppointmentList:
-    start = _parse_timestamp(from_time, datetime.utcnow())
-    end_default = start + timedelta(days=3)
-    end = _parse_timestamp(to_time, end_default)
-    stmt = select(Appointment).where(
-        Appointment.clinic_id == user.clinic_id,
-        Appointment.scheduled_time >= start,
-        Appointment.scheduled_time <= end,
+def _insurance_summary(record: InsuranceRecord | None) -> InsuranceSummary | None:
+    if not record:
+        return None
+    return InsuranceSummary(
+        provider=record.provider,
+        status=record.status.value,
+        copay=record.copay,
+        last_checked=record.last_checked,
     )
-    result = await session.execute(stmt)
-    appointments = result.scalars().all()
+
+
+async def appointment_reads(loader: RecordLoader, appointments: list[Appointment]) -> list[AppointmentRead]:
+    patient_ids = [appointment.patient_id for appointment in appointments]
+    patients = await loader.load_many(Patient, patient_ids)
+    insurance_records = await loader.load_related(InsuranceRecord, "patient_id", patient_ids)
     payload = []
     for appointment in appointments:
-        patient = await session.get(Patient, appointment.patient_id)
-        insurance = None
-        record = (
-            await session.execute(
-                select(InsuranceRecord).filter_by(patient_id=appointment.patient_id)
-            )
-        ).scalars().first()
-        if record:
-            insurance = InsuranceSummary(
-                provider=record.provider,
-                status=record.status.value,
-                copay=record.copay,
-                last_checked=record.last_checked,
-            )
+        patient = patients.get(appointment.patient_id)
         if patient:
             patient_summary = PatientSummary(
                 id=patient.id,
@@ -73,6 +71,7 @@ async def list_appointments(
             )
         else:
             patient_summary = PatientSummary(id=0, first_name="", last_name="")
+        records = insurance_records.get(appointment.patient_id)
         payload.append(
             AppointmentRead(
                 id=appointment.id,
@@ -81,47 +80,180 @@ async def list_appointments(
                 copay=appointment.copay,
                 provider=appointment.provider,
                 patient=patient_summary,
-                insurance=insurance,
+                insurance=_insurance_summary(records[0] if records else None),
             )
         )
+    return payload
+
+
+BOARD_COLUMNS = [
+    "id",
+    "scheduled_time",
+    "verification_status",
+    "copay",
+    "provider",
+    "patient_id",
+    "patient_first_name",
+    "patient_last_name",
+    "insurance_provider",
+    "insurance_status",
+    "insurance_copay",
+    "insurance_last_checked",
+]
+BOARD_DICTIONARIES = {
+    "verification_status": "status",
+    "insurance_status": "status",
+    "provider": "provider",
+    "insurance_provider": "provider",
+}
+
+
+async def _board_rows(
+    session: AsyncSession,
+    clinic_id: int,
+    start: datetime,
+    end: datetime,
+    appointment_ids: list[int] | None,
+) -> list:
+    # Plain column tuples from the projection: one index range scan, no joins and no ORM identity map.
+    board = AppointmentBoardEntry
+    stmt = select(
+        board.appointment_id,
+        board.scheduled_time,
+        board.verification_status,
+        board.copay,
+        board.provider,
+        board.patient_id,
+        board.patient_first_name,
+        board.patient_last_name,
+        board.insurance_provider,
+        board.insurance_status,
+        board.insurance_copay,
+        board.insurance_last_checked,
+    ).where(board.clinic_id == clinic_id)
+    if appointment_ids is not None:
+        stmt = stmt.where(board.appointment_id.in_(appointment_ids))
+    else:
+        stmt = stmt.where(board.scheduled_time >= start, board.scheduled_time <= end)
+    rows = (await session.execute(stmt)).all()
+    if appointment_ids is not None:
+        position = {appointment_id: index for index, appointment_id in enumerate(appointment_ids)}
+        rows.sort(key=lambda row: position[row[0]])
+    return rows
+
+
+def _board_read(row) -> AppointmentRead:
+    (
+        appointment_id,
+        scheduled_time,
+        status,
+        copay,
+        provider,
+        patient_id,
+        first_name,
+        last_name,
+        insurance_provider,
+        insurance_status,
+        insurance_copay,
+        insurance_last_checked,
+    ) = row
+    if first_name is not None:
+        patient = PatientSummary(id=patient_id, first_name=first_name, last_name=last_name)
+    else:
+        patient = PatientSummary(id=0, first_name="", last_name="")
+    insurance = None
+    if insurance_provider is not None:
+        insurance = InsuranceSummary(
+            provider=insurance_provider,
+            status=insurance_status.value,
+            copay=insurance_copay,
+            last_checked=insurance_last_checked,
+        )
+    return AppointmentRead(
+        id=appointment_id,
+        scheduled_time=scheduled_time,
+        verification_status=status.value,
+        copay=copay,
+        provider=provider,
+        patient=patient,
+        insurance=insurance,
+    )
+
+
+@router.get("/", response_model=AppointmentList)
+async def list_appointments(
+    request: Request,
+    response: Response,
+    from_time: Optional[str] = None,
+    to_time: Optional[str] = None,
+    ids: Optional[str] = None,
+    response_format: Optional[Literal["json", "columnar"]] = Query(None, alias="format"),
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
+) -> AppointmentList:
+    start = _parse_timestamp(from_time, datetime.utcnow())
+    end = _parse_timestamp(to_time, start + timedelta(days=3))
+    rows = await _board_rows(session, user.clinic_id, start, end, parse_id_list(ids))
+    response.headers["Vary"] = "Accept"
+    if wants_columnar(request, response_format):
+        return ColumnarResponse(columnar_payload(BOARD_COLUMNS, rows, BOARD_DICTIONARIES), headers={"Vary": "Accept"})
+    payload = [_board_read(row) for row in rows]
     return AppointmentList(appointments=payload, total=len(payload))
 
 
+def availability_window(from_time: Optional[datetime], to_time: Optional[datetime]) -> tuple[datetime, datetime]:
+    start = from_time or datetime.utcnow()
+    end = to_time or start + timedelta(days=1)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="to_time must be after from_time")
+    if end - start > timedelta(days=settings.availability_max_days):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Availability spans at most {settings.availability_max_days} days",
+        )
+    return start, end
+
+
+@router.get("/availability", response_model=AppointmentAvailability)
+async def appointment_availability(
+    provider: str,
+    from_time: Optional[datetime] = None,
+    to_time: Optional[datetime] = None,
+    user: UserPrincipal = Depends(get_current_user),
+) -> AppointmentAvailability:
+    start, end = availability_window(from_time, to_time)
+    return AppointmentAvailability(
+        provider=provider,
+        slot_minutes=settings.appointment_slot_minutes,
+        slots=await slot_index.free_slots(user.clinic_id, provider, start, end),
+    )
+
+
 @router.post("/", response_model=AppointmentRead, status_code=201)
 async def create_appointment(
     payload: AppointmentCreate,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
 ) -> AppointmentRead:
     patient = await session.get(Patient, payload.patient_id)
     if not patient or patient.clinic_id != user.clinic_id:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    appointment = Appointment(
-        patient_id=payload.patient_id,
-        clinic_id=user.clinic_id,
-        scheduled_time=payload.scheduled_time,
-        provider=payload.provider,
-        copay=payload.copay,
-        verification_status=_normalize_status(payload.verification_status),
-    )
-    session.add(appointment)
-    await session.commit()
-    await session.refresh(appointment)
+    def build_appointment() -> Appointment:
+        return Appointment(
+            patient_id=payload.patient_id,
+            clinic_id=user.clinic_id,
+            scheduled_time=payload.scheduled_time,
+            provider=payload.provider,
+            copay=payload.copay,
+            verification_status=_normalize_status(payload.verification_status),
+        )
+
+    appointment = await slot_index.book(user.clinic_id, build_appointment)
 
     record = (
-        await session.execute(
-            select(InsuranceRecord).filter_by(patient_id=payload.patient_id)
-        )
+        await session.execute(current_insurance_record(payload.patient_id))
     ).scalars().first()
-    insurance = None
-    if record:
-        insurance = InsuranceSummary(
-            provider=record.provider,
-            status=record.status.value,
-            copay=record.copay,
-            last_checked=record.last_checked,
-        )
     patient_summary = PatientSummary(
         id=patient.id,
         first_name=patient.first_name,
@@ -134,5 +266,5 @@ async def create_appointment(
         copay=appointment.copay,
         provider=appointment.provider,
         patient=patient_summary,
-        insurance=insurance,
+        insurance=_insurance_summary(record),
     )
@@ -1,15 +1,20 @@
 from datetime import timedelta
-from typing import Literal
+from typing import Callable, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, decode_access_token, hash_password, verify_password
+from app.core.hashing import password_hasher
+from app.core.principals import UserPrincipal, user_principals
+from app.core.rate_limit import rate_limiter
+from app.core.security import create_access_token, decode_access_token
+from app.core.write_coordinator import write_coordinator
 from app.db.models import Clinic, User
-from app.db.session import get_session
+from app.db.sharding import select_clinic
+from app.db.session import get_read_session
 from app.schemas.auth import LoginPayload, Token, SignupPayload
 from app.schemas.user import UserRead
 
@@ -22,67 +27,140 @@ async def _get_user_by_email(session: AsyncSession, email: str) -> User | None:
     return result.scalars().first()
 
 
+def _principal(user: User) -> UserPrincipal:
+    return UserPrincipal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        clinic_id=user.clinic_id,
+        created_at=user.created_at,
+        token_version=user.token_version or 0,
+    )
+
+
+def _access_token(user: User) -> str:
+    return create_access_token(
+        subject=user.email,
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+        extra_claims={"uid": user.id, "cid": user.clinic_id, "role": user.role, "ver": user.token_version or 0},
+    )
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_session),
-) -> User:
+    session: AsyncSession = Depends(get_read_session),
+) -> UserPrincipal:
     payload = decode_access_token(token)
     email = payload.get("sub")
+    user_id = payload.get("uid")
     if not email:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    user = await _get_user_by_email(session, email)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
-
 
-async def get_super_admin(user: User = Depends(get_current_user)) -> User:
+    principal = user_principals.get(user_id) if user_id is not None else None
+    if principal is None:
+        if user_id is not None:
+            user = await session.get(User, user_id)
+        else:
+            # Tokens issued before identity claims were added are resolved by email until they expire.
+            user = await _get_user_by_email(session, email)
+        if not user or user.email != email:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = _principal(user)
+        user_principals.put(principal.id, principal)
+    if payload.get("ver", 0) != principal.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    await select_clinic(principal.clinic_id)
+    return principal
+
+
+async def get_super_admin(user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     if user.role != "super_admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Super admin required")
     return user
 
 
+def rate_limited(
+    name: str,
+    limit: int,
+    window_seconds: float,
+    scope: Literal["user", "clinic"] = "user",
+) -> Callable:
+    async def dependency(response: Response, user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
+        subject = user.id if scope == "user" else user.clinic_id
+        decision = await rate_limiter.acquire(f"{name}:{scope}:{subject}", limit, window_seconds)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers=decision.headers(),
+            )
+        response.headers.update(decision.headers())
+        return user
+
+    return dependency
+
+
 DEMO_ADMIN_EMAIL = "demo@clinic.com"
 
 
 @router.post("/login", response_model=Token)
-async def login(payload: LoginPayload, session: AsyncSession = Depends(get_session)) -> Token:
+async def login(payload: LoginPayload, session: AsyncSession = Depends(get_read_session)) -> Token:
     user = await _get_user_by_email(session, payload.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    # Hand the connection back before bcrypt; the loaded user stays usable once detached.
+    await session.close()
 
     is_demo_login = user.email == DEMO_ADMIN_EMAIL
-    if not is_demo_login and not verify_password(payload.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    access_token = create_access_token(subject=user.email, expires_delta=timedelta(minutes=settings.access_token_expire_minutes))
-    return Token(access_token=access_token)
+    if not is_demo_login:
+        verified, new_hash = await password_hasher.verify(payload.password, user.hashed_password)
+        if not verified:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        if new_hash:
+            async def store_rehash(write_session: AsyncSession) -> None:
+                await write_session.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+
+            await write_coordinator.submit(store_rehash)
+    return Token(access_token=_access_token(user))
 
 
 @router.post("/register", response_model=Token)
-async def register(payload: SignupPayload, session: AsyncSession = Depends(get_session)) -> Token:
-    existing = await session.execute(select(User).filter_by(email=payload.email))
-    if existing.scalars().first():
+async def register(payload: SignupPayload, session: AsyncSession = Depends(get_read_session)) -> Token:
+    if await _get_user_by_email(session, payload.email):
+        raise HTTPException(status_code=409, detail="Email already registered")
+    await session.close()
+
+    hashed_password = await password_hasher.hash(payload.password)
+
+    async def create_user(write_session: AsyncSession) -> User | None:
+        clinic = (await write_session.execute(select(Clinic).filter_by(name=payload.clinic_name))).scalars().first()
+        if not clinic:
+            clinic = Clinic(name=payload.clinic_name, timezone="UTC")
+            write_session.add(clinic)
+            await write_session.flush()
+        # Another registration may have claimed the email while this one was hashing.
+        if (await write_session.execute(select(User.id).filter_by(email=payload.email))).first():
+            return None
+        user = User(email=payload.email, hashed_password=hashed_password, role=payload.role, clinic_id=clinic.id)
+        write_session.add(user)
+        await write_session.flush()
+        return user
+
+    user = await write_coordinator.submit(create_user)
+    if user is None:
         raise HTTPException(status_code=409, detail="Email already registered")
+    return Token(access_token=_access_token(user))
 
-    clinic = (await session.execute(select(Clinic).filter_by(name=payload.clinic_name))).scalars().first()
-    if not clinic:
-        clinic = Clinic(name=payload.clinic_name, timezone="UTC")
-        session.add(clinic)
-        await session.flush()
-
-    user = User(
-        email=payload.email,
-        hashed_password=hash_password(payload.password),
-        role=payload.role,
-        clinic_id=clinic.id,
-    )
-    session.add(user)
-    await session.commit()
 
-    token = create_access_token(subject=user.email, expires_delta=timedelta(minutes=settings.access_token_expire_minutes))
-    return Token(access_token=token)
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_tokens(user: UserPrincipal = Depends(get_current_user)) -> None:
+    async def bump_version(session: AsyncSession) -> None:
+        await session.execute(update(User).where(User.id == user.id).values(token_version=User.token_version + 1))
+
+    await write_coordinator.submit(bump_version)
+    user_principals.invalidate(user.id)
 
 
 @router.get("/me", response_model=UserRead)
-async def get_profile(user: User = Depends(get_current_user)) -> UserRead:
+async def get_profile(user: UserPrincipal = Depends(get_current_user)) -> UserRead:
     return user
@@ -0,0 +1,81 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.appointments import appointment_reads
+from app.api.v1.auth import get_current_user
+from app.core.loader import RecordLoader, get_loader
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principals import UserPrincipal
+from app.db.models import Alert, Appointment, ChangeLogEntry, ChangeLogHorizon
+from app.db.session import get_read_session
+from app.schemas.changes import ChangeFeed
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+def _decode_token(token: str) -> int:
+    values = decode_cursor(token)
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise HTTPException(status_code=400, detail="Invalid change token")
+    return values[0]
+
+
+@router.get("", response_model=ChangeFeed)
+async def list_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    session: AsyncSession = Depends(get_read_session),
+    loader: RecordLoader = Depends(get_loader),
+    user: UserPrincipal = Depends(get_current_user),
+) -> ChangeFeed:
+    if since is None:
+        # A client starts by fetching its window in full, then polls from the current head.
+        head = await session.scalar(
+            select(func.max(ChangeLogEntry.seq)).where(ChangeLogEntry.clinic_id == user.clinic_id)
+        )
+        return ChangeFeed(next_token=encode_cursor(head or 0))
+
+    after = _decode_token(since)
+    horizon = await session.scalar(select(ChangeLogHorizon.seq).where(ChangeLogHorizon.clinic_id == user.clinic_id))
+    if horizon is not None and after < horizon:
+        raise HTTPException(status_code=410, detail="Change token has expired; refetch the window and poll again")
+    stmt = (
+        select(ChangeLogEntry.seq, ChangeLogEntry.entity, ChangeLogEntry.entity_id, ChangeLogEntry.op)
+        .where(ChangeLogEntry.clinic_id == user.clinic_id, ChangeLogEntry.seq > after)
+        .order_by(ChangeLogEntry.seq)
+        .limit(limit + 1)
+    )
+    rows = (await session.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return ChangeFeed(next_token=since)
+
+    # Several changes to one row collapse into its latest operation.
+    latest: dict[tuple[str, int], str] = {}
+    for _, entity, entity_id, op in rows:
+        latest[(entity, entity_id)] = op
+    changed = {"appointment": [], "alert": []}
+    deleted = {"appointment": [], "alert": []}
+    for (entity, entity_id), op in latest.items():
+        (deleted if op == "delete" else changed)[entity].append(entity_id)
+
+    appointments = await loader.load_many(Appointment, changed["appointment"], clinic_id=user.clinic_id)
+    deleted["appointment"] += [key for key in changed["appointment"] if key not in appointments]
+    alerts = []
+    if changed["alert"]:
+        alerts = (await session.execute(select(Alert).where(Alert.id.in_(changed["alert"])))).scalars().all()
+        found = {alert.id for alert in alerts}
+        deleted["alert"] += [key for key in changed["alert"] if key not in found]
+
+    return ChangeFeed(
+        appointments=await appointment_reads(loader, list(appointments.values())),
+        alerts=alerts,
+        deleted_appointments=deleted["appointment"],
+        deleted_alerts=deleted["alert"],
+        next_token=encode_cursor(rows[-1][0]),
+        has_more=has_more,
+    )
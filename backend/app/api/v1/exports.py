@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.api.v1.auth import get_current_user
+from app.core.principals import UserPrincipal
+from app.db.models import Appointment, Patient, VerificationLog
+from app.services.exports import stream_export
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.strip()
+        try:
+            return float(params[2:]) > 0 if params.startswith("q=") else True
+        except ValueError:
+            return False
+    return False
+
+
+def _export_response(
+    stmt: Select,
+    name: str,
+    export_format: str,
+    compress: bool,
+    clinic_id: int,
+    accept_encoding: Optional[str],
+) -> StreamingResponse:
+    filename = f"{name}.{export_format}"
+    media_type = _MEDIA_TYPES[export_format]
+    headers = {"Vary": "Accept-Encoding"}
+    if compress:
+        # An explicit request for a compressed file gets a .gz download rather than a transfer encoding.
+        filename += ".gz"
+        media_type = "application/gzip"
+    elif _accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        compress = True
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        stream_export(stmt, export_format, compress=compress, clinic_id=clinic_id),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@router.get("/verification-logs")
+async def export_verification_logs(
+    from_time: Optional[datetime] = None,
+    to_time: Optional[datetime] = None,
+    format: Literal["csv", "ndjson"] = "csv",
+    compress: bool = False,
+    accept_encoding: Optional[str] = Header(None),
+    user: UserPrincipal = Depends(get_current_user),
+) -> StreamingResponse:
+    stmt = (
+        select(
+            VerificationLog.id,
+            VerificationLog.patient_id,
+            VerificationLog.appointment_id,
+            VerificationLog.status,
+            VerificationLog.provider,
+            VerificationLog.copay,
+            VerificationLog.last_checked,
+            VerificationLog.details,
+        )
+        .where(VerificationLog.clinic_id == user.clinic_id)
+        .order_by(VerificationLog.id)
+    )
+    if from_time:
+        stmt = stmt.where(VerificationLog.last_checked >= from_time)
+    if to_time:
+        stmt = stmt.where(VerificationLog.last_checked <= to_time)
+    return _export_response(stmt, "verification_logs", format, compress, user.clinic_id, accept_encoding)
+
+
+@router.get("/appointments")
+async def export_appointments(
+    from_time: Optional[datetime] = None,
+    to_time: Optional[datetime] = None,
+    format: Literal["csv", "ndjson"] = "csv",
+    compress: bool = False,
+    accept_encoding: Optional[str] = Header(None),
+    user: UserPrincipal = Depends(get_current_user),
+) -> StreamingResponse:
+    stmt = (
+        select(
+            Appointment.id,
+            Appointment.patient_id,
+            Patient.first_name,
+            Patient.last_name,
+            Appointment.scheduled_time,
+            Appointment.status,
+            Appointment.verification_status,
+            Appointment.provider,
+            Appointment.copay,
+            Appointment.created_at,
+            Appointment.updated_at,
+        )
+        .join(Patient, Patient.id == Appointment.patient_id)
+        .where(Appointment.clinic_id == user.clinic_id)
+        .order_by(Appointment.scheduled_time, Appointment.id)
+    )
+    if from_time:
+        stmt = stmt.where(Appointment.scheduled_time >= from_time)
+    if to_time:
+        stmt = stmt.where(Appointment.scheduled_time <= to_time)
+    return _export_response(stmt, "appointments", format, compress, user.clinic_id, accept_encoding)
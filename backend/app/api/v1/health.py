@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import text
+
+from app.api.v1.auth import get_super_admin
+from app.core.hashing import password_hasher
+from app.core.lifecycle import lifecycle
+from app.core.principals import UserPrincipal
+from app.db.session import read_engine
+from app.schemas.health import Liveness, PasswordHashingStats, Readiness
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", response_model=Liveness)
+async def liveness() -> Liveness:
+    return Liveness(status="alive")
+
+
+@router.get("/ready", response_model=Readiness)
+async def readiness(response: Response) -> Readiness:
+    database = False
+    if lifecycle.ready:
+        try:
+            async with read_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            database = True
+        except Exception:
+            database = False
+    ready = lifecycle.ready and database
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return Readiness(
+        status="ready" if ready else "starting" if not lifecycle.ready else "unavailable",
+        database=database,
+        boot_seconds=lifecycle.boot_seconds,
+        initial_sweep=lifecycle.initial_sweep,
+    )
+
+
+@router.get("/password-hashing", response_model=PasswordHashingStats)
+async def password_hashing_stats(user: UserPrincipal = Depends(get_super_admin)) -> PasswordHashingStats:
+    return PasswordHashingStats(**password_hasher.stats())
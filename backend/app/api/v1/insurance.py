@@ -1,16 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.middleware import SlowAPIMiddleware
 
-from app.api.v1.auth import get_current_user
+from app.api.v1.auth import get_current_user, rate_limited
 from app.core.config import settings
-from app.db.models import Appointment, User
-from app.db.session import get_session
+from app.core.principals import UserPrincipal
+from app.core.write_coordinator import write_coordinator
+from app.db.models import Appointment, InsuranceRecord, VerificationStatus
+from app.db.session import get_read_session
 from app.schemas.insurance import ReverifyResponse
 from app.schemas.insurance import (
     SimulationResponse,
+    SimulationResult,
 )
 from app.schemas.payer import PayerVerificationRequest, PayerVerificationResponse
 from app.services.insurance import run_insurance_check
@@ -18,28 +18,27 @@ from app.services.insurance import run_verification_simulation
 from app.services.payer import simulate_payer_lookup
 
 router = APIRouter(prefix="/insurance", tags=["insurance"])
-limiter = Limiter(key_func=get_remote_address)
+reverify_limit = rate_limited("reverify", settings.reverify_rate_limit, settings.reverify_rate_window)
 
 
 @router.post("/{appointment_id}/reverify", response_model=ReverifyResponse)
-@limiter.limit("5/minute")
 async def reverify_insurance(
-    request: Request,
     appointment_id: int,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(reverify_limit),
 ) -> ReverifyResponse:
-    appointment = await session.get(Appointment, appointment_id)
-    if not appointment or appointment.clinic_id != user.clinic_id:
-        raise HTTPException(status_code=404, detail="Appointment not found")
+    async def reverify(session: AsyncSession) -> tuple[Appointment, InsuranceRecord, VerificationStatus]:
+        appointment = await session.get(Appointment, appointment_id)
+        if not appointment or appointment.clinic_id != user.clinic_id:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        record, status = await run_insurance_check(
+            session,
+            appointment,
+            provider_name=appointment.provider or settings.provider_names[0],
+            manual=True,
+        )
+        return appointment, record, status
 
-    record, status = await run_insurance_check(
-        session,
-        appointment,
-        provider_name=appointment.provider or settings.provider_names[0],
-        manual=True,
-    )
-    await session.commit()
+    appointment, record, status = await write_coordinator.submit(reverify)
 
     return ReverifyResponse(
         appointment_id=appointment.id,
@@ -53,22 +52,23 @@ async def reverify_insurance(
 async def verify_payer(
     payer_id: str,
     payload: PayerVerificationRequest,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
 ) -> PayerVerificationResponse:
+    appointment = None
     if payload.appointment_id:
         appointment = await session.get(Appointment, payload.appointment_id)
         if not appointment or appointment.clinic_id != user.clinic_id:
             raise HTTPException(status_code=404, detail="Appointment not found")
 
-    result = simulate_payer_lookup(
-        session=session,
+    result = await simulate_payer_lookup(
+        clinic_id=user.clinic_id,
         payer_id=payer_id,
         patient_name=payload.patient_name,
         policy_id=payload.policy_id,
         appointment_id=payload.appointment_id,
+        patient_id=appointment.patient_id if appointment else None,
     )
-    await session.commit()
 
     return PayerVerificationResponse(**result)
 
@@ -77,9 +77,9 @@ async def verify_payer(
     "/simulation",
     response_model=SimulationResponse,
 )
-async def run_insurance_simulation(
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
-) -> SimulationResponse:
-    results = await run_verification_simulation(session, user.clinic_id)
+async def run_insurance_simulation(user: UserPrincipal = Depends(get_current_user)) -> SimulationResponse:
+    async def simulate(session: AsyncSession) -> list[SimulationResult]:
+        return await run_verification_simulation(session, user.clinic_id)
+
+    results = await write_coordinator.submit(simulate)
     return SimulationResponse(results=results)
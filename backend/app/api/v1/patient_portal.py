@@ -1,14 +1,27 @@
 from datetime import datetime, timedelta
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, decode_access_token, hash_password, verify_password
-from app.db.models import Appointment, Clinic, InsuranceRecord, Patient, PatientAccount, VerificationStatus
-from app.db.session import get_session
-from app.schemas.appointment import AppointmentList, AppointmentRead, InsuranceSummary, PatientSummary
+from app.api.v1.appointments import availability_window
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.principals import PatientPrincipal, patient_principals
+from app.core.security import create_access_token, decode_access_token
+from app.core.write_coordinator import write_coordinator
+from app.db.models import Appointment, Clinic, Patient, PatientAccount, VerificationStatus
+from app.db.session import get_read_session
+from app.db.sharding import select_clinic
+from app.schemas.appointment import (
+    AppointmentAvailability,
+    AppointmentList,
+    AppointmentRead,
+    InsuranceSummary,
+    PatientSummary,
+)
 from app.schemas.patient_portal import (
     PatientPortalLogin,
     PatientPortalProfile,
@@ -16,6 +29,8 @@ from app.schemas.patient_portal import (
     PatientPortalToken,
     PatientAppointmentCreate,
 )
+from app.services.availability import slot_index
+from app.services.insurance import current_insurance_record
 
 router = APIRouter(prefix="/patient", tags=["patient-portal"])
 patient_oauth = OAuth2PasswordBearer(tokenUrl="/api/v1/patient/auth/login")
@@ -26,25 +41,47 @@ async def _get_patient_account(session: AsyncSession, email: str) -> PatientAcco
     return result.scalars().first()
 
 
+def _principal(account: PatientAccount) -> PatientPrincipal:
+    return PatientPrincipal(
+        id=account.id,
+        email=account.email,
+        patient_id=account.patient_id,
+        clinic_id=account.clinic_id,
+        token_version=account.token_version or 0,
+    )
+
+
 async def get_current_patient(
     token: str = Depends(patient_oauth),
-    session: AsyncSession = Depends(get_session),
-) -> PatientAccount:
+    session: AsyncSession = Depends(get_read_session),
+) -> PatientPrincipal:
     payload = decode_access_token(token)
     email = payload.get("sub")
     token_type = payload.get("typ")
+    account_id = payload.get("uid")
     if token_type != "patient" or not email:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    account = await _get_patient_account(session, email)
-    if not account:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Patient not found")
-    return account
+
+    principal = patient_principals.get(account_id) if account_id is not None else None
+    if principal is None:
+        if account_id is not None:
+            account = await session.get(PatientAccount, account_id)
+        else:
+            account = await _get_patient_account(session, email)
+        if not account or account.email != email:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Patient not found")
+        principal = _principal(account)
+        patient_principals.put(principal.id, principal)
+    if payload.get("ver", 0) != principal.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    await select_clinic(principal.clinic_id)
+    return principal
 
 
 @router.post("/auth/register", response_model=PatientPortalProfile)
 async def register_patient(
     payload: PatientPortalRegister,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> PatientPortalProfile:
     existing = await _get_patient_account(session, payload.email)
     if existing:
@@ -53,28 +90,41 @@ async def register_patient(
     clinic = (await session.execute(select(Clinic))).scalars().first()
     if not clinic:
         raise HTTPException(status_code=400, detail="Clinic not available")
+    await session.close()
+    await select_clinic(clinic.id)
 
     dob_value = None
     if payload.dob:
         dob_value = datetime(payload.dob.year, payload.dob.month, payload.dob.day)
+    hashed_password = await password_hasher.hash(payload.password)
 
-    patient = Patient(
-        clinic_id=clinic.id,
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        dob=dob_value,
-        phone=payload.phone,
-    )
-    session.add(patient)
-    await session.flush()
+    async def create_account(write_session: AsyncSession) -> tuple[Patient, PatientAccount] | None:
+        # Another registration may have claimed the email while this one was hashing.
+        if (await write_session.execute(select(PatientAccount.id).filter_by(email=payload.email))).first():
+            return None
+        patient = Patient(
+            clinic_id=clinic.id,
+            first_name=payload.first_name,
+            last_name=payload.last_name,
+            dob=dob_value,
+            phone=payload.phone,
+        )
+        write_session.add(patient)
+        await write_session.flush()
+        account = PatientAccount(
+            clinic_id=clinic.id,
+            patient_id=patient.id,
+            email=payload.email,
+            hashed_password=hashed_password,
+        )
+        write_session.add(account)
+        await write_session.flush()
+        return patient, account
 
-    account = PatientAccount(
-        patient_id=patient.id,
-        email=payload.email,
-        hashed_password=hash_password(payload.password),
-    )
-    session.add(account)
-    await session.commit()
+    created = await write_coordinator.submit(create_account)
+    if created is None:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    patient, account = created
 
     return PatientPortalProfile(
         id=patient.id,
@@ -88,27 +138,56 @@ async def register_patient(
 @router.post("/auth/login", response_model=PatientPortalToken)
 async def login_patient(
     payload: PatientPortalLogin,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> PatientPortalToken:
     account = await _get_patient_account(session, payload.email)
-    if not account or not verify_password(payload.password, account.hashed_password):
+    if not account:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    # Hand the connection back before bcrypt; the loaded account stays usable once detached.
+    await session.close()
+    verified, new_hash = await password_hasher.verify(payload.password, account.hashed_password)
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    async def record_login(write_session: AsyncSession) -> None:
+        values = {"last_login": datetime.utcnow()}
+        if new_hash:
+            values["hashed_password"] = new_hash
+        await write_session.execute(update(PatientAccount).where(PatientAccount.id == account.id).values(**values))
 
-    account.last_login = datetime.utcnow()
-    await session.commit()
+    await write_coordinator.submit(record_login)
 
     token = create_access_token(
         subject=account.email,
         expires_delta=timedelta(minutes=60),
         token_type="patient",
+        extra_claims={
+            "uid": account.id,
+            "cid": account.clinic_id,
+            "pid": account.patient_id,
+            "ver": account.token_version or 0,
+        },
     )
     return PatientPortalToken(access_token=token)
 
 
+@router.post("/auth/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_patient_tokens(account: PatientPrincipal = Depends(get_current_patient)) -> None:
+    async def bump_version(session: AsyncSession) -> None:
+        await session.execute(
+            update(PatientAccount)
+            .where(PatientAccount.id == account.id)
+            .values(token_version=PatientAccount.token_version + 1)
+        )
+
+    await write_coordinator.submit(bump_version)
+    patient_principals.invalidate(account.id)
+
+
 @router.get("/auth/me", response_model=PatientPortalProfile)
 async def get_patient_profile(
-    account: PatientAccount = Depends(get_current_patient),
-    session: AsyncSession = Depends(get_session),
+    account: PatientPrincipal = Depends(get_current_patient),
+    session: AsyncSession = Depends(get_read_session),
 ) -> PatientPortalProfile:
     patient = await session.get(Patient, account.patient_id)
     return PatientPortalProfile(
@@ -122,8 +201,8 @@ async def get_patient_profile(
 
 @router.get("/portal/appointments", response_model=AppointmentList)
 async def get_patient_appointments(
-    account: PatientAccount = Depends(get_current_patient),
-    session: AsyncSession = Depends(get_session),
+    account: PatientPrincipal = Depends(get_current_patient),
+    session: AsyncSession = Depends(get_read_session),
 ) -> AppointmentList:
     patient_id = account.patient_id
     patient = await session.get(Patient, patient_id)
@@ -133,9 +212,7 @@ async def get_patient_appointments(
         last_name=patient.last_name if patient else "",
     )
     record = (
-        await session.execute(
-            select(InsuranceRecord).filter_by(patient_id=patient_id)
-        )
+        await session.execute(current_insurance_record(patient_id))
     ).scalars().first()
     insurance = None
     if record:
@@ -166,31 +243,48 @@ async def get_patient_appointments(
     )
 
 
+@router.get("/portal/availability", response_model=AppointmentAvailability)
+async def get_patient_availability(
+    provider: str,
+    from_time: Optional[datetime] = None,
+    to_time: Optional[datetime] = None,
+    account: PatientPrincipal = Depends(get_current_patient),
+    session: AsyncSession = Depends(get_read_session),
+) -> AppointmentAvailability:
+    patient = await session.get(Patient, account.patient_id)
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    start, end = availability_window(from_time, to_time)
+    return AppointmentAvailability(
+        provider=provider,
+        slot_minutes=settings.appointment_slot_minutes,
+        slots=await slot_index.free_slots(patient.clinic_id, provider, start, end),
+    )
+
+
 @router.post("/portal/appointments", response_model=AppointmentRead, status_code=201)
 async def create_patient_appointment(
     payload: PatientAppointmentCreate,
-    account: PatientAccount = Depends(get_current_patient),
-    session: AsyncSession = Depends(get_session),
+    account: PatientPrincipal = Depends(get_current_patient),
+    session: AsyncSession = Depends(get_read_session),
 ) -> AppointmentRead:
     patient = await session.get(Patient, account.patient_id)
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    appointment = Appointment(
-        patient_id=patient.id,
-        clinic_id=patient.clinic_id,
-        scheduled_time=payload.scheduled_time,
-        provider=payload.provider,
-        verification_status=VerificationStatus.needs_review,
-    )
-    session.add(appointment)
-    await session.commit()
-    await session.refresh(appointment)
+    def build_appointment() -> Appointment:
+        return Appointment(
+            patient_id=patient.id,
+            clinic_id=patient.clinic_id,
+            scheduled_time=payload.scheduled_time,
+            provider=payload.provider,
+            verification_status=VerificationStatus.needs_review,
+        )
+
+    appointment = await slot_index.book(patient.clinic_id, build_appointment)
 
     record = (
-        await session.execute(
-            select(InsuranceRecord).filter_by(patient_id=patient.id)
-        )
+        await session.execute(current_insurance_record(patient.id))
     ).scalars().first()
     insurance = None
     if record:
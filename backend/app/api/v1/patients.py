@@ -1,46 +1,148 @@
-from typing import List
+from datetime import date, datetime
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, joinedload
 
 from app.api.v1.auth import get_current_user
-from app.db.models import Appointment, InsuranceRecord, Patient, PatientAccount, User
-from app.db.session import get_session
-from app.schemas.patient import AppointmentDetail, InsuranceRecordDetail, PatientDetail, PatientSummary
+from app.core.loader import parse_id_list
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principals import UserPrincipal
+from app.db.models import Appointment, InsuranceRecord, Patient, PatientAccount
+from app.db.session import get_read_session
+from app.schemas.patient import (
+    AppointmentDetail,
+    InsuranceRecordDetail,
+    PatientDetail,
+    PatientSearchResult,
+    PatientSummary,
+)
+from app.services.search import find_patients
 
 router = APIRouter(prefix="/patients", tags=["patients"])
 
 
-@router.get("/{patient_id}", response_model=PatientDetail)
+@router.get("/search", response_model=List[PatientSearchResult])
+async def search_patients(
+    q: Optional[str] = Query(None, min_length=2, max_length=128),
+    dob: Optional[date] = None,
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
+) -> List[PatientSearchResult]:
+    if not q and not dob:
+        raise HTTPException(status_code=400, detail="Provide a search query or date of birth")
+    return await find_patients(session, user.clinic_id, q, dob, limit)
+
+
+PATIENT_INCLUDES = {"appointments", "insurance_records"}
+PATIENT_FIELDS = {"first_name", "last_name", "email", "phone", "dob"}
+
+
+async def _account_emails(session: AsyncSession, clinic_id: int, patient_ids: List[int]) -> dict[int, str]:
+    # Accounts live in the catalog database when sharded, so they are fetched apart from the patient rows.
+    if not patient_ids:
+        return {}
+    rows = await session.execute(
+        select(PatientAccount.patient_id, PatientAccount.email).where(
+            PatientAccount.clinic_id == clinic_id,
+            PatientAccount.patient_id.in_(patient_ids),
+        )
+    )
+    return dict(rows.all())
+
+
+def _decode_keyset_cursor(cursor: str, value_type: type) -> tuple[Any, int]:
+    values = decode_cursor(cursor)
+    if (
+        len(values) != 2
+        or not isinstance(values[0], value_type)
+        or not isinstance(values[1], int)
+        or isinstance(values[1], bool)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values[0], values[1]
+
+
+def _parse_list(value: Optional[str], allowed: set[str], name: str) -> set[str]:
+    if value is None:
+        return set(allowed)
+    requested = {item.strip() for item in value.split(",") if item.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name}: {', '.join(sorted(unknown))}")
+    return requested
+
+
+@router.get("/{patient_id}", response_model=PatientDetail, response_model_exclude_unset=True)
 async def get_patient(
     patient_id: int,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    appointments_limit: int = Query(50, ge=1, le=500),
+    appointments_cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
 ) -> PatientDetail:
-    patient = await session.get(Patient, patient_id)
-    if not patient or patient.clinic_id != user.clinic_id:
+    includes = _parse_list(include, PATIENT_INCLUDES, "include")
+    selected_fields = _parse_list(fields, PATIENT_FIELDS, "fields")
+
+    options = []
+    if "insurance_records" in includes:
+        options.append(joinedload(Patient.insurance_records))
+    stmt = select(Patient)
+    page = None
+    if "appointments" in includes:
+        # The history page is a limited subquery joined onto the patient, so one statement returns both.
+        page_stmt = select(Appointment).where(Appointment.patient_id == patient_id)
+        if appointments_cursor:
+            scheduled_time, appointment_id = _decode_keyset_cursor(appointments_cursor, datetime)
+            page_stmt = page_stmt.where(
+                tuple_(Appointment.scheduled_time, Appointment.id) < tuple_(scheduled_time, appointment_id)
+            )
+        page_stmt = page_stmt.order_by(Appointment.scheduled_time.desc(), Appointment.id.desc())
+        page = aliased(Appointment, page_stmt.limit(appointments_limit + 1).subquery())
+        stmt = (
+            select(Patient, page)
+            .outerjoin(page, page.patient_id == Patient.id)
+            .order_by(page.scheduled_time.desc(), page.id.desc())
+        )
+    stmt = stmt.options(*options).where(Patient.id == patient_id, Patient.clinic_id == user.clinic_id)
+    rows = (await session.execute(stmt)).unique().all()
+    if not rows:
         raise HTTPException(status_code=404, detail="Patient not found")
+    patient = rows[0][0]
 
-    appointments = (
-        await session.execute(select(Appointment).filter_by(patient_id=patient_id))
-    ).scalars().all()
-    insurance_records = (
-        await session.execute(select(InsuranceRecord).filter_by(patient_id=patient_id))
-    ).scalars().all()
-    account = (
-        await session.execute(select(PatientAccount).filter_by(patient_id=patient_id))
-    ).scalars().first()
-
-    return PatientDetail(
-        id=patient.id,
-        first_name=patient.first_name,
-        last_name=patient.last_name,
-        email=account.email if account else None,
-        phone=patient.phone,
-        dob=patient.dob,
-        appointments=[
+    emails = await _account_emails(session, user.clinic_id, [patient.id]) if "email" in selected_fields else {}
+    values = {
+        "first_name": lambda: patient.first_name,
+        "last_name": lambda: patient.last_name,
+        "email": lambda: emails.get(patient.id),
+        "phone": lambda: patient.phone,
+        "dob": lambda: patient.dob,
+    }
+    detail = PatientDetail(id=patient.id, **{field: values[field]() for field in selected_fields})
+
+    if "insurance_records" in includes:
+        detail.insurance_records = [
+            InsuranceRecordDetail(
+                provider=record.provider,
+                status=record.status.value,
+                copay=record.copay,
+                last_checked=record.last_checked,
+                policy_id=record.policy_id,
+            )
+            for record in patient.insurance_records
+        ]
+
+    if page is not None:
+        appointments = [row[1] for row in rows if row[1] is not None]
+        if len(appointments) > appointments_limit:
+            appointments = appointments[:appointments_limit]
+            detail.appointments_next_cursor = encode_cursor(appointments[-1].scheduled_time, appointments[-1].id)
+        detail.appointments = [
             AppointmentDetail(
                 id=appointment.id,
                 scheduled_time=appointment.scheduled_time,
@@ -49,43 +151,77 @@ async def get_patient(
                 provider=appointment.provider,
             )
             for appointment in appointments
-        ],
-        insurance_records=[
-            InsuranceRecordDetail(
-                provider=record.provider,
-                status=record.status.value,
-                copay=record.copay,
-                last_checked=record.last_checked,
-                policy_id=record.policy_id,
-            )
-            for record in insurance_records
-        ],
+        ]
+
+    return detail
+
+
+def _patient_summary(patient: Patient, email: Optional[str], appointment_count: int) -> PatientSummary:
+    return PatientSummary(
+        id=patient.id,
+        first_name=patient.first_name,
+        last_name=patient.last_name,
+        email=email,
+        phone=patient.phone,
+        dob=patient.dob,
+        created_at=patient.created_at,
+        appointment_count=appointment_count,
     )
 
 
+PATIENT_SORTS = {
+    "created_at": Patient.created_at,
+    "last_name": Patient.last_name,
+}
+PATIENT_SORT_TYPES = {
+    "created_at": datetime,
+    "last_name": str,
+}
+
+
 @router.get("", response_model=List[PatientSummary])
 async def list_patients(
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: Literal["created_at", "-created_at", "last_name", "-last_name"] = "-created_at",
+    ids: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
 ) -> List[PatientSummary]:
-    stmt = (
-        select(Patient)
-        .options(selectinload(Patient.appointments), selectinload(Patient.account))
-        .filter_by(clinic_id=user.clinic_id)
-        .order_by(Patient.created_at.desc())
+    descending = sort.startswith("-")
+    sort_column = PATIENT_SORTS[sort.lstrip("-")]
+    appointment_count = (
+        select(func.count(Appointment.id))
+        .where(Appointment.patient_id == Patient.id)
+        .correlate(Patient)
+        .scalar_subquery()
     )
-    patients = (await session.execute(stmt)).scalars().all()
-
-    return [
-        PatientSummary(
-            id=patient.id,
-            first_name=patient.first_name,
-            last_name=patient.last_name,
-            email=patient.account.email if patient.account else None,
-            phone=patient.phone,
-            dob=patient.dob,
-            created_at=patient.created_at,
-            appointment_count=len(patient.appointments or []),
-        )
-        for patient in patients
-    ]
+    stmt = select(Patient, appointment_count).where(Patient.clinic_id == user.clinic_id)
+    patient_ids = parse_id_list(ids)
+    if patient_ids is not None:
+        stmt = stmt.where(Patient.id.in_(patient_ids))
+        rows = {row[0].id: row for row in (await session.execute(stmt)).all()}
+        emails = await _account_emails(session, user.clinic_id, list(rows))
+        return [
+            _patient_summary(rows[patient_id][0], emails.get(patient_id), rows[patient_id][1])
+            for patient_id in patient_ids
+            if patient_id in rows
+        ]
+    if cursor:
+        sort_value, patient_id = _decode_keyset_cursor(cursor, PATIENT_SORT_TYPES[sort.lstrip("-")])
+        key = tuple_(sort_column, Patient.id)
+        stmt = stmt.where(key < tuple_(sort_value, patient_id) if descending else key > tuple_(sort_value, patient_id))
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), Patient.id.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), Patient.id.asc())
+    rows = (await session.execute(stmt.limit(limit + 1))).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor(getattr(last, sort_column.key), last.id)
+
+    emails = await _account_emails(session, user.clinic_id, [patient.id for patient, _ in rows])
+    return [_patient_summary(patient, emails.get(patient.id), count) for patient, count in rows]
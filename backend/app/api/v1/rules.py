@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.auth import get_current_user, get_super_admin
+from app.core.principals import UserPrincipal
+from app.core.write_coordinator import write_coordinator
+from app.db.session import get_read_session
+from app.schemas.rules import RuleEvaluation, RuleOutcome, RuleRead
+from app.services.rules import (
+    broadcast_rule_alerts,
+    create_rule_alerts,
+    eligibility_rules,
+    load_window,
+    summarize,
+)
+
+router = APIRouter(prefix="/rules", tags=["rules"])
+
+
+@router.get("/", response_model=List[RuleRead])
+async def list_rules(user: UserPrincipal = Depends(get_current_user)) -> List[RuleRead]:
+    return [
+        RuleRead(name=rule.name, description=rule.description, severity=rule.severity.value, when=rule.when)
+        for rule in eligibility_rules.rules
+    ]
+
+
+@router.post("/evaluate", response_model=RuleEvaluation)
+async def evaluate_rules(
+    hours: int = Query(72, ge=1, le=720),
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_super_admin),
+) -> RuleEvaluation:
+    start = datetime.utcnow()
+    end = start + timedelta(hours=hours)
+    # Rules run against the read replica; only the alert insert goes through the writer.
+    columns = await load_window(session, start, end, user.clinic_id)
+    hits = eligibility_rules.hits(columns, start)
+
+    async def apply(write_session: AsyncSession) -> dict[str, int]:
+        return await create_rule_alerts(write_session, hits, start, end, user.clinic_id)
+
+    created = await write_coordinator.submit(apply)
+    outcomes = summarize(eligibility_rules, hits, created)
+    await broadcast_rule_alerts(outcomes)
+    return RuleEvaluation(
+        window_start=start,
+        window_end=end,
+        evaluated=len(columns["appointment_id"]),
+        alerts_created=sum(outcome["created"] for outcome in outcomes.values()),
+        outcomes=[RuleOutcome(rule=name, **outcome) for name, outcome in outcomes.items()],
+    )
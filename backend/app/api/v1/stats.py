@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.auth import get_current_user
+from app.core.config import settings
+from app.core.principals import UserPrincipal
+from app.db.session import get_read_session
+from app.schemas.stats import DashboardSummary, VerificationStats
+from app.services.dashboard import get_dashboard_summary
+from app.services.stats import get_verification_stats
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/verification", response_model=VerificationStats)
+async def verification_stats(
+    from_time: Optional[datetime] = None,
+    to_time: Optional[datetime] = None,
+    granularity: Literal["hour", "day"] = "day",
+    session: AsyncSession = Depends(get_read_session),
+    user: UserPrincipal = Depends(get_current_user),
+) -> VerificationStats:
+    end = to_time or datetime.utcnow()
+    start = from_time or end - timedelta(days=30)
+    return await get_verification_stats(session, user.clinic_id, start, end, granularity)
+
+
+@router.get("/dashboard", response_model=DashboardSummary)
+async def dashboard_summary(
+    response: Response,
+    hours: int = Query(72, ge=1, le=720),
+    user: UserPrincipal = Depends(get_current_user),
+) -> DashboardSummary:
+    response.headers["Cache-Control"] = (
+        f"private, max-age={int(settings.dashboard_cache_ttl)}, "
+        f"stale-while-revalidate={int(settings.dashboard_cache_stale)}"
+    )
+    return await get_dashboard_summary(user.clinic_id, hours)
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.db.board import rebuild_board
+from app.db.session import async_session
+from app.db.sharding import clinic_scopes, split_database
+from app.services.stats import backfill_rollups
+
+
+async def backfill_stats(args: argparse.Namespace) -> None:
+    rows = 0
+    for clinic_id in clinic_scopes():
+        async with async_session(info={"clinic_id": clinic_id}) as session:
+            rows += await backfill_rollups(session)
+    print(f"Rebuilt {rows} verification rollup rows.")
+
+
+async def rebuild_board_projection(args: argparse.Namespace) -> None:
+    rows = 0
+    for clinic_id in clinic_scopes():
+        async with async_session(info={"clinic_id": clinic_id}) as session:
+            conn = await session.connection()
+            rows += await conn.run_sync(rebuild_board)
+            await session.commit()
+    print(f"Rebuilt {rows} appointment board rows.")
+
+
+async def split_shards(args: argparse.Namespace) -> None:
+    target = args.shard_dir or settings.database_shard_dir
+    if not args.source or not args.catalog or not target:
+        raise SystemExit("split-shards needs --source, --catalog and --shard-dir (or DATABASE_SHARD_DIR)")
+    copied = await asyncio.to_thread(split_database, args.source, args.catalog, target)
+    for clinic_id, rows in copied.items():
+        print(f"Clinic {clinic_id}: copied {rows} rows.")
+    print(f"Wrote {len(copied)} shards to {target}. Point DATABASE_URL at {args.catalog} and set DATABASE_SHARD_DIR.")
+
+
+COMMANDS = {
+    "backfill-stats": backfill_stats,
+    "rebuild-board": rebuild_board_projection,
+    "split-shards": split_shards,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--source", help="split-shards: existing single-file SQLite database")
+    parser.add_argument("--catalog", help="split-shards: path of the catalog database to write")
+    parser.add_argument("--shard-dir", help="split-shards: directory for the per-clinic databases")
+    args = parser.parse_args()
+    asyncio.run(COMMANDS[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
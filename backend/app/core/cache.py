@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class StaleWhileRevalidateCache(Generic[V]):
+    # Per-process. Past `ttl` an entry is still served for `stale_ttl` more seconds while one task reloads it.
+    def __init__(self, max_entries: int, ttl: float, stale_ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[V]]) -> tuple[V, bool]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], False
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._reload(key, load)
+                return entry[1], True
+        self.misses += 1
+        # Shielded so a caller that disconnects does not cancel the load other callers are waiting on.
+        return await asyncio.shield(self._reload(key, load)), False
+
+    def _reload(self, key: Hashable, load: Callable[[], Awaitable[V]]) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, load))
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[V]]) -> V:
+        value = await load()
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Cache reload for %r failed", key, exc_info=task.exception())
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def stop(self) -> None:
+        tasks = list(self._loading.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loading.clear()
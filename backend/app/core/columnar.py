@@ -0,0 +1,59 @@
+from typing import Any, Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Request
+from starlette.responses import Response
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.clinic.columnar+json"
+
+
+def wants_columnar(request: Request, response_format: Optional[str]) -> bool:
+    if response_format is not None:
+        return response_format == "columnar"
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+class DictionaryEncoder:
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+        self._codes: dict[Any, int] = {}
+
+    def encode(self, value: Any) -> Optional[int]:
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def columnar_payload(
+    columns: Sequence[str],
+    rows: Sequence[Iterable[Any]],
+    dictionaries: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    # dictionaries maps a column to a shared dictionary name, so columns drawing from one vocabulary share codes.
+    dictionaries = dictionaries or {}
+    encoders = {name: DictionaryEncoder() for name in dict.fromkeys(dictionaries.values())}
+    transposed = list(zip(*rows)) if rows else [() for _ in columns]
+    data: dict[str, list[Any]] = {}
+    for column, values in zip(columns, transposed):
+        dictionary = dictionaries.get(column)
+        if dictionary is None:
+            data[column] = list(values)
+        else:
+            encode = encoders[dictionary].encode
+            data[column] = [encode(value) for value in values]
+    return {
+        "total": len(rows),
+        "columns": data,
+        "dictionaries": {name: encoder.values for name, encoder in encoders.items()},
+    }
+
+
+class ColumnarResponse(Response):
+    media_type = COLUMNAR_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
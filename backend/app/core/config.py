@@ -11,6 +11,41 @@ class Settings(BaseSettings):
     secret_key: str = "super-secret-change-me"
     access_token_expire_minutes: int = 60
     database_url: str = f"sqlite+aiosqlite:///{BASE_DIR / 'data' / 'clinic.db'}"
+    database_profile: str = "production"
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_read_url: str | None = None
+    database_read_pool_size: int = 10
+    database_shard_dir: str | None = None
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268435456
+    log_writer_batch_size: int = 500
+    log_writer_flush_interval: float = 1.0
+    log_writer_max_pending: int = 10000
+    write_coordinator_max_batch: int = 64
+    write_coordinator_window: float = 0.002
+    write_coordinator_max_pending: int = 1000
+    sweep_chunk_size: int = 200
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 256
+    principal_cache_size: int = 10000
+    principal_cache_ttl: float = 30.0
+    dashboard_cache_size: int = 1000
+    dashboard_cache_ttl: float = 15.0
+    dashboard_cache_stale: float = 120.0
+    dashboard_stale_coverage_days: int = 30
+    change_log_retention_days: int = 7
+    appointment_slot_minutes: int = 30
+    availability_max_days: int = 14
+    eligibility_rules_path: str | None = None
+    rate_limit_path: str = str(BASE_DIR / "data" / "ratelimit.db")
+    reverify_rate_limit: int = 5
+    reverify_rate_window: float = 60.0
+    profiling_sample_rate: float = 0.0
+    profiling_buffer_size: int = 50
     provider_names: tuple[str, ...] = ("Blue Cross", "Aetna", "Cigna", "UnitedHealth", "Humana")
     frontend_origins: tuple[str, ...] = (
         "http://localhost:5173",
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_and_update_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    # bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop without a process pool.
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.workers <= 0:
+            return func(*args)
+        if self._in_flight >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+        submitted = time.perf_counter()
+        self._in_flight += 1
+
+        def timed() -> tuple[T, float, float]:
+            started = time.perf_counter()
+            return func(*args), started, time.perf_counter()
+
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self._pool(), timed)
+        finally:
+            self._in_flight -= 1
+        queued = started - submitted
+        self.completed += 1
+        self.queue_seconds_total += queued
+        self.queue_seconds_max = max(self.queue_seconds_max, queued)
+        self.hash_seconds_total += finished - started
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        verified, new_hash = await self._run(verify_and_update_password, password, hashed_password)
+        if verified and new_hash:
+            self.rehashed += 1
+        return verified, new_hash
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "queue_seconds_avg": round(self.queue_seconds_total / self.completed, 6) if self.completed else 0.0,
+            "queue_seconds_max": round(self.queue_seconds_max, 6),
+            "hash_seconds_avg": round(self.hash_seconds_total / self.completed, 6) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.ready = False
+        self.boot_seconds: float | None = None
+        self.initial_sweep = "pending"
+        self._sweep_task: asyncio.Task | None = None
+
+    def booting(self) -> None:
+        self.started_at = time.monotonic()
+        self.ready = False
+        self.boot_seconds = None
+
+    def mark_ready(self) -> None:
+        self.boot_seconds = round(time.monotonic() - self.started_at, 3)
+        self.ready = True
+
+    def start_sweep(self, job: Callable[[], Awaitable[None]]) -> None:
+        self.initial_sweep = "running"
+        self._sweep_task = asyncio.create_task(self._run_sweep(job))
+
+    async def _run_sweep(self, job: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await job()
+        except Exception:
+            self.initial_sweep = "failed"
+            logger.exception("Initial insurance sweep failed")
+        else:
+            self.initial_sweep = "done"
+
+    async def wait_for_sweep(self) -> None:
+        if self._sweep_task is not None:
+            await self._sweep_task
+
+    async def stop(self) -> None:
+        self.ready = False
+        if self._sweep_task is not None and not self._sweep_task.done():
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self.initial_sweep = "cancelled"
+        self._sweep_task = None
+
+
+lifecycle = Lifecycle()
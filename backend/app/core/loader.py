@@ -0,0 +1,79 @@
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_read_session
+
+MAX_BATCH_IDS = 200
+IN_CHUNK_SIZE = 500
+
+
+def parse_id_list(value: Optional[str]) -> list[int] | None:
+    if value is None:
+        return None
+    try:
+        ids = list(dict.fromkeys(int(item) for item in value.split(",") if item.strip()))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers") from exc
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be requested at once")
+    return ids
+
+
+def _chunks(values: list[Any]) -> Iterable[list[Any]]:
+    for start in range(0, len(values), IN_CHUNK_SIZE):
+        yield values[start:start + IN_CHUNK_SIZE]
+
+
+class RecordLoader:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._records: dict[tuple[type, int], Any] = {}
+        self._missing: set[tuple[type, int]] = set()
+        self._related: dict[tuple[type, str, Any], list[Any]] = {}
+
+    async def load_many(self, model: type, ids: Iterable[int], clinic_id: int | None = None) -> dict[int, Any]:
+        ids = list(dict.fromkeys(ids))
+        wanted = [
+            record_id
+            for record_id in ids
+            if (model, record_id) not in self._records and (model, record_id) not in self._missing
+        ]
+        for chunk in _chunks(wanted):
+            rows = (await self.session.execute(select(model).where(model.id.in_(chunk)))).scalars().all()
+            for row in rows:
+                self._records[(model, row.id)] = row
+            self._missing.update((model, record_id) for record_id in chunk if (model, record_id) not in self._records)
+
+        found = {}
+        for record_id in ids:
+            record = self._records.get((model, record_id))
+            if record is None or (clinic_id is not None and record.clinic_id != clinic_id):
+                continue
+            found[record_id] = record
+        return found
+
+    async def load(self, model: type, record_id: int, clinic_id: int | None = None) -> Any | None:
+        return (await self.load_many(model, [record_id], clinic_id)).get(record_id)
+
+    async def load_related(self, model: type, column: str, keys: Iterable[Any]) -> dict[Any, list[Any]]:
+        keys = list(dict.fromkeys(keys))
+        wanted = [key for key in keys if (model, column, key) not in self._related]
+        attribute = getattr(model, column)
+        for chunk in _chunks(wanted):
+            grouped: dict[Any, list[Any]] = defaultdict(list)
+            rows = (
+                await self.session.execute(select(model).where(attribute.in_(chunk)).order_by(model.id))
+            ).scalars().all()
+            for row in rows:
+                grouped[getattr(row, column)].append(row)
+            for key in chunk:
+                self._related[(model, column, key)] = grouped.get(key, [])
+        return {key: self._related[(model, column, key)] for key in keys}
+
+
+async def get_loader(session: AsyncSession = Depends(get_read_session)) -> RecordLoader:
+    return RecordLoader(session)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.models import VerificationLog
+from app.db.session import async_session
+from app.db.sharding import shard_registry
+from app.services.stats import apply_rollups
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationLogWriter:
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max_pending)
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            await self.flush()
+            return
+        self._stopping = True
+        await self._task
+        self._task = None
+
+    async def write(self, entry: dict[str, Any]) -> None:
+        self.start()
+        # Only waits when the queue is full, which throttles producers instead of growing memory.
+        await self._queue.put(entry)
+
+    async def flush(self) -> None:
+        while not self._queue.empty():
+            await self._write_batch(self._drain(self.batch_size))
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _collect(self) -> list[dict[str, Any]]:
+        if self._stopping:
+            return self._drain(self.batch_size)
+        loop = asyncio.get_running_loop()
+        try:
+            batch = [await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            batch.extend(self._drain(self.batch_size - len(batch)))
+            remaining = deadline - loop.time()
+            if len(batch) >= self.batch_size or remaining <= 0 or self._stopping:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        groups: dict[int | None, list[dict[str, Any]]] = defaultdict(list)
+        for entry in batch:
+            groups[entry.get("clinic_id") if shard_registry is not None else None].append(entry)
+        for clinic_id, entries in groups.items():
+            try:
+                async with async_session(info={"clinic_id": clinic_id}) as session:
+                    await session.execute(insert(VerificationLog), entries)
+                    await apply_rollups(session, entries)
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to write %d verification logs", len(entries))
+
+
+log_writer = VerificationLogWriter(
+    batch_size=settings.log_writer_batch_size,
+    flush_interval=settings.log_writer_flush_interval,
+    max_pending=settings.log_writer_max_pending,
+)
@@ -0,0 +1,131 @@
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed while serving a request.",
+    ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds",
+    "Time spent executing SQL while serving a request.",
+    ["method", "route"],
+)
+SQL_STATEMENTS = Counter("db_statements_total", "SQL statements executed, including background work.")
+SQL_SECONDS = Counter("db_statement_seconds_total", "Time spent executing SQL, including background work.")
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of a pool.", ["pool"])
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections",
+    "Open alert websocket connections.",
+    multiprocess_mode="livesum",
+)
+WEBSOCKET_BROADCAST = Histogram("websocket_broadcast_seconds", "Time to broadcast one message to every socket.")
+VERIFICATIONS = Counter("insurance_verifications_total", "Insurance verifications by payer and outcome.", ["payer", "status"])
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    sql_seconds: float = 0.0
+    # Only filled while the request is being profiled.
+    timeline: list[tuple[float, float, str]] | None = field(default=None)
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    SQL_STATEMENTS.inc()
+    SQL_SECONDS.inc(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+        if stats.timeline is not None:
+            stats.timeline.append((started, elapsed, statement))
+
+
+def record_verification(payer: str, status: str) -> None:
+    VERIFICATIONS.labels(payer=payer, status=status).inc()
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_stats.reset(token)
+            # Label by route template, not raw path, so ids in URLs do not explode the series count.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_STATEMENTS.labels(method, route).observe(stats.statements)
+            REQUEST_SQL_SECONDS.labels(method, route).observe(stats.sql_seconds)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Several uvicorn workers each write their samples to this directory; merge them per scrape.
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, Hashable, TypeVar
+
+from app.core.config import settings
+
+P = TypeVar("P")
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    id: int
+    email: str
+    role: str
+    clinic_id: int
+    created_at: datetime
+    token_version: int
+
+
+@dataclass(frozen=True)
+class PatientPrincipal:
+    id: int
+    email: str
+    patient_id: int
+    clinic_id: int | None
+    token_version: int
+
+
+class PrincipalCache(Generic[P]):
+    # Per-process; other workers pick up a revocation once their entry's TTL runs out.
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, P]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> P | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, principal: P) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+user_principals: PrincipalCache[UserPrincipal] = PrincipalCache(
+    max_entries=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+patient_principals: PrincipalCache[PatientPrincipal] = PrincipalCache(
+    max_entries=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
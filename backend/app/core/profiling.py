@@ -0,0 +1,154 @@
+import cProfile
+import itertools
+import pstats
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import RequestStats, request_stats
+from app.core.security import decode_access_token
+
+PROFILE_HEADER = b"x-profile"
+TOP_FUNCTIONS = 40
+
+
+class ProfileBuffer:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._profiles: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def reserve(self) -> int:
+        return next(self._ids)
+
+    def put(self, profile_id: int, profile: dict[str, Any]) -> None:
+        self._profiles[profile_id] = {"id": profile_id, **profile}
+        while len(self._profiles) > self.size:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: int) -> dict[str, Any] | None:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[dict[str, Any]]:
+        return list(reversed(self._profiles.values()))
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+
+profile_buffer = ProfileBuffer(settings.profiling_buffer_size)
+
+
+def _requested_by_admin(scope: Scope) -> bool:
+    # A raw scan keeps the common no-header path free of header parsing.
+    if not any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+        return False
+    headers = Headers(scope=scope)
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return False
+    # The role claim is signed, so it can be trusted here without a database lookup.
+    return payload.get("typ") == "user" and payload.get("role") == "super_admin"
+
+
+def _top_functions(profiler: cProfile.Profile) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+class ProfilingMiddleware:
+    # cProfile hooks the whole thread, so only one request is profiled at a time and concurrent work can show up in it.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+        if _requested_by_admin(scope):
+            trigger = "header"
+        elif settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+            trigger = "sample"
+        else:
+            await self.app(scope, receive, send)
+            return
+        await self._profile(scope, receive, send, trigger)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, trigger: str) -> None:
+        stats = request_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = request_stats.set(stats)
+        stats.timeline = []
+        status_code = 500
+        profile_id = profile_buffer.reserve()
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", str(profile_id).encode())]
+            await send(message)
+
+        self._busy = True
+        profiler = cProfile.Profile()
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started
+            self._busy = False
+            timeline = stats.timeline
+            stats.timeline = None
+            if token is not None:
+                request_stats.reset(token)
+            profile_buffer.put(
+                profile_id,
+                {
+                    "trigger": trigger,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(scope.get("route"), "path", None),
+                    "status": status_code,
+                    "started_at": started_at,
+                    "duration_ms": round(duration * 1000, 3),
+                    "sql_count": len(timeline),
+                    "sql_ms": round(sum(elapsed for _, elapsed, _ in timeline) * 1000, 3),
+                    "functions": _top_functions(profiler),
+                    "sql": [
+                        {
+                            "offset_ms": round((at - started) * 1000, 3),
+                            "duration_ms": round(elapsed * 1000, 3),
+                            "statement": " ".join(statement.split()),
+                        }
+                        for at, elapsed, statement in timeline
+                    ],
+                }
+            )
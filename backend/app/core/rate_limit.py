@@ -0,0 +1,111 @@
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    allowed INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+# Refill, check and take a token in one statement, so concurrent workers cannot race between read and write.
+_TAKE = """
+INSERT INTO rate_limit_buckets (key, tokens, updated, allowed)
+VALUES (:key, :capacity - :cost, :now, 1)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = CASE
+        WHEN min(:capacity, tokens + max(0, :now - updated) * :rate) >= :cost
+        THEN min(:capacity, tokens + max(0, :now - updated) * :rate) - :cost
+        ELSE min(:capacity, tokens + max(0, :now - updated) * :rate)
+    END,
+    allowed = min(:capacity, tokens + max(0, :now - updated) * :rate) >= :cost,
+    updated = :now
+RETURNING tokens, allowed
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+    retry_after: int
+    window_seconds: int
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset_seconds),
+            "RateLimit-Policy": f"{self.limit};w={self.window_seconds}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class SQLiteRateLimiter:
+    # Buckets live in a small WAL-mode SQLite file, so every worker on the host shares them and they survive restarts.
+    def __init__(self, path: str, busy_timeout_ms: int) -> None:
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def hit(self, key: str, limit: int, window_seconds: float, cost: int = 1) -> RateLimitDecision:
+        rate = limit / window_seconds
+        with self._lock:
+            tokens, allowed = self._connection().execute(
+                _TAKE,
+                {"key": key, "capacity": limit, "rate": rate, "cost": cost, "now": time.time()},
+            ).fetchone()
+        return RateLimitDecision(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=max(0, math.floor(tokens)),
+            reset_seconds=math.ceil((limit - tokens) / rate),
+            retry_after=max(1, math.ceil((cost - tokens) / rate)),
+            window_seconds=math.ceil(window_seconds),
+        )
+
+    async def acquire(self, key: str, limit: int, window_seconds: float, cost: int = 1) -> RateLimitDecision:
+        # A contended bucket file can wait up to busy_timeout, which must not stall the event loop.
+        return await asyncio.to_thread(self.hit, key, limit, window_seconds, cost)
+
+    def reset(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._connection().execute("DELETE FROM rate_limit_buckets")
+            else:
+                self._connection().execute("DELETE FROM rate_limit_buckets WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+rate_limiter = SQLiteRateLimiter(settings.rate_limit_path, settings.sqlite_busy_timeout_ms)
@@ -1,6 +1,12 @@
+from datetime import datetime, timedelta
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import async_session
+from app.core.config import settings
+from app.core.write_coordinator import write_coordinator
+from app.db.changes import prune_change_log
+from app.db.sharding import clinic_scopes, select_clinic
 from app.services.insurance import run_scheduled_checks
 
 scheduler = AsyncIOScheduler()
@@ -18,6 +24,15 @@ def shutdown_scheduler() -> None:
         scheduler.shutdown()
 
 
+async def _prune(session: AsyncSession) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.change_log_retention_days)
+    conn = await session.connection()
+    return await conn.run_sync(prune_change_log, cutoff)
+
+
 async def run_checks_job() -> None:
-    async with async_session() as session:
-        await run_scheduled_checks(session)
+    for clinic_id in clinic_scopes():
+        # The write coordinator picks the shard from the selected clinic.
+        await select_clinic(clinic_id)
+        await run_scheduled_checks(clinic_id)
+        await write_coordinator.submit(_prune)
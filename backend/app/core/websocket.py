@@ -1,8 +1,11 @@
 import asyncio
+import time
 from typing import Any
 
 from fastapi import WebSocket
 
+from app.core.metrics import WEBSOCKET_BROADCAST, WEBSOCKET_CONNECTIONS
+
 
 class ConnectionManager:
     def __init__(self) -> None:
@@ -13,19 +16,23 @@ class ConnectionManager:
         await websocket.accept()
         async with self._lock:
             self.active_connections.append(websocket)
+            WEBSOCKET_CONNECTIONS.inc()
 
     async def disconnect(self, websocket: WebSocket) -> None:
         async with self._lock:
             if websocket in self.active_connections:
                 self.active_connections.remove(websocket)
+                WEBSOCKET_CONNECTIONS.dec()
 
     async def broadcast(self, message: Any) -> None:
+        started = time.perf_counter()
         async with self._lock:
             for connection in list(self.active_connections):
                 try:
                     await connection.send_json(message)
                 except Exception:
                     await self.disconnect(connection)
+        WEBSOCKET_BROADCAST.observe(time.perf_counter() - started)
 
 
 ws_manager = ConnectionManager()
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.db.sharding import current_clinic, shard_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteUnit = Callable[[AsyncSession], Awaitable[T]]
+PendingWrite = tuple[WriteUnit, asyncio.Future, int | None]
+
+
+class WriteCoordinator:
+    # Units run inside a shared transaction and must not commit or roll back the session themselves.
+    def __init__(self, max_batch: int, window: float, max_pending: int) -> None:
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: asyncio.Queue[PendingWrite] = asyncio.Queue(maxsize=max_pending)
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopping = True
+        await self._task
+        self._task = None
+
+    async def submit(self, unit: WriteUnit[T]) -> T:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        clinic_id = current_clinic.get() if shard_registry is not None else None
+        await self._queue.put((unit, future, clinic_id))
+        return await future
+
+    def _drain(self, batch: list[PendingWrite]) -> None:
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _collect(self) -> list[PendingWrite]:
+        batch: list[PendingWrite] = []
+        if self._stopping:
+            self._drain(batch)
+            return batch
+        try:
+            batch.append(await asyncio.wait_for(self._queue.get(), timeout=0.5))
+        except asyncio.TimeoutError:
+            return batch
+        if self.window > 0:
+            await asyncio.sleep(self.window)
+        self._drain(batch)
+        return batch
+
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                # Each shard is its own database, so a batch commits once per clinic it touches.
+                groups: dict[int | None, list[PendingWrite]] = defaultdict(list)
+                for item in batch:
+                    groups[item[2]].append(item)
+                for clinic_id, group in groups.items():
+                    await self._apply(group, clinic_id)
+
+    async def _apply(self, batch: list[PendingWrite], clinic_id: int | None = None) -> None:
+        outcomes: list[tuple[asyncio.Future, Any, BaseException | None]] = []
+        try:
+            async with async_session(info={"clinic_id": clinic_id}) as session:
+                for unit, future, _ in batch:
+                    try:
+                        # A savepoint per unit lets one failing request roll back without sinking the batch.
+                        async with session.begin_nested():
+                            result = await unit(session)
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+                    else:
+                        outcomes.append((future, result, None))
+                await session.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %d write units failed", len(batch))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+write_coordinator = WriteCoordinator(
+    max_batch=settings.write_coordinator_max_batch,
+    window=settings.write_coordinator_window,
+    max_pending=settings.write_coordinator_max_pending,
+)
@@ -0,0 +1,81 @@
+from sqlalchemy.engine import Connection
+
+BOARD_TABLE = "appointment_board"
+
+# A patient's current coverage is their oldest insurance record; checks update it in place.
+_CURRENT_RECORD = "(SELECT min(current.id) FROM insurance_records current WHERE current.patient_id = a.patient_id)"
+
+_PROJECT_APPOINTMENTS = f"""
+    INSERT OR REPLACE INTO {BOARD_TABLE} (
+        appointment_id, clinic_id, scheduled_time, verification_status, copay, provider,
+        patient_id, patient_first_name, patient_last_name,
+        insurance_provider, insurance_status, insurance_copay, insurance_last_checked
+    )
+    SELECT
+        a.id, a.clinic_id, a.scheduled_time, a.verification_status, a.copay, a.provider,
+        a.patient_id, p.first_name, p.last_name,
+        r.provider, r.status, r.copay, r.last_checked
+    FROM appointments a
+    LEFT JOIN patients p ON p.id = a.patient_id
+    LEFT JOIN insurance_records r ON r.id = {_CURRENT_RECORD}
+"""
+
+
+def _refresh(where: str) -> str:
+    return f"{_PROJECT_APPOINTMENTS} WHERE {where};"
+
+
+BOARD_STATEMENTS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS appointments_board_insert AFTER INSERT ON appointments BEGIN
+        {_refresh("a.id = new.id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS appointments_board_update AFTER UPDATE ON appointments BEGIN
+        DELETE FROM {BOARD_TABLE} WHERE appointment_id = old.id AND old.id IS NOT new.id;
+        {_refresh("a.id = new.id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS appointments_board_delete AFTER DELETE ON appointments BEGIN
+        DELETE FROM {BOARD_TABLE} WHERE appointment_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS patients_board_update AFTER UPDATE OF first_name, last_name ON patients BEGIN
+        {_refresh("a.patient_id = new.id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insurance_board_insert AFTER INSERT ON insurance_records BEGIN
+        {_refresh("a.patient_id = new.patient_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insurance_board_update AFTER UPDATE ON insurance_records BEGIN
+        {_refresh("a.patient_id IN (old.patient_id, new.patient_id)")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insurance_board_delete AFTER DELETE ON insurance_records BEGIN
+        {_refresh("a.patient_id = old.patient_id")}
+    END
+    """,
+]
+
+
+def rebuild_board(conn: Connection) -> int:
+    conn.exec_driver_sql(f"DELETE FROM {BOARD_TABLE}")
+    conn.exec_driver_sql(_PROJECT_APPOINTMENTS)
+    return conn.exec_driver_sql(f"SELECT count(*) FROM {BOARD_TABLE}").scalar()
+
+
+def install_board_projection(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        return
+    for statement in BOARD_STATEMENTS:
+        conn.exec_driver_sql(statement)
+    projected = conn.exec_driver_sql(f"SELECT count(*) FROM {BOARD_TABLE}").scalar()
+    if not projected:
+        rebuild_board(conn)
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+from sqlalchemy.engine import Connection
+
+CHANGE_TABLE = "change_log"
+HORIZON_TABLE = "change_log_horizon"
+
+
+def _record(entity: str, entity_id: str, op: str, clinic_id: str) -> str:
+    return (
+        f"INSERT INTO {CHANGE_TABLE} (clinic_id, entity, entity_id, op, created_at) "
+        f"VALUES ({clinic_id}, '{entity}', {entity_id}, '{op}', CURRENT_TIMESTAMP);"
+    )
+
+
+def _record_alert(alert: str, op: str) -> str:
+    # Alerts are scoped through their appointment; an orphaned alert has no clinic to notify.
+    return (
+        f"INSERT INTO {CHANGE_TABLE} (clinic_id, entity, entity_id, op, created_at) "
+        f"SELECT a.clinic_id, 'alert', {alert}.id, '{op}', CURRENT_TIMESTAMP "
+        f"FROM appointments a WHERE a.id = {alert}.appointment_id;"
+    )
+
+
+CHANGE_STATEMENTS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS appointments_change_insert AFTER INSERT ON appointments BEGIN
+        {_record("appointment", "new.id", "upsert", "new.clinic_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS appointments_change_update AFTER UPDATE ON appointments BEGIN
+        {_record("appointment", "new.id", "upsert", "new.clinic_id")}
+        INSERT INTO {CHANGE_TABLE} (clinic_id, entity, entity_id, op, created_at)
+        SELECT old.clinic_id, 'appointment', old.id, 'delete', CURRENT_TIMESTAMP
+        WHERE old.clinic_id IS NOT new.clinic_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS appointments_change_delete AFTER DELETE ON appointments BEGIN
+        {_record("appointment", "old.id", "delete", "old.clinic_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS alerts_change_insert AFTER INSERT ON alerts BEGIN
+        {_record_alert("new", "upsert")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS alerts_change_update AFTER UPDATE ON alerts BEGIN
+        {_record_alert("new", "upsert")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS alerts_change_delete AFTER DELETE ON alerts BEGIN
+        {_record_alert("old", "delete")}
+    END
+    """,
+]
+
+
+CHANGE_TRIGGERS = [
+    "appointments_change_insert",
+    "appointments_change_update",
+    "appointments_change_delete",
+    "alerts_change_insert",
+    "alerts_change_update",
+    "alerts_change_delete",
+]
+
+
+def install_change_triggers(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        return
+    # Installs run on schema upgrades, so triggers are replaced rather than kept from an older version.
+    for trigger in CHANGE_TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    for statement in CHANGE_STATEMENTS:
+        conn.exec_driver_sql(statement)
+
+
+def prune_change_log(conn: Connection, cutoff: datetime) -> int:
+    # seq and created_at grow together, so the first row inside the retention window bounds a range delete.
+    stamp = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+    first_kept = conn.exec_driver_sql(
+        f"SELECT seq FROM {CHANGE_TABLE} WHERE created_at >= ? ORDER BY seq LIMIT 1", (stamp,)
+    ).scalar()
+    if first_kept is None:
+        first_kept = (conn.exec_driver_sql(f"SELECT max(seq) FROM {CHANGE_TABLE}").scalar() or 0) + 1
+    conn.exec_driver_sql(
+        f"INSERT INTO {HORIZON_TABLE} (clinic_id, seq) "
+        f"SELECT clinic_id, max(seq) FROM {CHANGE_TABLE} WHERE seq < ? GROUP BY clinic_id "
+        "ON CONFLICT (clinic_id) DO UPDATE SET seq = max(seq, excluded.seq)",
+        (first_kept,),
+    )
+    return conn.exec_driver_sql(f"DELETE FROM {CHANGE_TABLE} WHERE seq < ?", (first_kept,)).rowcount
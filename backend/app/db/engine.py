@@ -0,0 +1,102 @@
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import POOL_CHECKOUTS, POOL_WAIT
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_sqlite_file(url: str) -> bool:
+    return is_sqlite(url) and make_url(url).database not in (None, "", ":memory:")
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    metrics_label = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.labels(pool=self.metrics_label).observe(time.perf_counter() - started)
+
+
+def _pool_label(url: str, read_only: bool) -> str:
+    database = make_url(url).database or "memory"
+    return f"{Path(database).stem}:{'read' if read_only else 'write'}"
+
+
+def _sqlite_pragmas(profile: str, read_only: bool, foreign_keys: bool) -> list[str]:
+    pragmas = []
+    if profile == "production":
+        pragmas += [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+            f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+            f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+        if foreign_keys:
+            pragmas.append("PRAGMA foreign_keys=ON")
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def build_engine(
+    url: str,
+    profile: str = "default",
+    read_only: bool = False,
+    foreign_keys: bool = True,
+) -> AsyncEngine:
+    options = {}
+    if profile == "production" and is_sqlite_file(url):
+        # aiosqlite defaults to NullPool, which opens a connection and thread per session; keep a warm pool instead.
+        options = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": settings.database_read_pool_size if read_only else settings.database_pool_size,
+            "max_overflow": settings.database_max_overflow,
+            "pool_timeout": settings.database_pool_timeout,
+        }
+    new_engine = create_async_engine(url, echo=False, future=True, **options)
+    label = _pool_label(url, read_only)
+    pool = new_engine.sync_engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics_label = label
+
+    @event.listens_for(pool, "checkout")
+    def _count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        POOL_CHECKOUTS.labels(pool=label).inc()
+
+    if not is_sqlite(url):
+        return new_engine
+
+    pragmas = _sqlite_pragmas(profile, read_only, foreign_keys)
+    # The sqlite driver's implicit transactions break SAVEPOINT, so writers take over BEGIN themselves.
+    # They take the write lock up front: a deferred transaction that reads and then writes fails at once with
+    # SQLITE_BUSY_SNAPSHOT if another writer committed in between, whereas BEGIN IMMEDIATE waits out busy_timeout.
+    explicit_begin = not read_only
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record) -> None:
+        if explicit_begin:
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    if explicit_begin:
+        @event.listens_for(new_engine.sync_engine, "begin")
+        def _begin(conn) -> None:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return new_engine
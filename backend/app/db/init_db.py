@@ -1,29 +1,44 @@
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
-from app.db.base import Base
+from app.core.hashing import password_hasher
+from app.db.migrations import ensure_schema
 from app.db.models import Appointment, Clinic, InsuranceRecord, Patient, PatientAccount, User, VerificationStatus
 from app.db.session import engine
+from app.db.sharding import select_clinic, shard_registry
 
 
-async def init_db(session: AsyncSession) -> None:
+async def init_db(session: AsyncSession) -> bool:
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        upgraded = await conn.run_sync(ensure_schema)
+        if upgraded and shard_registry is None:
+            await conn.execute(
+                update(PatientAccount)
+                .where(PatientAccount.clinic_id.is_(None))
+                .values(
+                    clinic_id=select(Patient.clinic_id)
+                    .where(Patient.id == PatientAccount.patient_id)
+                    .scalar_subquery()
+                )
+            )
+    if not upgraded:
+        # Seeding only runs alongside a schema change, which keeps restarts free of lookups and bcrypt work.
+        return False
 
     clinic = (await session.execute(select(Clinic))).scalars().first()
     if not clinic:
         clinic = Clinic(name="Demo Dental Group", timezone="UTC")
         session.add(clinic)
         await session.flush()
+    await select_clinic(clinic.id)
 
     super_admin = (await session.execute(select(User).filter_by(role="super_admin"))).scalars().first()
     if not super_admin:
         super_admin = User(
             email="admin@clinic.com",
-            hashed_password=hash_password("admin123"),
+            hashed_password=await password_hasher.hash("admin123"),
             role="super_admin",
             clinic_id=clinic.id,
         )
@@ -33,7 +48,7 @@ async def init_db(session: AsyncSession) -> None:
     if not demo_admin:
         demo_admin = User(
             email="demo@clinic.com",
-            hashed_password=hash_password("demo123"),
+            hashed_password=await password_hasher.hash("demo123"),
             role="super_admin",
             clinic_id=clinic.id,
         )
@@ -51,9 +66,10 @@ async def init_db(session: AsyncSession) -> None:
         await session.flush()
 
         demo_patient_account = PatientAccount(
+            clinic_id=clinic.id,
             patient_id=patients[0].id,
             email="ava.carter@patient.com",
-            hashed_password=hash_password("patient123"),
+            hashed_password=await password_hasher.hash("patient123"),
         )
         session.add(demo_patient_account)
 
@@ -107,3 +123,4 @@ async def init_db(session: AsyncSession) -> None:
         session.add_all(insurance_records)
 
     await session.commit()
+    return True
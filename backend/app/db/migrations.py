@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.db.base import Base
+from app.db.board import BOARD_STATEMENTS, install_board_projection
+from app.db.changes import CHANGE_STATEMENTS, install_change_triggers
+from app.db.search import SEARCH_STATEMENTS, install_search_index
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+def add_missing_columns(conn: Connection) -> None:
+    # create_all only creates missing tables, so columns added to existing models are patched in here.
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            default = f" DEFAULT {column.server_default.arg}" if column.server_default is not None else ""
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}")
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def schema_fingerprint(dialect: Dialect) -> str:
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    for statement in SEARCH_STATEMENTS + CHANGE_STATEMENTS + BOARD_STATEMENTS:
+        digest.update(statement.encode())
+    return digest.hexdigest()[:32]
+
+
+def stored_fingerprint(conn: Connection) -> str | None:
+    if not inspect(conn).has_table(SCHEMA_VERSION_TABLE):
+        return None
+    return conn.exec_driver_sql(f"SELECT fingerprint FROM {SCHEMA_VERSION_TABLE}").scalar()
+
+
+def stamp_schema(conn: Connection) -> None:
+    fingerprint = schema_fingerprint(conn.dialect)
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} "
+        "(fingerprint VARCHAR(64) NOT NULL, applied_at DATETIME NOT NULL)"
+    )
+    conn.exec_driver_sql(f"DELETE FROM {SCHEMA_VERSION_TABLE}")
+    conn.execute(
+        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (fingerprint, applied_at) VALUES (:fingerprint, :applied_at)"),
+        {"fingerprint": fingerprint, "applied_at": datetime.utcnow()},
+    )
+
+
+def ensure_schema(conn: Connection) -> bool:
+    # Returns True when the schema had to be created or upgraded, so callers know to seed.
+    if stored_fingerprint(conn) == schema_fingerprint(conn.dialect):
+        return False
+    Base.metadata.create_all(conn)
+    add_missing_columns(conn)
+    install_search_index(conn)
+    install_change_triggers(conn)
+    install_board_projection(conn)
+    stamp_schema(conn)
+    return True
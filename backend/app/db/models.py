@@ -8,9 +8,11 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 
@@ -56,12 +58,18 @@ class User(Base):
     role = Column(String(32), default="user")
     clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     clinic = relationship("Clinic", back_populates="users")
 
 
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (
+        Index("ix_patients_clinic_created", "clinic_id", "created_at", "id"),
+        Index("ix_patients_clinic_last_name", "clinic_id", "last_name", "id"),
+        Index("ix_patients_clinic_dob", "clinic_id", "dob"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=False)
@@ -80,13 +88,16 @@ class Patient(Base):
 
 class PatientAccount(Base):
     __tablename__ = "patient_accounts"
+    __table_args__ = (UniqueConstraint("clinic_id", "patient_id", name="uq_patient_accounts_clinic_patient"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, unique=True)
+    clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=True, index=True)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     email = Column(String(256), unique=True, nullable=False, index=True)
     hashed_password = Column(String(512), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     patient = relationship("Patient", back_populates="account")
 
@@ -95,7 +106,7 @@ class Appointment(Base):
     __tablename__ = "appointments"
 
     id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
     clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=False)
     scheduled_time = Column(DateTime, nullable=False)
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.scheduled)
@@ -113,7 +124,7 @@ class InsuranceRecord(Base):
     __tablename__ = "insurance_records"
 
     id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
     provider = Column(String(128), nullable=False)
     status = Column(Enum(VerificationStatus), default=VerificationStatus.needs_review)
     copay = Column(Float, nullable=True)
@@ -127,7 +138,7 @@ class Alert(Base):
     __tablename__ = "alerts"
 
     id = Column(Integer, primary_key=True, index=True)
-    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False)
+    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False, index=True)
     type = Column(String(64), nullable=False)
     message = Column(Text, nullable=False)
     severity = Column(Enum(AlertSeverity), default=AlertSeverity.info)
@@ -137,10 +148,54 @@ class Alert(Base):
     appointment = relationship("Appointment", back_populates="alerts")
 
 
+class AppointmentBoardEntry(Base):
+    # Read model for the board, maintained by the triggers in app.db.board.
+    __tablename__ = "appointment_board"
+    __table_args__ = (Index("ix_appointment_board_clinic_time", "clinic_id", "scheduled_time"),)
+
+    appointment_id = Column(Integer, primary_key=True, autoincrement=False)
+    clinic_id = Column(Integer, nullable=False)
+    scheduled_time = Column(DateTime, nullable=False)
+    verification_status = Column(Enum(VerificationStatus), nullable=True)
+    copay = Column(Float, nullable=True)
+    provider = Column(String(128), nullable=True)
+    patient_id = Column(Integer, nullable=False)
+    patient_first_name = Column(String(128), nullable=True)
+    patient_last_name = Column(String(128), nullable=True)
+    insurance_provider = Column(String(128), nullable=True)
+    insurance_status = Column(Enum(VerificationStatus), nullable=True)
+    insurance_copay = Column(Float, nullable=True)
+    insurance_last_checked = Column(DateTime, nullable=True)
+
+
+class ChangeLogEntry(Base):
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_clinic_seq", "clinic_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True)
+    clinic_id = Column(Integer, nullable=False)
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(8), nullable=False)
+    created_at = Column(DateTime, nullable=True)
+
+
+class ChangeLogHorizon(Base):
+    # The newest pruned sequence per clinic; tokens below it have lost changes and must refetch.
+    __tablename__ = "change_log_horizon"
+
+    clinic_id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False)
+
+
 class VerificationLog(Base):
     __tablename__ = "verification_logs"
 
     id = Column(Integer, primary_key=True, index=True)
+    clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=True)
     status = Column(Enum(VerificationStatus), nullable=False)
@@ -150,6 +205,22 @@ class VerificationLog(Base):
     details = Column(Text, nullable=True)
 
 
+class VerificationRollup(Base):
+    __tablename__ = "verification_rollups"
+    __table_args__ = (
+        UniqueConstraint("clinic_id", "granularity", "bucket_start", "provider", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=False)
+    granularity = Column(String(8), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    provider = Column(String(128), nullable=False)
+    status = Column(Enum(VerificationStatus), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    copay_total = Column(Float, nullable=False, default=0.0)
+
+
 class Setting(Base):
     __tablename__ = "settings"
 
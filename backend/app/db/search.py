@@ -0,0 +1,110 @@
+from sqlalchemy.engine import Connection
+
+SEARCH_TABLE = "patient_search"
+
+_DIGITS_ONLY = "replace(replace(replace(replace(replace(replace(coalesce({0}, ''), '-', ''), ' ', ''), '(', ''), ')', ''), '+', ''), '.', '')"
+
+# The clinic is an indexed "<id>" token, so MATCH narrows to one clinic's rows instead of filtering afterwards.
+_CLINIC_TOKEN = "'<' || {0} || '>'"
+
+_INDEX_PATIENTS = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, clinic, name, phone, policy_ids)
+    SELECT
+        p.id,
+        {_CLINIC_TOKEN.format('p.clinic_id')},
+        p.first_name || ' ' || p.last_name,
+        coalesce(p.phone, '') || ' ' || {_DIGITS_ONLY.format('p.phone')},
+        coalesce((SELECT group_concat(r.policy_id, ' ') FROM insurance_records r WHERE r.patient_id = p.id), '')
+    FROM patients p
+"""
+
+
+def _refresh(patient_id: str) -> str:
+    return (
+        f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {patient_id};\n"
+        f"{_INDEX_PATIENTS} WHERE p.id = {patient_id};"
+    )
+
+
+SEARCH_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        clinic,
+        name,
+        phone,
+        policy_ids,
+        tokenize = 'trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS patients_search_insert AFTER INSERT ON patients BEGIN
+        {_refresh("new.id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS patients_search_update AFTER UPDATE OF clinic_id, first_name, last_name, phone ON patients BEGIN
+        {_refresh("new.id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS patients_search_delete AFTER DELETE ON patients BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insurance_search_insert AFTER INSERT ON insurance_records BEGIN
+        {_refresh("new.patient_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insurance_search_update AFTER UPDATE OF policy_id, patient_id ON insurance_records BEGIN
+        {_refresh("old.patient_id")}
+        {_refresh("new.patient_id")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insurance_search_delete AFTER DELETE ON insurance_records BEGIN
+        {_refresh("old.patient_id")}
+    END
+    """,
+]
+
+
+SEARCH_TRIGGERS = [
+    "patients_search_insert",
+    "patients_search_update",
+    "patients_search_delete",
+    "insurance_search_insert",
+    "insurance_search_update",
+    "insurance_search_delete",
+]
+
+
+def clinic_phrase(clinic_id: int) -> str:
+    return f'"<{int(clinic_id)}>"'
+
+
+def _drop_outdated_index(conn: Connection) -> None:
+    # FTS5 tables cannot be altered, so an index built before the clinic column is dropped and rebuilt.
+    columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({SEARCH_TABLE})")}
+    if not columns or "clinic" in columns:
+        return
+    for trigger in SEARCH_TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.exec_driver_sql(f"DROP TABLE {SEARCH_TABLE}")
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    conn.exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+    conn.exec_driver_sql(_INDEX_PATIENTS)
+
+
+def install_search_index(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        return
+    _drop_outdated_index(conn)
+    for statement in SEARCH_STATEMENTS:
+        conn.exec_driver_sql(statement)
+    indexed = conn.exec_driver_sql(f"SELECT count(*) FROM {SEARCH_TABLE}").scalar()
+    if not indexed:
+        rebuild_search_index(conn)
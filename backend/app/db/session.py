@@ -1,15 +1,43 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.engine import build_engine, is_sqlite_file
+from app.db.sharding import ShardedReadSession, ShardedSession, shard_registry
 
-
-engine: AsyncEngine = create_async_engine(settings.database_url, echo=False, future=True)
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+if shard_registry is not None:
+    # Sharded mode: `engine` is the global catalog and sessions pick a shard per statement.
+    engine: AsyncEngine = shard_registry.catalog
+    read_engine: AsyncEngine = shard_registry.catalog_reader
+    async_session = sessionmaker(class_=AsyncSession, sync_session_class=ShardedSession, expire_on_commit=False)
+    async_read_session = sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=ShardedReadSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+else:
+    engine = build_engine(settings.database_url, settings.database_profile)
+    if settings.database_read_url or is_sqlite_file(settings.database_url):
+        read_engine = build_engine(
+            settings.database_read_url or settings.database_url,
+            settings.database_profile,
+            read_only=True,
+        )
+    else:
+        # An in-memory database is private to its connection, so readers have to share the writer's engine.
+        read_engine = engine
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async_read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_read_session() as session:
+        yield session
@@ -0,0 +1,174 @@
+import asyncio
+import sqlite3
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+from app.core.config import settings
+from app.db.engine import build_engine
+from app.db.migrations import ensure_schema
+
+CATALOG_TABLES = {"clinics", "users", "patient_accounts", "settings"}
+
+current_clinic: ContextVar[int | None] = ContextVar("current_clinic", default=None)
+
+
+def shard_path(shard_dir: str | Path, clinic_id: int) -> Path:
+    return Path(shard_dir) / f"clinic_{clinic_id}.db"
+
+
+class ShardRegistry:
+    def __init__(self, shard_dir: str, catalog_url: str, profile: str) -> None:
+        self.shard_dir = Path(shard_dir)
+        self.profile = profile
+        # Rows reference each other across database files, which SQLite cannot enforce.
+        self.catalog = build_engine(catalog_url, profile, foreign_keys=False)
+        self.catalog_reader = build_engine(catalog_url, profile, read_only=True, foreign_keys=False)
+        self._engines: dict[tuple[int, bool], AsyncEngine] = {}
+        self._ready: set[int] = set()
+        self._lock = asyncio.Lock()
+
+    def engine(self, clinic_id: int, read_only: bool = False) -> AsyncEngine:
+        key = (clinic_id, read_only)
+        engine = self._engines.get(key)
+        if engine is None:
+            url = f"sqlite+aiosqlite:///{shard_path(self.shard_dir, clinic_id)}"
+            engine = build_engine(url, self.profile, read_only=read_only, foreign_keys=False)
+            self._engines[key] = engine
+        return engine
+
+    def clinic_ids(self) -> list[int]:
+        return sorted(int(path.stem.split("_", 1)[1]) for path in self.shard_dir.glob("clinic_*.db"))
+
+    async def ensure(self, clinic_id: int) -> None:
+        if clinic_id in self._ready:
+            return
+        async with self._lock:
+            if clinic_id in self._ready:
+                return
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+            async with self.engine(clinic_id).begin() as conn:
+                await conn.run_sync(ensure_schema)
+            self._ready.add(clinic_id)
+
+    async def dispose(self) -> None:
+        for engine in [self.catalog, self.catalog_reader, *self._engines.values()]:
+            await engine.dispose()
+        self._engines.clear()
+
+
+def _is_catalog(mapper: Any, clause: Any) -> bool:
+    if mapper is not None:
+        return mapper.local_table.name in CATALOG_TABLES
+    if clause is None:
+        return False
+    tables = {table.name for table in find_tables(clause, include_crud=True) if hasattr(table, "name")}
+    return bool(tables) and tables <= CATALOG_TABLES
+
+
+class ShardedSession(Session):
+    registry: ShardRegistry
+    read_only = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if _is_catalog(mapper, clause):
+            engine = self.registry.catalog_reader if self.read_only else self.registry.catalog
+            return engine.sync_engine
+        clinic_id = self.info.get("clinic_id")
+        if clinic_id is None:
+            clinic_id = current_clinic.get()
+        if clinic_id is None:
+            raise LookupError("No clinic selected for a sharded session")
+        return self.registry.engine(clinic_id, self.read_only).sync_engine
+
+
+class ShardedReadSession(ShardedSession):
+    read_only = True
+
+
+def _copy_rows(conn: sqlite3.Connection, table: str, where: str = "", params: tuple = ()) -> int:
+    target_columns = {row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")}
+    source_columns = [row[1] for row in conn.execute(f"PRAGMA source.table_info({table})")]
+    columns = ", ".join(column for column in source_columns if column in target_columns)
+    if not columns:
+        return 0
+    cursor = conn.execute(
+        f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM source.{table} {where}",
+        params,
+    )
+    return cursor.rowcount
+
+
+def _create_schema(path: Path) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        ensure_schema(conn)
+    engine.dispose()
+
+
+def split_database(source: str | Path, catalog: str | Path, shard_dir: str | Path) -> dict[int, int]:
+    source, catalog, shard_dir = Path(source), Path(catalog), Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    _create_schema(catalog)
+    with sqlite3.connect(catalog) as conn:
+        conn.execute("ATTACH DATABASE ? AS source", (str(source),))
+        for table in sorted(CATALOG_TABLES):
+            conn.execute(f"DELETE FROM main.{table}")
+            _copy_rows(conn, table)
+        conn.execute(
+            "UPDATE main.patient_accounts SET clinic_id = "
+            "(SELECT clinic_id FROM source.patients p WHERE p.id = patient_accounts.patient_id) "
+            "WHERE clinic_id IS NULL"
+        )
+        clinic_ids = [row[0] for row in conn.execute("SELECT id FROM source.clinics ORDER BY id")]
+    conn.close()
+
+    clinic_patients = "SELECT id FROM source.patients WHERE clinic_id = ?"
+    clinic_appointments = "SELECT id FROM source.appointments WHERE clinic_id = ?"
+    copied: dict[int, int] = {}
+    for clinic_id in clinic_ids:
+        path = shard_path(shard_dir, clinic_id)
+        path.unlink(missing_ok=True)
+        _create_schema(path)
+        with sqlite3.connect(path) as conn:
+            conn.execute("ATTACH DATABASE ? AS source", (str(source),))
+            rows = _copy_rows(conn, "clinics", "WHERE id = ?", (clinic_id,))
+            rows += _copy_rows(conn, "patients", "WHERE clinic_id = ?", (clinic_id,))
+            rows += _copy_rows(conn, "appointments", "WHERE clinic_id = ?", (clinic_id,))
+            rows += _copy_rows(conn, "insurance_records", f"WHERE patient_id IN ({clinic_patients})", (clinic_id,))
+            rows += _copy_rows(conn, "alerts", f"WHERE appointment_id IN ({clinic_appointments})", (clinic_id,))
+            log_columns = {row[1] for row in conn.execute("PRAGMA source.table_info(verification_logs)")}
+            if "clinic_id" in log_columns:
+                log_filter = f"WHERE clinic_id = ? OR (clinic_id IS NULL AND appointment_id IN ({clinic_appointments}))"
+                log_params: tuple = (clinic_id, clinic_id)
+            else:
+                log_filter, log_params = f"WHERE appointment_id IN ({clinic_appointments})", (clinic_id,)
+            rows += _copy_rows(conn, "verification_logs", log_filter, log_params)
+            rows += _copy_rows(conn, "verification_rollups", "WHERE clinic_id = ?", (clinic_id,))
+            # Copying fires the change triggers; a fresh shard starts with an empty feed.
+            conn.execute("DELETE FROM main.change_log")
+            copied[clinic_id] = rows
+        conn.close()
+    return copied
+
+
+shard_registry: ShardRegistry | None = None
+if settings.database_shard_dir:
+    shard_registry = ShardRegistry(settings.database_shard_dir, settings.database_url, settings.database_profile)
+    ShardedSession.registry = shard_registry
+
+
+def clinic_scopes() -> list[int | None]:
+    return shard_registry.clinic_ids() if shard_registry is not None else [None]
+
+
+async def select_clinic(clinic_id: int | None) -> None:
+    current_clinic.set(clinic_id)
+    if shard_registry is not None and clinic_id is not None:
+        await shard_registry.ensure(clinic_id)
@@ -1,43 +1,62 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
 
 from app.api.v1 import api_router
 from app.core.config import settings
-from app.core.scheduler import shutdown_scheduler, start_scheduler
+from app.core.hashing import password_hasher
+from app.core.lifecycle import lifecycle
+from app.core.log_writer import log_writer
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import rate_limiter
+from app.core.scheduler import run_checks_job, shutdown_scheduler, start_scheduler
+from app.core.write_coordinator import write_coordinator
 from app.db.init_db import init_db
 from app.db.session import async_session
-from app.services.insurance import run_scheduled_checks
+from app.services.dashboard import dashboard_cache
 
 app = FastAPI(title=settings.project_name)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-app.add_middleware(SlowAPIMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=list(settings.frontend_origins),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+        "Retry-After",
+        "X-Profile-Id",
+    ],
 )
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(api_router, prefix="/api/v1")
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 
 @app.on_event("startup")
 async def startup_event() -> None:
+    lifecycle.booting()
+    log_writer.start()
     async with async_session() as session:
         await init_db(session)
-        await run_scheduled_checks(session)
     start_scheduler()
+    lifecycle.mark_ready()
+    # The first sweep can take as long as the appointment window is big, so it runs after boot.
+    lifecycle.start_sweep(run_checks_job)
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     shutdown_scheduler()
+    await lifecycle.stop()
+    await dashboard_cache.stop()
+    await write_coordinator.stop()
+    await log_writer.stop()
+    password_hasher.shutdown()
+    rate_limiter.close()
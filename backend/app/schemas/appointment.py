@@ -42,3 +42,9 @@ class AppointmentCreate(BaseModel):
     provider: Optional[str] = None
     copay: Optional[float] = None
     verification_status: Optional[str] = None
+
+
+class AppointmentAvailability(BaseModel):
+    provider: str
+    slot_minutes: int
+    slots: List[datetime]
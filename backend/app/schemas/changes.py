@@ -0,0 +1,15 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.alert import AlertRead
+from app.schemas.appointment import AppointmentRead
+
+
+class ChangeFeed(BaseModel):
+    appointments: List[AppointmentRead] = []
+    alerts: List[AlertRead] = []
+    deleted_appointments: List[int] = []
+    deleted_alerts: List[int] = []
+    next_token: str
+    has_more: bool = False
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class Liveness(BaseModel):
+    status: str
+
+
+class Readiness(BaseModel):
+    status: str
+    database: bool
+    boot_seconds: Optional[float] = None
+    initial_sweep: str
+
+
+class PasswordHashingStats(BaseModel):
+    workers: int
+    in_flight: int
+    completed: int
+    rejected: int
+    rehashed: int
+    queue_seconds_avg: float
+    queue_seconds_max: float
+    hash_seconds_avg: float
@@ -22,13 +22,14 @@ class AppointmentDetail(BaseModel):
 
 class PatientDetail(BaseModel):
     id: int
-    first_name: str
-    last_name: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
     email: EmailStr | None = None
     phone: str | None = None
-    dob: Optional[datetime]
-    appointments: List[AppointmentDetail]
-    insurance_records: List[InsuranceRecordDetail]
+    dob: Optional[datetime] = None
+    appointments: Optional[List[AppointmentDetail]] = None
+    appointments_next_cursor: Optional[str] = None
+    insurance_records: Optional[List[InsuranceRecordDetail]] = None
 
     model_config = {
         "from_attributes": True,
@@ -48,3 +49,13 @@ class PatientSummary(BaseModel):
     model_config = {
         "from_attributes": True,
     }
+
+
+class PatientSearchResult(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    phone: str | None = None
+    dob: Optional[datetime]
+    policy_ids: List[str]
+    score: float
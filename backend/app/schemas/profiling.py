@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ProfiledFunction(BaseModel):
+    function: str
+    calls: int
+    total_ms: float
+    cumulative_ms: float
+
+
+class ProfiledStatement(BaseModel):
+    offset_ms: float
+    duration_ms: float
+    statement: str
+
+
+class ProfileSummary(BaseModel):
+    id: int
+    trigger: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: int
+    started_at: datetime
+    duration_ms: float
+    sql_count: int
+    sql_ms: float
+
+
+class ProfileDetail(ProfileSummary):
+    functions: List[ProfiledFunction]
+    sql: List[ProfiledStatement]
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+
+class RuleRead(BaseModel):
+    name: str
+    description: str
+    severity: str
+    when: Dict[str, Any]
+
+
+class RuleOutcome(BaseModel):
+    rule: str
+    matched: int
+    created: int
+
+
+class RuleEvaluation(BaseModel):
+    window_start: datetime
+    window_end: datetime
+    evaluated: int
+    alerts_created: int
+    outcomes: List[RuleOutcome]
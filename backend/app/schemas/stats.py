@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class StatsTotals(BaseModel):
+    scanned: int
+    verified: int
+    needs_review: int
+    failed: int
+    success_rate: float
+
+
+class PayerStats(StatsTotals):
+    provider: str
+
+
+class TrendPoint(StatsTotals):
+    bucket_start: datetime
+
+
+class VerificationStats(BaseModel):
+    granularity: str
+    from_time: datetime
+    to_time: datetime
+    totals: StatsTotals
+    payers: List[PayerStats]
+    trend: List[TrendPoint]
+
+
+class ProviderWindowCounts(BaseModel):
+    provider: str
+    total: int
+    verified: int
+    needs_review: int
+    expired: int
+
+
+class DashboardSummary(BaseModel):
+    window_start: datetime
+    window_end: datetime
+    generated_at: datetime
+    total: int
+    by_status: Dict[str, int]
+    providers: List[ProviderWindowCounts]
+    expiring_coverage: int
+    stale: bool = False
@@ -0,0 +1,201 @@
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.write_coordinator import write_coordinator
+from app.db.models import Appointment, AppointmentStatus, ChangeLogEntry
+from app.db.session import async_read_session
+
+_start = itemgetter(0)
+
+# (seq, appointment id, provider, scheduled_time, status); the appointment columns are None once it is gone.
+ChangeRow = tuple[int, int, str | None, datetime | None, AppointmentStatus | None]
+
+
+def _slot_key(value: datetime) -> datetime:
+    # SQLite keeps the wall-clock value and drops any offset, so the index compares the same way.
+    return value.replace(tzinfo=None)
+
+
+def _books_slot(provider: str | None, scheduled_time: datetime | None, appointment_status) -> bool:
+    return (
+        provider is not None
+        and scheduled_time is not None
+        and appointment_status is not AppointmentStatus.cancelled
+    )
+
+
+class ClinicSchedule:
+    # Sorted (start, appointment id) pairs per provider; every booking occupies one fixed-length slot.
+    def __init__(self, seq: int) -> None:
+        self.seq = seq
+        self.providers: dict[str, list[tuple[datetime, int]]] = defaultdict(list)
+        self.positions: dict[int, tuple[str, datetime]] = {}
+
+    def add(self, appointment_id: int, provider: str, scheduled_time: datetime) -> None:
+        self.discard(appointment_id)
+        entry = (_slot_key(scheduled_time), appointment_id)
+        insort(self.providers[provider], entry)
+        self.positions[appointment_id] = (provider, entry[0])
+
+    def discard(self, appointment_id: int) -> None:
+        position = self.positions.pop(appointment_id, None)
+        if position is None:
+            return
+        provider, start = position
+        entries = self.providers[provider]
+        index = bisect_left(entries, (start, appointment_id))
+        if index < len(entries) and entries[index] == (start, appointment_id):
+            del entries[index]
+
+    def apply(self, rows: list[ChangeRow]) -> None:
+        for seq, appointment_id, provider, scheduled_time, appointment_status in rows:
+            if _books_slot(provider, scheduled_time, appointment_status):
+                self.add(appointment_id, provider, scheduled_time)
+            else:
+                self.discard(appointment_id)
+            self.seq = max(self.seq, seq)
+
+    def booked(self, provider: str, start: datetime, end: datetime) -> list[tuple[datetime, int]]:
+        entries = self.providers.get(provider, [])
+        return entries[bisect_left(entries, start, key=_start):bisect_left(entries, end, key=_start)]
+
+
+class SlotIndex:
+    # Per-process and lazily loaded per clinic. The change log brings in writes made by other processes,
+    # and bookings are checked inside the write coordinator's transaction, which holds the database write lock.
+    def __init__(self, slot_minutes: int) -> None:
+        self.slot = timedelta(minutes=slot_minutes)
+        self._schedules: dict[int, ClinicSchedule] = {}
+        self._locks: dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def schedule(self, clinic_id: int) -> ClinicSchedule:
+        async with self._locks[clinic_id]:
+            async with async_read_session(info={"clinic_id": clinic_id}) as session:
+                schedule = self._schedules.get(clinic_id)
+                if schedule is None:
+                    schedule = self._schedules[clinic_id] = await self._load(session, clinic_id)
+                else:
+                    schedule.apply(await self._changes(session, clinic_id, schedule.seq))
+                return schedule
+
+    async def _load(self, session: AsyncSession, clinic_id: int) -> ClinicSchedule:
+        # The sequence is read first, so a write landing between the two queries is replayed rather than lost.
+        seq = await session.scalar(
+            select(func.max(ChangeLogEntry.seq)).where(ChangeLogEntry.clinic_id == clinic_id)
+        )
+        schedule = ClinicSchedule(seq or 0)
+        rows = await session.execute(
+            select(Appointment.id, Appointment.provider, Appointment.scheduled_time).where(
+                Appointment.clinic_id == clinic_id,
+                Appointment.provider.is_not(None),
+                Appointment.status.is_distinct_from(AppointmentStatus.cancelled),
+            )
+        )
+        for appointment_id, provider, scheduled_time in rows:
+            entry = (_slot_key(scheduled_time), appointment_id)
+            schedule.providers[provider].append(entry)
+            schedule.positions[appointment_id] = (provider, entry[0])
+        for entries in schedule.providers.values():
+            entries.sort()
+        return schedule
+
+    async def _changes(self, session: AsyncSession, clinic_id: int, after: int) -> list[ChangeRow]:
+        stmt = (
+            select(
+                ChangeLogEntry.seq,
+                ChangeLogEntry.entity_id,
+                Appointment.provider,
+                Appointment.scheduled_time,
+                Appointment.status,
+            )
+            .outerjoin(
+                Appointment,
+                and_(Appointment.id == ChangeLogEntry.entity_id, Appointment.clinic_id == ChangeLogEntry.clinic_id),
+            )
+            .where(
+                ChangeLogEntry.clinic_id == clinic_id,
+                ChangeLogEntry.entity == "appointment",
+                ChangeLogEntry.seq > after,
+            )
+            .order_by(ChangeLogEntry.seq)
+        )
+        return [tuple(row) for row in await session.execute(stmt)]
+
+    def _conflicts(
+        self,
+        schedule: ClinicSchedule,
+        provider: str,
+        start: datetime,
+        pending: dict[int, ChangeRow],
+    ) -> bool:
+        earliest = start - self.slot + timedelta(microseconds=1)
+        for _, appointment_id in schedule.booked(provider, earliest, start + self.slot):
+            if appointment_id not in pending:
+                return True
+        for _, _, other_provider, other_time, other_status in pending.values():
+            if (
+                other_provider == provider
+                and _books_slot(other_provider, other_time, other_status)
+                and abs(_slot_key(other_time) - start) < self.slot
+            ):
+                return True
+        return False
+
+    async def book(self, clinic_id: int, build: Callable[[], Appointment]) -> Appointment:
+        schedule = await self.schedule(clinic_id)
+        held: list[int] = []
+
+        async def insert(session: AsyncSession) -> Appointment:
+            appointment = build()
+            if appointment.provider is not None:
+                # Writes committed since the last catch-up, plus earlier units of this batch, are checked
+                # as they stand now but left out of the index until they are known to be committed.
+                pending = {row[1]: row for row in await self._changes(session, clinic_id, schedule.seq)}
+                if self._conflicts(schedule, appointment.provider, _slot_key(appointment.scheduled_time), pending):
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Provider is already booked at that time",
+                    )
+            session.add(appointment)
+            await session.flush()
+            if appointment.provider is not None:
+                schedule.add(appointment.id, appointment.provider, appointment.scheduled_time)
+                held.append(appointment.id)
+            return appointment
+
+        try:
+            return await write_coordinator.submit(insert)
+        except BaseException:
+            for appointment_id in held:
+                schedule.discard(appointment_id)
+            raise
+
+    async def free_slots(self, clinic_id: int, provider: str, start: datetime, end: datetime) -> list[datetime]:
+        schedule = await self.schedule(clinic_id)
+        start, end = _slot_key(start), _slot_key(end)
+        # Candidates sit on the slot grid counted from midnight, starting at the first one not before `start`.
+        midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        candidate = midnight - (midnight - start) // self.slot * self.slot
+        booked = [booked_start for booked_start, _ in schedule.booked(provider, candidate - self.slot, end + self.slot)]
+        slots = []
+        while candidate + self.slot <= end:
+            first = bisect_right(booked, candidate - self.slot)
+            if first == len(booked) or booked[first] >= candidate + self.slot:
+                slots.append(candidate)
+            candidate += self.slot
+        return slots
+
+    def clear(self) -> None:
+        self._schedules.clear()
+
+
+slot_index = SlotIndex(slot_minutes=settings.appointment_slot_minutes)
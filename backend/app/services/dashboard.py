@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, func, or_, select
+
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.config import settings
+from app.db.models import AppointmentBoardEntry, VerificationStatus
+from app.db.session import async_read_session
+from app.schemas.stats import DashboardSummary, ProviderWindowCounts
+
+UNASSIGNED_PROVIDER = "Unassigned"
+
+dashboard_cache: StaleWhileRevalidateCache[DashboardSummary] = StaleWhileRevalidateCache(
+    max_entries=settings.dashboard_cache_size,
+    ttl=settings.dashboard_cache_ttl,
+    stale_ttl=settings.dashboard_cache_stale,
+)
+
+
+async def compute_dashboard_summary(clinic_id: int, hours: int) -> DashboardSummary:
+    now = datetime.utcnow()
+    end = now + timedelta(hours=hours)
+    checked_before = now - timedelta(days=settings.dashboard_stale_coverage_days)
+    board = AppointmentBoardEntry
+    # Same status the board shows: the current policy's, falling back to the appointment's own.
+    effective_status = func.coalesce(
+        board.insurance_status, board.verification_status, type_=board.verification_status.type
+    )
+    # Coverage needs attention when the payer reported it expired or nobody has checked it recently.
+    expiring = case(
+        (
+            and_(
+                board.insurance_provider.is_not(None),
+                or_(
+                    board.insurance_status == VerificationStatus.expired,
+                    board.insurance_last_checked.is_(None),
+                    board.insurance_last_checked < checked_before,
+                ),
+            ),
+            1,
+        ),
+        else_=0,
+    )
+    stmt = (
+        select(board.provider, effective_status, func.count(), func.sum(expiring))
+        .where(board.clinic_id == clinic_id, board.scheduled_time >= now, board.scheduled_time <= end)
+        .group_by(board.provider, effective_status)
+    )
+    async with async_read_session(info={"clinic_id": clinic_id}) as session:
+        rows = (await session.execute(stmt)).all()
+
+    by_status = {status.value: 0 for status in VerificationStatus}
+    providers: dict[str, ProviderWindowCounts] = {}
+    expiring_coverage = 0
+    for provider, status, count, expiring_count in rows:
+        name = provider or UNASSIGNED_PROVIDER
+        counts = providers.get(name)
+        if counts is None:
+            counts = providers[name] = ProviderWindowCounts(
+                provider=name, total=0, verified=0, needs_review=0, expired=0
+            )
+        status = status or VerificationStatus.needs_review
+        counts.total += count
+        setattr(counts, status.value, getattr(counts, status.value) + count)
+        by_status[status.value] += count
+        expiring_coverage += expiring_count or 0
+    return DashboardSummary(
+        window_start=now,
+        window_end=end,
+        generated_at=now,
+        total=sum(by_status.values()),
+        by_status=by_status,
+        providers=sorted(providers.values(), key=lambda counts: (-counts.total, counts.provider)),
+        expiring_coverage=expiring_coverage,
+    )
+
+
+async def get_dashboard_summary(clinic_id: int, hours: int) -> DashboardSummary:
+    summary, stale = await dashboard_cache.get(
+        (clinic_id, hours), lambda: compute_dashboard_summary(clinic_id, hours)
+    )
+    return summary.model_copy(update={"stale": stale})
@@ -0,0 +1,68 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import Select
+
+from app.db.session import async_read_session
+
+EXPORT_BATCH_SIZE = 2000
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _encode_csv(columns: Sequence[str], rows: Sequence[Sequence[Any]], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_serialize(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps({column: _serialize(value) for column, value in zip(columns, row)}) + "\n"
+        for row in rows
+    )
+
+
+async def stream_export(
+    stmt: Select,
+    export_format: str,
+    compress: bool = False,
+    clinic_id: int | None = None,
+) -> AsyncIterator[bytes]:
+    columns = [column.key for column in stmt.selected_columns]
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    def _encode(chunk: str) -> bytes:
+        data = chunk.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        yield _encode(_encode_csv(columns, [], header=True))
+
+    # The request's own session is closed before the body is sent, so the export owns its session.
+    async with async_read_session(info={"clinic_id": clinic_id}) as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            if export_format == "csv":
+                data = _encode(_encode_csv(columns, rows, header=False))
+            else:
+                data = _encode(_encode_ndjson(columns, rows))
+            if data:
+                yield data
+
+    if compressor:
+        yield compressor.flush()
@@ -1,21 +1,30 @@
 import hashlib
 from datetime import datetime, timedelta
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
+from app.core.log_writer import log_writer
+from app.core.metrics import record_verification
 from app.core.websocket import ws_manager
+from app.core.write_coordinator import write_coordinator
 from app.db.models import (
     Alert,
     AlertSeverity,
     Appointment,
     InsuranceRecord,
     Patient,
-    VerificationLog,
     VerificationStatus,
 )
+from app.db.session import async_read_session
 from app.schemas.insurance import SimulationResult
+from app.services.rules import apply_rules, broadcast_rule_alerts, eligibility_rules
+
+
+def current_insurance_record(patient_id: int) -> Select:
+    # The oldest record is the patient's current coverage; checks update it in place (see app.db.board).
+    return select(InsuranceRecord).where(InsuranceRecord.patient_id == patient_id).order_by(InsuranceRecord.id).limit(1)
 
 
 def deterministic_status(patient_id: int, appointment_id: int) -> VerificationStatus:
@@ -70,22 +79,24 @@ async def create_alert(
 
 
 async def log_verification(
-    session: AsyncSession,
     appointment: Appointment,
     status: VerificationStatus,
     provider: str,
     copay: float | None,
 ) -> None:
-    log = VerificationLog(
-        patient_id=appointment.patient_id,
-        appointment_id=appointment.id,
-        status=status,
-        provider=provider,
-        copay=copay,
-        last_checked=datetime.utcnow(),
-        details=f"Verification executed via scheduler for appointment {appointment.id}.",
+    record_verification(provider, status.value)
+    await log_writer.write(
+        {
+            "clinic_id": appointment.clinic_id,
+            "patient_id": appointment.patient_id,
+            "appointment_id": appointment.id,
+            "status": status,
+            "provider": provider,
+            "copay": copay,
+            "last_checked": datetime.utcnow(),
+            "details": f"Verification executed via scheduler for appointment {appointment.id}.",
+        }
     )
-    session.add(log)
 
 
 async def run_insurance_check(
@@ -93,9 +104,9 @@ async def run_insurance_check(
     appointment: Appointment,
     provider_name: str,
     manual: bool = False,
+    raise_alerts: bool = True,
 ) -> tuple[InsuranceRecord, VerificationStatus]:
-    record_stmt = select(InsuranceRecord).filter_by(patient_id=appointment.patient_id)
-    result = await session.execute(record_stmt)
+    result = await session.execute(current_insurance_record(appointment.patient_id))
     insurance_record = result.scalars().first()
     if not insurance_record:
         insurance_record = InsuranceRecord(
@@ -118,9 +129,9 @@ async def run_insurance_check(
     appointment.copay = copay_value
     appointment.provider = provider
 
-    await log_verification(session, appointment, status, provider, copay_value)
+    await log_verification(appointment, status, provider, copay_value)
 
-    if status is not VerificationStatus.verified:
+    if raise_alerts and status is not VerificationStatus.verified:
         try:
             await create_alert(session, appointment, status, manual=manual)
         except Exception:
@@ -164,17 +175,47 @@ async def run_verification_simulation(
                 last_checked=insurance_record.last_checked or datetime.utcnow(),
             )
         )
-    await session.commit()
     return simulation_results
 
 
-async def run_scheduled_checks(session: AsyncSession) -> None:
-    window = datetime.utcnow() + timedelta(days=2)
-    appointments_stmt = select(Appointment).where(
-        Appointment.scheduled_time >= datetime.utcnow(),
-        Appointment.scheduled_time <= window,
-    )
-    results = await session.execute(appointments_stmt)
-    for appointment in results.scalars().unique().all():
-        await run_insurance_check(session, appointment, provider_name=appointment.provider or "Blue Cross")
-    await session.commit()
+async def _check_chunk(appointment_ids: list[int]) -> None:
+    async def check(session: AsyncSession) -> None:
+        result = await session.execute(select(Appointment).where(Appointment.id.in_(appointment_ids)))
+        for appointment in result.scalars().all():
+            await run_insurance_check(
+                session,
+                appointment,
+                provider_name=appointment.provider or "Blue Cross",
+                raise_alerts=False,
+            )
+
+    await write_coordinator.submit(check)
+
+
+async def run_scheduled_checks(clinic_id: int | None = None) -> None:
+    # The sweep runs as short coordinated units so it never holds the write lock across the whole window.
+    start = datetime.utcnow()
+    window = start + timedelta(days=2)
+    async with async_read_session(info={"clinic_id": clinic_id}) as session:
+        rows = (
+            await session.execute(
+                select(Appointment.id, Appointment.clinic_id)
+                .where(Appointment.scheduled_time >= start, Appointment.scheduled_time <= window)
+                .order_by(Appointment.id)
+            )
+        ).all()
+    ids = [row.id for row in rows]
+    for offset in range(0, len(ids), settings.sweep_chunk_size):
+        await _check_chunk(ids[offset:offset + settings.sweep_chunk_size])
+
+    # Alerts for the sweep come from the rules engine, one unit per clinic over the refreshed window.
+    outcomes: dict[str, dict[str, int]] = {}
+    for clinic in sorted({row.clinic_id for row in rows}):
+        async def evaluate(session: AsyncSession, clinic: int = clinic) -> dict[str, dict[str, int]]:
+            return await apply_rules(session, eligibility_rules, start, window, clinic)
+
+        for name, outcome in (await write_coordinator.submit(evaluate)).items():
+            total = outcomes.setdefault(name, {"matched": 0, "created": 0})
+            total["matched"] += outcome["matched"]
+            total["created"] += outcome["created"]
+    await broadcast_rule_alerts(outcomes)
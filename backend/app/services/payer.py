@@ -2,17 +2,18 @@ import hashlib
 import random
 from datetime import datetime
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.log_writer import log_writer
+from app.core.metrics import record_verification
+from app.db.models import VerificationStatus
 
-from app.db.models import VerificationLog, VerificationStatus
 
-
-def simulate_payer_lookup(
-    session: AsyncSession,
+async def simulate_payer_lookup(
+    clinic_id: int,
     payer_id: str,
     patient_name: str,
     policy_id: str | None,
     appointment_id: int | None,
+    patient_id: int | None = None,
 ) -> dict:
     seed = f"{payer_id}:{patient_name}:{policy_id or 'unknown'}"
     digest = int(hashlib.sha256(seed.encode('utf-8')).hexdigest(), 16)
@@ -29,16 +30,21 @@ def simulate_payer_lookup(
         else f"Coverage requires manual review ({status.value.replace('_', ' ')})."
     )
 
-    log = VerificationLog(
-        patient_id=appointment_id or 0,
-        appointment_id=appointment_id,
-        status=status,
-        provider=payer_id,
-        copay=copay,
-        last_checked=datetime.utcnow(),
-        details=f"Payer simulator lookup for {patient_name}.",
-    )
-    session.add(log)
+    record_verification(payer_id, status.value)
+    # verification_logs.patient_id is a required foreign key, so lookups not tied to a patient are not logged.
+    if patient_id is not None:
+        await log_writer.write(
+            {
+                "clinic_id": clinic_id,
+                "patient_id": patient_id,
+                "appointment_id": appointment_id,
+                "status": status,
+                "provider": payer_id,
+                "copay": copay,
+                "last_checked": datetime.utcnow(),
+                "details": f"Payer simulator lookup for {patient_name}.",
+            }
+        )
 
     return {
         "provider": payer_id.capitalize(),
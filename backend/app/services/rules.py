@@ -0,0 +1,347 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from functools import reduce
+from operator import and_, or_
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.websocket import ws_manager
+from app.db.models import Alert, AlertSeverity, AppointmentBoardEntry
+
+board = AppointmentBoardEntry
+WINDOW_COLUMNS = {
+    "appointment_id": board.appointment_id,
+    "clinic_id": board.clinic_id,
+    "scheduled_time": board.scheduled_time,
+    "verification_status": board.verification_status,
+    "copay": board.copay,
+    "provider": board.provider,
+    "patient_id": board.patient_id,
+    "patient_first_name": board.patient_first_name,
+    "patient_last_name": board.patient_last_name,
+    "insurance_provider": board.insurance_provider,
+    "insurance_status": board.insurance_status,
+    "insurance_copay": board.insurance_copay,
+    "insurance_last_checked": board.insurance_last_checked,
+}
+DERIVED_COLUMNS = ("hours_until", "days_since_check")
+FIELDS = frozenset(WINDOW_COLUMNS) | frozenset(DERIVED_COLUMNS)
+
+# Each leaf builds a per-row predicate; nulls never satisfy a comparison, as in SQL.
+OPERATORS: dict[str, Callable[[Any], Callable[[Any], bool]]] = {
+    "eq": lambda x: lambda v: v == x,
+    "ne": lambda x: lambda v: v is not None and v != x,
+    "lt": lambda x: lambda v: v is not None and v < x,
+    "le": lambda x: lambda v: v is not None and v <= x,
+    "gt": lambda x: lambda v: v is not None and v > x,
+    "ge": lambda x: lambda v: v is not None and v >= x,
+    "in": lambda x: frozenset(x).__contains__,
+    "not_in": lambda x: lambda v: v is not None and v not in frozenset(x),
+    "is_null": lambda x: (lambda v: v is None) if x else (lambda v: v is not None),
+}
+
+DEFAULT_RULES: list[dict[str, Any]] = [
+    {
+        "name": "expired_insurance",
+        "description": "Coverage on file has expired.",
+        "severity": "critical",
+        "message": "Insurance expired for patient {patient_first_name} {patient_last_name}.",
+        "when": {
+            "any": [
+                {"field": "insurance_status", "eq": "expired"},
+                {"field": "verification_status", "eq": "expired"},
+            ]
+        },
+    },
+    {
+        "name": "needs_review",
+        "description": "The last check could not confirm coverage.",
+        "severity": "warning",
+        "message": "Insurance needs review for patient {patient_first_name} {patient_last_name}.",
+        "when": {
+            "all": [
+                {"field": "verification_status", "eq": "needs_review"},
+                {"field": "insurance_status", "ne": "expired"},
+            ]
+        },
+    },
+    {
+        "name": "missing_copay",
+        "description": "Verified coverage without copay information.",
+        "severity": "warning",
+        "message": "No copay on file for {insurance_provider} coverage of {patient_first_name} {patient_last_name}.",
+        "when": {
+            "all": [
+                {"field": "insurance_status", "eq": "verified"},
+                {"field": "copay", "is_null": True},
+                {"field": "insurance_copay", "is_null": True},
+            ]
+        },
+    },
+    {
+        "name": "no_insurance_on_file",
+        "description": "The patient has no coverage on file.",
+        "severity": "warning",
+        "message": "No insurance on file for patient {patient_first_name} {patient_last_name}.",
+        "when": {"field": "insurance_provider", "is_null": True},
+    },
+    {
+        "name": "same_day_reverify",
+        "description": "Appointment within 24 hours whose coverage was not checked in the last day.",
+        "severity": "warning",
+        "message": "Re-verify coverage for {patient_first_name} {patient_last_name} before the appointment.",
+        "when": {
+            "all": [
+                {"field": "hours_until", "lt": 24},
+                {"field": "insurance_provider", "is_null": False},
+                {"any": [{"field": "days_since_check", "is_null": True}, {"field": "days_since_check", "ge": 1}]},
+            ]
+        },
+    },
+]
+
+
+class _Columns:
+    # Column arrays for one window; derived columns and leaf bitmasks are built once and shared by every rule.
+    def __init__(self, columns: dict[str, list[Any]], now: datetime) -> None:
+        self.columns = columns
+        self.now = now
+        self.size = len(columns["appointment_id"])
+        self.full = (1 << self.size) - 1
+        self._masks: dict[tuple, int] = {}
+
+    def column(self, field: str) -> list[Any]:
+        values = self.columns.get(field)
+        if values is None:
+            if field == "hours_until":
+                values = [(value - self.now).total_seconds() / 3600 for value in self.columns["scheduled_time"]]
+            else:
+                values = [
+                    None if value is None else (self.now - value).total_seconds() / 86400
+                    for value in self.columns["insurance_last_checked"]
+                ]
+            self.columns[field] = values
+        return values
+
+    def mask(self, key: tuple, predicate: Callable[[Any], bool]) -> int:
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = _bitmask(map(predicate, self.column(key[0])))
+        return mask
+
+
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _bitmask(flags: Iterable[bool]) -> int:
+    # Row i is bit i; bytes() and int(..., 2) do the packing in C.
+    digits = bytes(flags)[::-1].translate(_BITS)
+    return int(digits, 2) if digits else 0
+
+
+def _indexes(mask: int) -> list[int]:
+    digits = format(mask, "b")[::-1]
+    found = []
+    index = digits.find("1")
+    while index != -1:
+        found.append(index)
+        index = digits.find("1", index + 1)
+    return found
+
+
+Condition = Callable[[_Columns], int]
+
+
+def _freeze(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _compile_condition(rule: str, node: dict[str, Any]) -> Condition:
+    if "all" in node:
+        parts = [_compile_condition(rule, child) for child in node["all"]]
+        return lambda columns: reduce(and_, (part(columns) for part in parts), columns.full)
+    if "any" in node:
+        parts = [_compile_condition(rule, child) for child in node["any"]]
+        return lambda columns: reduce(or_, (part(columns) for part in parts), 0)
+    if "not" in node:
+        part = _compile_condition(rule, node["not"])
+        return lambda columns: columns.full & ~part(columns)
+    field = node.get("field")
+    if field not in FIELDS:
+        raise ValueError(f"Rule {rule!r} uses unknown field {field!r}")
+    operators = [key for key in node if key != "field"]
+    if len(operators) != 1 or operators[0] not in OPERATORS:
+        raise ValueError(f"Rule {rule!r} needs exactly one of {sorted(OPERATORS)} for {field!r}")
+    operator = operators[0]
+    value = _freeze(node[operator])
+    predicate = OPERATORS[operator](value)
+    key = (field, operator, value)
+    return lambda columns: columns.mask(key, predicate)
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    description: str
+    severity: AlertSeverity
+    message: str
+    when: dict[str, Any]
+    condition: Condition
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    rule: Rule
+    appointment_id: int
+    message: str
+
+
+class RuleSet:
+    def __init__(self, rules: list[Rule]) -> None:
+        self.rules = rules
+
+    def evaluate(self, columns: dict[str, list[Any]], now: datetime) -> dict[str, list[int]]:
+        window = _Columns(columns, now)
+        return {rule.name: _indexes(rule.condition(window)) for rule in self.rules}
+
+    def hits(self, columns: dict[str, list[Any]], now: datetime) -> list[RuleHit]:
+        by_name = {rule.name: rule for rule in self.rules}
+        found = []
+        for name, rows in self.evaluate(columns, now).items():
+            rule = by_name[name]
+            for row in rows:
+                fields = {name: values[row] for name, values in columns.items()}
+                found.append(RuleHit(rule, fields["appointment_id"], rule.message.format_map(fields)))
+        return found
+
+
+def compile_rules(specs: Iterable[dict[str, Any]]) -> RuleSet:
+    rules = []
+    seen = set()
+    for spec in specs:
+        name = spec["name"]
+        if name in seen:
+            raise ValueError(f"Duplicate rule {name!r}")
+        seen.add(name)
+        placeholders = {field for _, field, _, _ in Formatter().parse(spec["message"]) if field}
+        if not placeholders <= FIELDS:
+            raise ValueError(f"Rule {name!r} message uses unknown fields {sorted(placeholders - FIELDS)}")
+        rules.append(
+            Rule(
+                name=name,
+                description=spec.get("description", ""),
+                severity=AlertSeverity(spec.get("severity", "warning")),
+                message=spec["message"],
+                when=spec["when"],
+                condition=_compile_condition(name, spec["when"]),
+            )
+        )
+    return RuleSet(rules)
+
+
+def _rule_specs() -> list[dict[str, Any]]:
+    if settings.eligibility_rules_path:
+        return json.loads(Path(settings.eligibility_rules_path).read_text())
+    return DEFAULT_RULES
+
+
+eligibility_rules = compile_rules(_rule_specs())
+
+
+async def load_window(
+    session: AsyncSession,
+    start: datetime,
+    end: datetime,
+    clinic_id: Optional[int] = None,
+) -> dict[str, list[Any]]:
+    stmt = select(*WINDOW_COLUMNS.values()).where(board.scheduled_time >= start, board.scheduled_time <= end)
+    if clinic_id is not None:
+        stmt = stmt.where(board.clinic_id == clinic_id)
+    rows = (await session.execute(stmt)).all()
+    columns = {name: list(values) for name, values in zip(WINDOW_COLUMNS, zip(*rows))}
+    if not rows:
+        columns = {name: [] for name in WINDOW_COLUMNS}
+    for name in ("verification_status", "insurance_status"):
+        columns[name] = [value.value if isinstance(value, Enum) else value for value in columns[name]]
+    return columns
+
+
+async def create_rule_alerts(
+    session: AsyncSession,
+    hits: list[RuleHit],
+    start: datetime,
+    end: datetime,
+    clinic_id: Optional[int] = None,
+) -> dict[str, int]:
+    # An appointment carries at most one open alert per rule, so repeated sweeps do not pile up duplicates.
+    names = sorted({hit.rule.name for hit in hits})
+    created: dict[str, int] = {name: 0 for name in names}
+    if not hits:
+        return created
+    open_stmt = (
+        select(Alert.appointment_id, Alert.type)
+        .join(board, board.appointment_id == Alert.appointment_id)
+        .where(
+            Alert.resolved.is_(False),
+            Alert.type.in_(names),
+            board.scheduled_time >= start,
+            board.scheduled_time <= end,
+        )
+    )
+    if clinic_id is not None:
+        open_stmt = open_stmt.where(board.clinic_id == clinic_id)
+    open_alerts = set((await session.execute(open_stmt)).all())
+    now = datetime.utcnow()
+    rows = []
+    for hit in hits:
+        if (hit.appointment_id, hit.rule.name) in open_alerts:
+            continue
+        rows.append(
+            {
+                "appointment_id": hit.appointment_id,
+                "type": hit.rule.name,
+                "message": hit.message,
+                "severity": hit.rule.severity,
+                "resolved": False,
+                "created_at": now,
+            }
+        )
+        created[hit.rule.name] += 1
+    if rows:
+        await session.execute(insert(Alert), rows)
+    return created
+
+
+async def apply_rules(
+    session: AsyncSession,
+    ruleset: RuleSet,
+    start: datetime,
+    end: datetime,
+    clinic_id: Optional[int] = None,
+) -> dict[str, dict[str, int]]:
+    now = datetime.utcnow()
+    columns = await load_window(session, start, end, clinic_id)
+    hits = ruleset.hits(columns, now)
+    created = await create_rule_alerts(session, hits, start, end, clinic_id)
+    return summarize(ruleset, hits, created)
+
+
+def summarize(ruleset: RuleSet, hits: list[RuleHit], created: dict[str, int]) -> dict[str, dict[str, int]]:
+    matched = {rule.name: 0 for rule in ruleset.rules}
+    for hit in hits:
+        matched[hit.rule.name] += 1
+    return {name: {"matched": count, "created": created.get(name, 0)} for name, count in matched.items()}
+
+
+async def broadcast_rule_alerts(outcomes: dict[str, dict[str, int]]) -> None:
+    # One message per sweep, typed "alert" so dashboards reload their list as they do for single alerts.
+    total = sum(outcome["created"] for outcome in outcomes.values())
+    if total:
+        await ws_manager.broadcast({"type": "alert", "payload": {"batch": True, "created": total, "rules": outcomes}})
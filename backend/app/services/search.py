@@ -0,0 +1,153 @@
+import re
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import InsuranceRecord, Patient
+from app.db.search import SEARCH_TABLE, clinic_phrase
+from app.schemas.patient import PatientSearchResult
+
+MIN_SCORE = 0.34
+CANDIDATE_FACTOR = 5
+
+_FTS_CANDIDATES = text(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match ORDER BY rank LIMIT :limit")
+_PREFIX_CANDIDATES = text(
+    f"SELECT rowid FROM {SEARCH_TABLE} "
+    f"WHERE {SEARCH_TABLE} MATCH :clinic "
+    "AND (name LIKE :prefix OR name LIKE :word_prefix OR phone LIKE :prefix OR policy_ids LIKE :prefix) "
+    "LIMIT :limit"
+)
+
+
+def _trigrams(value: str) -> set[str]:
+    value = value.lower()
+    return {value[index:index + 3] for index in range(len(value) - 2)}
+
+
+def _fuzzy_trigrams(term: str) -> set[str]:
+    # A single typo can break every trigram of a short word, but one of its deletions usually lines up again.
+    grams = _trigrams(term)
+    if len(term) > 3:
+        for index in range(len(term)):
+            grams |= _trigrams(term[:index] + term[index + 1:])
+    return grams
+
+
+def _edit_distance(left: str, right: str) -> int:
+    # Optimal string alignment: insertions, deletions, substitutions and adjacent transpositions cost one.
+    previous, current = None, list(range(len(right) + 1))
+    for i in range(1, len(left) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(right)
+        for j in range(1, len(right) + 1):
+            cost = 0 if left[i - 1] == right[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and left[i - 1] == right[j - 2] and left[i - 2] == right[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+def _typo_score(term: str, words: list[str]) -> float:
+    allowed = 1 if len(term) <= 5 else 2
+    distances = [_edit_distance(term, word[:len(term) + allowed]) for word in words]
+    best = min(distances, default=allowed + 1)
+    return 1 - best / len(term) if best <= allowed else 0.0
+
+
+def _terms(query: str) -> list[str]:
+    terms = [term for term in re.split(r"\s+", query.strip().lower()) if term]
+    digits = re.sub(r"\D", "", query)
+    if len(digits) >= 3 and digits not in terms:
+        terms.append(digits)
+    return terms
+
+
+def _score(terms: list[str], fields: list[str]) -> float:
+    haystack = " ".join(fields).lower()
+    scores = []
+    for term in terms:
+        if term in haystack:
+            scores.append(1.0 if any(word.startswith(term) for word in haystack.split()) else 0.9)
+            continue
+        grams = _trigrams(term)
+        overlap = len(grams & _trigrams(haystack)) / len(grams) if grams else 0.0
+        scores.append(max(overlap, _typo_score(term, haystack.split())))
+    return round(max(scores) if len(terms) == 1 else sum(scores) / len(scores), 3)
+
+
+async def _candidate_ids(session: AsyncSession, clinic_id: int, terms: list[str], limit: int) -> list[int]:
+    clinic = f"clinic : {clinic_phrase(clinic_id)}"
+    candidate_ids: list[int] = []
+    grams = sorted(set().union(*(_fuzzy_trigrams(term) for term in terms)))
+    if grams:
+        # OR-ing trigrams lets misspelled terms still match on the trigrams they share; bm25 ranks by overlap.
+        either = " OR ".join('"' + gram.replace('"', '""') + '"' for gram in grams)
+        match = f"{clinic} AND {{name phone policy_ids}} : ({either})"
+        result = await session.execute(_FTS_CANDIDATES, {"match": match, "limit": limit})
+        candidate_ids = [row[0] for row in result]
+    # Terms of three characters or fewer keep no trigram through a typo, so they also match on a word prefix.
+    for term in (term for term in terms if len(term) <= 3):
+        if len(candidate_ids) >= limit:
+            break
+        prefix = f"{term[:2]}%"
+        result = await session.execute(
+            _PREFIX_CANDIDATES,
+            {"clinic": clinic, "prefix": prefix, "word_prefix": f"% {prefix}", "limit": limit},
+        )
+        candidate_ids += [row[0] for row in result if row[0] not in candidate_ids]
+    return candidate_ids[:limit]
+
+
+async def find_patients(
+    session: AsyncSession,
+    clinic_id: int,
+    query: str | None,
+    dob: date | None,
+    limit: int,
+) -> list[PatientSearchResult]:
+    terms = _terms(query) if query else []
+    stmt = select(Patient).where(Patient.clinic_id == clinic_id)
+    if terms:
+        candidate_ids = await _candidate_ids(session, clinic_id, terms, limit * CANDIDATE_FACTOR)
+        if not candidate_ids:
+            return []
+        stmt = stmt.where(Patient.id.in_(candidate_ids))
+    if dob:
+        day = datetime(dob.year, dob.month, dob.day)
+        stmt = stmt.where(Patient.dob >= day, Patient.dob < day + timedelta(days=1))
+    if not terms:
+        stmt = stmt.order_by(Patient.last_name, Patient.id).limit(limit)
+    patients = (await session.execute(stmt)).scalars().all()
+    if not patients:
+        return []
+
+    policies: dict[int, list[str]] = {}
+    records = await session.execute(
+        select(InsuranceRecord.patient_id, InsuranceRecord.policy_id).where(
+            InsuranceRecord.patient_id.in_([patient.id for patient in patients]),
+            InsuranceRecord.policy_id.is_not(None),
+        )
+    )
+    for patient_id, policy_id in records:
+        policies.setdefault(patient_id, []).append(policy_id)
+
+    results = []
+    for patient in patients:
+        policy_ids = policies.get(patient.id, [])
+        fields = [patient.first_name, patient.last_name, patient.phone or "", re.sub(r"\D", "", patient.phone or ""), *policy_ids]
+        score = _score(terms, fields) if terms else 1.0
+        if score < MIN_SCORE:
+            continue
+        results.append(
+            PatientSearchResult(
+                id=patient.id,
+                first_name=patient.first_name,
+                last_name=patient.last_name,
+                phone=patient.phone,
+                dob=patient.dob,
+                policy_ids=policy_ids,
+                score=score,
+            )
+        )
+    results.sort(key=lambda result: -result.score)
+    return results[:limit]
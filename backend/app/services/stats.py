@@ -0,0 +1,158 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Appointment, VerificationLog, VerificationRollup, VerificationStatus
+from app.schemas.stats import PayerStats, StatsTotals, TrendPoint, VerificationStats
+
+GRANULARITIES = ("hour", "day")
+
+_BUCKET_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00.000000",
+    "day": "%Y-%m-%d 00:00:00.000000",
+}
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    if granularity == "day":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+async def apply_rollups(session: AsyncSession, entries: Iterable[dict[str, Any]]) -> None:
+    buckets: dict[tuple, list[float]] = defaultdict(lambda: [0, 0.0])
+    for entry in entries:
+        clinic_id = entry.get("clinic_id")
+        if clinic_id is None:
+            continue
+        checked_at = entry.get("last_checked") or datetime.utcnow()
+        status = VerificationStatus(entry["status"])
+        for granularity in GRANULARITIES:
+            key = (clinic_id, granularity, bucket_start(checked_at, granularity), entry["provider"], status)
+            bucket = buckets[key]
+            bucket[0] += 1
+            bucket[1] += entry.get("copay") or 0.0
+    if not buckets:
+        return
+
+    rows = [
+        {
+            "clinic_id": clinic_id,
+            "granularity": granularity,
+            "bucket_start": start,
+            "provider": provider,
+            "status": status,
+            "count": count,
+            "copay_total": copay_total,
+        }
+        for (clinic_id, granularity, start, provider, status), (count, copay_total) in buckets.items()
+    ]
+    stmt = sqlite_insert(VerificationRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["clinic_id", "granularity", "bucket_start", "provider", "status"],
+        set_={
+            "count": VerificationRollup.count + stmt.excluded.count,
+            "copay_total": VerificationRollup.copay_total + stmt.excluded.copay_total,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def backfill_rollups(session: AsyncSession) -> int:
+    appointment_clinic = (
+        select(Appointment.clinic_id)
+        .where(Appointment.id == VerificationLog.appointment_id)
+        .scalar_subquery()
+    )
+    await session.execute(
+        update(VerificationLog)
+        .where(VerificationLog.clinic_id.is_(None), VerificationLog.appointment_id.is_not(None))
+        .values(clinic_id=appointment_clinic)
+    )
+    await session.execute(delete(VerificationRollup))
+
+    for granularity in GRANULARITIES:
+        bucket = func.strftime(_BUCKET_FORMATS[granularity], VerificationLog.last_checked)
+        source = (
+            select(
+                VerificationLog.clinic_id,
+                literal(granularity),
+                bucket,
+                VerificationLog.provider,
+                VerificationLog.status,
+                func.count(),
+                func.coalesce(func.sum(VerificationLog.copay), 0.0),
+            )
+            .where(VerificationLog.clinic_id.is_not(None), VerificationLog.last_checked.is_not(None))
+            .group_by(VerificationLog.clinic_id, bucket, VerificationLog.provider, VerificationLog.status)
+        )
+        await session.execute(
+            insert(VerificationRollup).from_select(
+                ["clinic_id", "granularity", "bucket_start", "provider", "status", "count", "copay_total"],
+                source,
+            )
+        )
+    await session.commit()
+    return await session.scalar(select(func.count()).select_from(VerificationRollup))
+
+
+def _success_rate(verified: int, scanned: int) -> float:
+    return round(verified / scanned * 100, 1) if scanned else 0.0
+
+
+async def get_verification_stats(
+    session: AsyncSession,
+    clinic_id: int,
+    start: datetime,
+    end: datetime,
+    granularity: str,
+) -> VerificationStats:
+    stmt = (
+        select(
+            VerificationRollup.bucket_start,
+            VerificationRollup.provider,
+            VerificationRollup.status,
+            func.sum(VerificationRollup.count),
+        )
+        .where(
+            VerificationRollup.clinic_id == clinic_id,
+            VerificationRollup.granularity == granularity,
+            VerificationRollup.bucket_start >= bucket_start(start, granularity),
+            VerificationRollup.bucket_start <= end,
+        )
+        .group_by(VerificationRollup.bucket_start, VerificationRollup.provider, VerificationRollup.status)
+        .order_by(VerificationRollup.bucket_start)
+    )
+    rows = (await session.execute(stmt)).all()
+
+    totals: dict[VerificationStatus, int] = defaultdict(int)
+    payers: dict[str, dict[VerificationStatus, int]] = defaultdict(lambda: defaultdict(int))
+    trend: dict[datetime, dict[VerificationStatus, int]] = defaultdict(lambda: defaultdict(int))
+    for start_at, provider, status, count in rows:
+        totals[status] += count
+        payers[provider][status] += count
+        trend[start_at][status] += count
+
+    def _totals(counts: dict[VerificationStatus, int]) -> StatsTotals:
+        scanned = sum(counts.values())
+        verified = counts[VerificationStatus.verified]
+        return StatsTotals(
+            scanned=scanned,
+            verified=verified,
+            needs_review=counts[VerificationStatus.needs_review],
+            failed=counts[VerificationStatus.expired],
+            success_rate=_success_rate(verified, scanned),
+        )
+
+    return VerificationStats(
+        granularity=granularity,
+        from_time=start,
+        to_time=end,
+        totals=_totals(totals),
+        payers=[PayerStats(provider=provider, **_totals(counts).model_dump()) for provider, counts in sorted(payers.items())],
+        trend=[TrendPoint(bucket_start=start_at, **_totals(counts).model_dump()) for start_at, counts in trend.items()],
+    )
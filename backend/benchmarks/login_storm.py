@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from httpx import AsyncClient
+
+from app.core.hashing import password_hasher
+from app.main import app, shutdown_event, startup_event
+
+PROBE_PATH = "/api/v1/health/live"
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _probe(client: AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(PROBE_PATH)
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def run_storm(client: AsyncClient, email: str, password: str, workers: int, logins: int) -> dict:
+    password_hasher.shutdown()
+    password_hasher.workers = workers
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(client, stop, latencies))
+    started = time.perf_counter()
+    responses = await asyncio.gather(
+        *[client.post("/api/v1/auth/login", json={"email": email, "password": password}) for _ in range(logins)]
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return {
+        "mode": f"{workers} worker threads" if workers else "inline on the event loop",
+        "logins": logins,
+        "login_errors": sum(response.status_code != 200 for response in responses),
+        "storm_s": round(elapsed, 2),
+        "probe_requests": len(latencies),
+        "probe_p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "probe_p99_ms": round(_percentile(latencies, 0.99), 1) if latencies else None,
+        "probe_max_ms": round(max(latencies), 1) if latencies else None,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency of an unrelated endpoint while many logins hash passwords.")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=password_hasher.workers)
+    args = parser.parse_args()
+
+    await startup_event()
+    email, password = f"storm-{uuid.uuid4().hex[:8]}@example.com", "storm-password"
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": email, "password": password, "clinic_name": "Login Storm Clinic", "role": "staff"},
+        )
+        response.raise_for_status()
+        results = [
+            await run_storm(client, email, password, 0, args.logins),
+            await run_storm(client, email, password, args.workers, args.logins),
+        ]
+    await shutdown_event()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _summary(name: str, latencies: list[float], elapsed: float, errors: int = 0, **extra) -> dict:
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 0.99), 2) if latencies else None,
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        **extra,
+    }
+
+
+async def _timed(call: Callable[[], Awaitable], latencies: list[float]):
+    started = time.perf_counter()
+    result = await call()
+    latencies.append((time.perf_counter() - started) * 1000)
+    return result
+
+
+async def run_requests(name: str, call: Callable[[int], Awaitable], requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            response = await _timed(lambda: call(index), latencies)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(index) for index in range(requests)])
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    return _summary(
+        name,
+        latencies,
+        time.perf_counter() - started,
+        errors,
+        concurrency=concurrency,
+        statuses={str(status): count for status, count in sorted(statuses.items())},
+    )
+
+
+class _BenchSocket:
+    def __init__(self) -> None:
+        self.bytes_sent = 0
+
+    async def send_json(self, message) -> None:
+        self.bytes_sent += len(json.dumps(message))
+        await asyncio.sleep(0)
+
+
+async def run_fanout(sockets: int, messages: int) -> dict:
+    from app.core.websocket import ws_manager
+
+    connected = [_BenchSocket() for _ in range(sockets)]
+    previous = ws_manager.active_connections
+    ws_manager.active_connections = list(connected)
+    latencies: list[float] = []
+    started = time.perf_counter()
+    try:
+        for index in range(messages):
+            message = {"type": "appointment:update", "payload": {"id": index, "verification_status": "verified"}}
+            await _timed(lambda: ws_manager.broadcast(message), latencies)
+    finally:
+        ws_manager.active_connections = previous
+    return _summary(
+        "websocket_fanout",
+        latencies,
+        time.perf_counter() - started,
+        sockets=sockets,
+        deliveries=sockets * messages,
+        bytes_sent=sum(socket.bytes_sent for socket in connected),
+    )
+
+
+async def run_sweeps(sweeps: int) -> dict:
+    from app.core.scheduler import run_checks_job
+
+    latencies: list[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(sweeps):
+        try:
+            await _timed(run_checks_job, latencies)
+        except Exception:
+            errors += 1
+    return _summary("scheduled_sweep", latencies, time.perf_counter() - started, errors)
+
+
+def _fixtures(path: Path) -> tuple[dict, list[int]]:
+    with sqlite3.connect(path) as conn:
+        user = conn.execute(
+            "SELECT id, email, clinic_id, role, token_version FROM users "
+            "WHERE role = 'super_admin' ORDER BY id LIMIT 1"
+        ).fetchone()
+        if user is None:
+            raise SystemExit(f"{path} has no super_admin user to benchmark as")
+        appointment_ids = [
+            row[0]
+            for row in conn.execute("SELECT id FROM appointments WHERE clinic_id = ? ORDER BY id LIMIT 1000", (user[2],))
+        ]
+    conn.close()
+    return {"uid": user[0], "email": user[1], "cid": user[2], "role": user[3], "ver": user[4] or 0}, appointment_ids
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: list[dict], baseline_path: Path) -> list[dict]:
+    baseline = {entry["scenario"]: entry for entry in json.loads(baseline_path.read_text())["results"]}
+    rows = []
+    for entry in results:
+        before = baseline.get(entry["scenario"])
+        if not before:
+            continue
+        row = {"scenario": entry["scenario"]}
+        for key in ("p50_ms", "p99_ms", "throughput_rps"):
+            if before.get(key) and entry.get(key) is not None:
+                row[key] = f"{before[key]} -> {entry[key]} ({(entry[key] - before[key]) / before[key] * 100:+.1f}%)"
+        rows.append(row)
+    return rows
+
+
+async def run(args: argparse.Namespace, dataset: dict | None) -> dict:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.lifecycle import lifecycle
+    from app.core.security import create_access_token
+    from app.main import app, shutdown_event, startup_event
+
+    claims, appointment_ids = _fixtures(args.database)
+    token = create_access_token(subject=claims.pop("email"), extra_claims=claims)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await startup_event()
+    # The boot sweep would otherwise compete with the first scenarios for the database.
+    await lifecycle.wait_for_sweep()
+    results = []
+    # Server errors are counted per scenario instead of aborting the whole run.
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+        selected = set(args.scenarios)
+        if "board" in selected:
+            results.append(await run_requests(
+                "appointment_board",
+                lambda _: client.get("/api/v1/appointments/"),
+                args.requests,
+                args.concurrency,
+            ))
+        if "board-columnar" in selected:
+            results.append(await run_requests(
+                "appointment_board_columnar",
+                lambda _: client.get("/api/v1/appointments/", params={"format": "columnar"}),
+                args.requests,
+                args.concurrency,
+            ))
+        if "patients" in selected:
+            results.append(await run_requests(
+                "patient_list",
+                lambda _: client.get("/api/v1/patients", params={"limit": 100}),
+                args.requests,
+                args.concurrency,
+            ))
+        if "alerts" in selected:
+            results.append(await run_requests(
+                "alerts",
+                lambda _: client.get("/api/v1/alerts/"),
+                args.requests,
+                args.concurrency,
+            ))
+        if "reverify" in selected:
+            results.append(await run_requests(
+                "reverify_burst",
+                lambda index: client.post(f"/api/v1/insurance/{appointment_ids[index % len(appointment_ids)]}/reverify"),
+                args.requests,
+                args.concurrency,
+            ))
+    if "sweep" in selected:
+        results.append(await run_sweeps(args.sweeps))
+    if "fanout" in selected:
+        results.append(await run_fanout(args.sockets, args.messages))
+    await shutdown_event()
+
+    return {
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "database": str(args.database),
+        "dataset": dataset,
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "database_profile": os.environ["DATABASE_PROFILE"],
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    scenarios = ["board", "board-columnar", "patients", "alerts", "reverify", "sweep", "fanout"]
+    parser = argparse.ArgumentParser(description="Run API load scenarios in-process against a synthetic dataset.")
+    parser.add_argument("--database", type=Path, help="Existing database to benchmark; generated when missing.")
+    known, _ = parser.parse_known_args()
+    database = (known.database or Path(tempfile.mkdtemp()) / "bench.db").resolve()
+    # Settings are read once at import time, so nothing from app is imported before these point at the dataset.
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+    os.environ["RATE_LIMIT_PATH"] = str(database.with_suffix(".ratelimit.db"))
+    os.environ["REVERIFY_RATE_LIMIT"] = str(10**9)
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+
+    from benchmarks.synthetic_data import add_arguments, generate
+
+    parser.add_argument("--scenarios", nargs="+", choices=scenarios, default=scenarios)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--sweeps", type=int, default=3)
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, help="Earlier result file to compare against.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    args.database = database
+
+    dataset = None
+    if not database.exists():
+        dataset = generate(
+            database,
+            clinics=args.clinics,
+            patients=args.patients,
+            appointments=args.appointments,
+            alert_ratio=args.alert_ratio,
+            log_ratio=args.log_ratio,
+            window_days=args.window_days,
+            seed=args.seed,
+        )
+
+    report = asyncio.run(run(args, dataset))
+
+    output = args.output or RESULTS_DIR / f"{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["results"], indent=2))
+    if args.baseline:
+        print(json.dumps(_compare(report["results"], args.baseline), indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
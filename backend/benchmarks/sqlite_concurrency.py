@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import Appointment, Clinic, Patient, VerificationLog, VerificationStatus
+from app.db.engine import build_engine
+
+PATIENTS = 500
+APPOINTMENTS = 5000
+
+
+async def _seed(session_factory: sessionmaker) -> None:
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        session.add(Clinic(id=1, name="Benchmark Clinic", timezone="UTC"))
+        await session.flush()
+        await session.execute(
+            insert(Patient),
+            [{"clinic_id": 1, "first_name": f"First{i}", "last_name": f"Last{i}"} for i in range(PATIENTS)],
+        )
+        await session.execute(
+            insert(Appointment),
+            [
+                {
+                    "patient_id": i % PATIENTS + 1,
+                    "clinic_id": 1,
+                    "scheduled_time": now + timedelta(minutes=15 * i),
+                    "provider": "Aetna",
+                    "verification_status": VerificationStatus.needs_review,
+                }
+                for i in range(APPOINTMENTS)
+            ],
+        )
+        await session.commit()
+
+
+async def _reader(session_factory: sessionmaker, stop_at: float, stats: dict) -> None:
+    now = datetime.utcnow()
+    while time.perf_counter() < stop_at:
+        try:
+            async with session_factory() as session:
+                await session.execute(
+                    select(Appointment.id, Appointment.verification_status).where(
+                        Appointment.clinic_id == 1,
+                        Appointment.scheduled_time >= now,
+                        Appointment.scheduled_time <= now + timedelta(days=3),
+                    )
+                )
+                await session.scalar(select(func.count()).select_from(VerificationLog))
+            stats["reads"] += 1
+        except OperationalError:
+            stats["errors"] += 1
+
+
+async def _writer(session_factory: sessionmaker, stop_at: float, stats: dict, offset: int) -> None:
+    counter = offset
+    while time.perf_counter() < stop_at:
+        counter += 1
+        appointment_id = counter % APPOINTMENTS + 1
+        try:
+            async with session_factory() as session:
+                await session.execute(
+                    update(Appointment)
+                    .where(Appointment.id == appointment_id)
+                    .values(verification_status=VerificationStatus.verified)
+                )
+                session.add(
+                    VerificationLog(
+                        patient_id=appointment_id % PATIENTS + 1,
+                        appointment_id=appointment_id,
+                        status=VerificationStatus.verified,
+                        provider="Aetna",
+                        last_checked=datetime.utcnow(),
+                    )
+                )
+                await session.commit()
+            stats["writes"] += 1
+        except OperationalError:
+            stats["errors"] += 1
+
+
+async def run_profile(profile: str, readers: int, writers: int, duration: float) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}", profile)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await _seed(session_factory)
+
+        stats = {"reads": 0, "writes": 0, "errors": 0}
+        stop_at = time.perf_counter() + duration
+        await asyncio.gather(
+            *[_reader(session_factory, stop_at, stats) for _ in range(readers)],
+            *[_writer(session_factory, stop_at, stats, index * 1000) for index in range(writers)],
+        )
+        await engine.dispose()
+
+    return {
+        "profile": profile,
+        "readers": readers,
+        "writers": writers,
+        "duration_s": duration,
+        "reads_per_s": round(stats["reads"] / duration, 1),
+        "writes_per_s": round(stats["writes"] / duration, 1),
+        "errors": stats["errors"],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Mixed read/write throughput for the SQLite engine profiles.")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    results = [
+        await run_profile(profile, args.readers, args.writers, args.duration)
+        for profile in ("default", "production")
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
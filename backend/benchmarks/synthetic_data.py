@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.db.base import Base
+from app.db.board import install_board_projection
+from app.db.changes import install_change_triggers
+from app.db.engine import build_engine
+from app.db.migrations import stamp_schema
+from app.db.search import install_search_index
+from app.services.stats import backfill_rollups
+
+PASSWORD = "synthetic-password"
+FIRST_NAMES = ["Ava", "Liam", "Noah", "Mia", "Emma", "Omar", "Sara", "Yusuf", "Lena", "Kai", "Ivy", "Ezra", "Zoe", "Ali"]
+LAST_NAMES = ["Carter", "Patel", "Kim", "Singh", "Garcia", "Nguyen", "Khan", "Smith", "Lopez", "Brown", "Ito", "Rossi"]
+STATUSES = ["verified", "needs_review", "expired"]
+ALERT_SEVERITIES = ["info", "warning", "critical"]
+BATCH_SIZE = 50_000
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _batched(rows: Iterator[tuple], size: int = BATCH_SIZE) -> Iterator[list[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn: sqlite3.Connection, table: str, columns: str, rows: Iterator[tuple]) -> None:
+    placeholders = ", ".join("?" for _ in columns.split(","))
+    statement = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    for batch in _batched(rows):
+        conn.executemany(statement, batch)
+
+
+def generate(
+    path: Path,
+    clinics: int,
+    patients: int,
+    appointments: int,
+    alert_ratio: float,
+    log_ratio: float,
+    window_days: int,
+    seed: int,
+) -> dict:
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+    engine.dispose()
+
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    now_text = now.strftime(TIME_FORMAT)
+    providers = list(settings.provider_names)
+    hashed = hash_password(PASSWORD)
+    window_minutes = window_days * 24 * 60
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    # The file is thrown away if generation fails, so durability is traded for load speed.
+    for pragma in ("journal_mode=OFF", "synchronous=OFF", "cache_size=-262144", "temp_store=MEMORY"):
+        conn.execute(f"PRAGMA {pragma}")
+    conn.execute("BEGIN")
+
+    _insert(conn, "clinics", "id, name, timezone, created_at", (
+        (clinic_id, f"Synthetic Clinic {clinic_id}", "UTC", now_text) for clinic_id in range(1, clinics + 1)
+    ))
+    _insert(conn, "users", "email, hashed_password, role, clinic_id, created_at, token_version", (
+        (f"{role}{clinic_id}@synthetic.example.com", hashed, role, clinic_id, now_text, 0)
+        for clinic_id in range(1, clinics + 1)
+        for role in ("super_admin", "staff")
+    ))
+
+    def patient_rows() -> Iterator[tuple]:
+        for patient_id in range(1, patients + 1):
+            dob = now - timedelta(days=rng.randint(18 * 365, 90 * 365))
+            yield (
+                patient_id,
+                patient_id % clinics + 1,
+                rng.choice(FIRST_NAMES),
+                f"{rng.choice(LAST_NAMES)}{patient_id}",
+                dob.strftime(TIME_FORMAT),
+                f"+1-555-{patient_id % 10000:04d}",
+                rng.choice(providers),
+                (now - timedelta(minutes=patients - patient_id)).strftime(TIME_FORMAT),
+            )
+
+    _insert(conn, "patients", "id, clinic_id, first_name, last_name, dob, phone, primary_provider, created_at", patient_rows())
+
+    def insurance_rows() -> Iterator[tuple]:
+        for patient_id in range(1, patients + 1):
+            status = rng.choice(STATUSES)
+            yield (
+                patient_id,
+                rng.choice(providers),
+                status,
+                round(rng.uniform(10, 80), 2) if status == "verified" else None,
+                now_text,
+                f"POL-{patient_id:08d}",
+            )
+
+    _insert(conn, "insurance_records", "patient_id, provider, status, copay, last_checked, policy_id", insurance_rows())
+
+    # Appointments spread evenly around now, so the default board window always has work in it.
+    def appointment_rows() -> Iterator[tuple]:
+        start = now - timedelta(minutes=window_minutes)
+        step = 2 * window_minutes / max(appointments, 1)
+        for appointment_id in range(1, appointments + 1):
+            patient_id = rng.randint(1, patients)
+            status = rng.choice(STATUSES)
+            scheduled = (start + timedelta(minutes=appointment_id * step)).strftime(TIME_FORMAT)
+            yield (
+                appointment_id,
+                patient_id,
+                patient_id % clinics + 1,
+                scheduled,
+                "scheduled",
+                status,
+                round(rng.uniform(10, 80), 2) if status == "verified" else None,
+                rng.choice(providers),
+                now_text,
+                now_text,
+            )
+
+    _insert(
+        conn,
+        "appointments",
+        "id, patient_id, clinic_id, scheduled_time, status, verification_status, copay, provider, created_at, updated_at",
+        appointment_rows(),
+    )
+
+    alerts = int(appointments * alert_ratio)
+    _insert(conn, "alerts", "appointment_id, type, message, severity, resolved, created_at", (
+        (
+            rng.randint(1, appointments),
+            "insurance",
+            "Synthetic verification alert.",
+            rng.choice(ALERT_SEVERITIES),
+            rng.random() < 0.5,
+            (now - timedelta(minutes=rng.randint(0, window_minutes))).strftime(TIME_FORMAT),
+        )
+        for _ in range(alerts)
+    ))
+
+    logs = int(appointments * log_ratio)
+
+    def log_rows() -> Iterator[tuple]:
+        for _ in range(logs):
+            appointment_id = rng.randint(1, appointments)
+            patient_id = rng.randint(1, patients)
+            status = rng.choice(STATUSES)
+            yield (
+                patient_id % clinics + 1,
+                patient_id,
+                appointment_id,
+                status,
+                rng.choice(providers),
+                round(rng.uniform(10, 80), 2) if status == "verified" else None,
+                (now - timedelta(minutes=rng.randint(0, window_minutes))).strftime(TIME_FORMAT),
+                "Synthetic verification.",
+            )
+
+    _insert(
+        conn,
+        "verification_logs",
+        "clinic_id, patient_id, appointment_id, status, provider, copay, last_checked, details",
+        log_rows(),
+    )
+    conn.execute("COMMIT")
+    conn.close()
+    loaded = time.perf_counter() - started
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as sync_conn:
+        install_search_index(sync_conn)
+        install_change_triggers(sync_conn)
+        install_board_projection(sync_conn)
+        stamp_schema(sync_conn)
+    engine.dispose()
+    rollups = asyncio.run(_backfill(path))
+
+    return {
+        "path": str(path),
+        "clinics": clinics,
+        "patients": patients,
+        "appointments": appointments,
+        "alerts": alerts,
+        "verification_logs": logs,
+        "rollups": rollups,
+        "load_seconds": round(loaded, 2),
+        "total_seconds": round(time.perf_counter() - started, 2),
+        "password": PASSWORD,
+    }
+
+
+async def _backfill(path: Path) -> int:
+    engine = build_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        rows = await backfill_rollups(session)
+    await engine.dispose()
+    return rows
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--clinics", type=int, default=10)
+    parser.add_argument("--patients", type=int, default=50_000)
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--alert-ratio", type=float, default=0.05)
+    parser.add_argument("--log-ratio", type=float, default=0.5)
+    parser.add_argument("--window-days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load a synthetic clinic database for benchmarks.")
+    parser.add_argument("path", type=Path)
+    add_arguments(parser)
+    args = parser.parse_args()
+    summary = generate(
+        args.path,
+        clinics=args.clinics,
+        patients=args.patients,
+        appointments=args.appointments,
+        alert_ratio=args.alert_ratio,
+        log_ratio=args.log_ratio,
+        window_days=args.window_days,
+        seed=args.seed,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from app.db.base import Base
+from app.db.board import install_board_projection
+from app.db.changes import install_change_triggers
+from app.db.migrations import add_missing_columns
+from app.db.search import install_search_index
+from app.db.session import engine
+
+
+async def _prepare_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(install_search_index)
+        await conn.run_sync(install_change_triggers)
+        await conn.run_sync(install_board_projection)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    asyncio.run(_prepare_schema())
@@ -0,0 +1,45 @@
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_statements: ContextVar[list[str] | None] = ContextVar("budget_statements", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(" ".join(statement.split()))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudgetApp:
+    # Wraps the ASGI app so each request's statements are counted against a budget keyed by route template.
+    def __init__(self, app: ASGIApp, budgets: dict[tuple[str, str], int]) -> None:
+        self.app = app
+        self.budgets = budgets
+        self.requests: list[tuple[str, str, list[str]]] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        statements: list[str] = []
+        token = _statements.set(statements)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _statements.reset(token)
+        route = getattr(scope.get("route"), "path", scope["path"])
+        self.requests.append((scope["method"], route, statements))
+        budget = self.budgets.get((scope["method"], route))
+        if budget is not None and len(statements) > budget:
+            listing = "\n".join(f"  {index}. {statement}" for index, statement in enumerate(statements, 1))
+            raise QueryBudgetExceeded(
+                f"{scope['method']} {route} ran {len(statements)} SQL statements, budget is {budget}:\n{listing}"
+            )
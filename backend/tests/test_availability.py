@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.write_coordinator import write_coordinator
+from app.db.models import Appointment, Clinic, Patient
+from app.db.session import get_session
+from app.services.availability import slot_index
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_bookings_reject_overlapping_slots(session: AsyncSession):
+    clinic = Clinic(name="Availability Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    patient = Patient(clinic_id=clinic.id, first_name="Slot", last_name="Patient")
+    session.add(patient)
+    await session.commit()
+    day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+    def booking(hour: int, minute: int = 0, provider: str = "Dr. Ames"):
+        return lambda: Appointment(
+            clinic_id=clinic.id,
+            patient_id=patient.id,
+            scheduled_time=day.replace(hour=hour, minute=minute),
+            provider=provider,
+        )
+
+    try:
+        await slot_index.book(clinic.id, booking(10))
+        with pytest.raises(HTTPException) as conflict:
+            await slot_index.book(clinic.id, booking(10, 15))
+        assert conflict.value.status_code == 409
+        await slot_index.book(clinic.id, booking(10, 15, provider="Dr. Bell"))
+
+        # Both land in one write batch; only the first may take the slot.
+        outcomes = await asyncio.gather(
+            slot_index.book(clinic.id, booking(12)),
+            slot_index.book(clinic.id, booking(12, 10)),
+            return_exceptions=True,
+        )
+        assert [isinstance(outcome, HTTPException) for outcome in outcomes] == [False, True]
+
+        # A write that bypassed this process's index is picked up from the change log.
+        session.add(booking(14)())
+        await session.commit()
+        with pytest.raises(HTTPException):
+            await slot_index.book(clinic.id, booking(14, 20))
+    finally:
+        await write_coordinator.stop()
+
+    slots = await slot_index.free_slots(clinic.id, "Dr. Ames", day.replace(hour=9), day.replace(hour=15))
+    assert [slot.strftime("%H:%M") for slot in slots] == [
+        "09:00",
+        "09:30",
+        "10:30",
+        "11:00",
+        "11:30",
+        "12:30",
+        "13:00",
+        "13:30",
+        "14:30",
+    ]
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.board import rebuild_board
+from app.db.models import (
+    Appointment,
+    AppointmentBoardEntry,
+    Clinic,
+    InsuranceRecord,
+    Patient,
+    VerificationStatus,
+)
+from app.db.session import get_session
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+async def _board(session: AsyncSession, clinic_id: int) -> list[tuple]:
+    rows = await session.execute(
+        select(
+            AppointmentBoardEntry.appointment_id,
+            AppointmentBoardEntry.patient_last_name,
+            AppointmentBoardEntry.verification_status,
+            AppointmentBoardEntry.insurance_provider,
+            AppointmentBoardEntry.insurance_status,
+            AppointmentBoardEntry.insurance_copay,
+        )
+        .where(AppointmentBoardEntry.clinic_id == clinic_id)
+        .order_by(AppointmentBoardEntry.appointment_id)
+    )
+    return rows.all()
+
+
+@pytest.mark.asyncio
+async def test_board_projection_follows_writes_and_matches_a_rebuild(session: AsyncSession):
+    clinic = Clinic(name="Board Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    patient = Patient(clinic_id=clinic.id, first_name="Bo", last_name="Ard")
+    session.add(patient)
+    await session.flush()
+    first, second = (
+        Appointment(patient_id=patient.id, clinic_id=clinic.id, scheduled_time=datetime.utcnow() + timedelta(hours=hours))
+        for hours in (1, 2)
+    )
+    session.add_all([first, second])
+    await session.commit()
+    assert [row[3] for row in await _board(session, clinic.id)] == [None, None]
+
+    current = InsuranceRecord(patient_id=patient.id, provider="Aetna", status=VerificationStatus.verified, copay=25.0)
+    session.add(current)
+    await session.commit()
+    session.add(InsuranceRecord(patient_id=patient.id, provider="Cigna", status=VerificationStatus.expired))
+    first.verification_status = VerificationStatus.verified
+    patient.last_name = "Renamed"
+    await session.commit()
+    assert await _board(session, clinic.id) == [
+        (first.id, "Renamed", VerificationStatus.verified, "Aetna", VerificationStatus.verified, 25.0),
+        (second.id, "Renamed", VerificationStatus.needs_review, "Aetna", VerificationStatus.verified, 25.0),
+    ]
+
+    current.copay = 40.0
+    await session.execute(delete(Appointment).where(Appointment.id == second.id))
+    await session.commit()
+    incremental = await _board(session, clinic.id)
+    assert [(row[0], row[5]) for row in incremental] == [(first.id, 40.0)]
+
+    conn = await session.connection()
+    await conn.run_sync(rebuild_board)
+    assert await _board(session, clinic.id) == incremental
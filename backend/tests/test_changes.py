@@ -0,0 +1,138 @@
+import base64
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import create_access_token
+from app.db.changes import prune_change_log
+from app.db.models import Alert, Appointment, Clinic, Patient, User
+from app.db.session import get_session
+from app.main import app
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+async def _clinic(session: AsyncSession) -> tuple[dict, Patient]:
+    clinic = Clinic(name="Change Feed Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    user = User(email=f"feed-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", role="staff", clinic_id=clinic.id)
+    patient = Patient(clinic_id=clinic.id, first_name="Feed", last_name="Patient")
+    session.add_all([user, patient])
+    await session.commit()
+    token = create_access_token(
+        subject=user.email,
+        extra_claims={"uid": user.id, "cid": clinic.id, "role": user.role, "ver": 0},
+    )
+    return {"Authorization": f"Bearer {token}"}, patient
+
+
+@pytest.mark.asyncio
+async def test_change_feed_returns_only_rows_touched_since_the_token(session: AsyncSession):
+    headers, patient = await _clinic(session)
+    other_headers, _ = await _clinic(session)
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        token = (await client.get("/api/v1/changes", headers=headers)).json()["next_token"]
+        empty = (await client.get("/api/v1/changes", params={"since": token}, headers=headers)).json()
+        assert empty["appointments"] == [] and empty["next_token"] == token
+
+        appointment = Appointment(
+            patient_id=patient.id,
+            clinic_id=patient.clinic_id,
+            scheduled_time=datetime.utcnow() + timedelta(days=1),
+        )
+        session.add(appointment)
+        await session.flush()
+        alert = Alert(appointment_id=appointment.id, type="insurance", message="Check coverage")
+        session.add(alert)
+        await session.commit()
+        appointment.provider = "Aetna"
+        await session.commit()
+        appointment_id = appointment.id
+
+        feed = (await client.get("/api/v1/changes", params={"since": token}, headers=headers)).json()
+        assert [row["id"] for row in feed["appointments"]] == [appointment_id]
+        assert feed["appointments"][0]["provider"] == "Aetna"
+        assert [row["id"] for row in feed["alerts"]] == [alert.id]
+        other = (await client.get("/api/v1/changes", headers=other_headers)).json()
+        assert (await client.get("/api/v1/changes", params={"since": other["next_token"]}, headers=other_headers)).json()[
+            "appointments"
+        ] == []
+
+        token = feed["next_token"]
+        await session.execute(delete(Alert).where(Alert.id == alert.id))
+        await session.commit()
+        feed = (await client.get("/api/v1/changes", params={"since": token, "limit": 1}, headers=headers)).json()
+        assert feed["deleted_alerts"] == [alert.id] and not feed["has_more"]
+
+        assert (await client.get("/api/v1/changes", params={"since": "nope"}, headers=headers)).status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token",
+    [
+        "nope",
+        base64.urlsafe_b64encode(b'[{"dt":"nope"}]').decode(),
+        base64.urlsafe_b64encode(b'[{"dt":5}]').decode(),
+        encode_cursor("7"),
+        encode_cursor(1, 2),
+    ],
+)
+async def test_change_feed_rejects_malformed_tokens(session: AsyncSession, token: str):
+    headers, _ = await _clinic(session)
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        response = await client.get("/api/v1/changes", params={"since": token}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_change_feed_poll_uses_the_clinic_sequence_index(session: AsyncSession):
+    plan = await session.execute(
+        text("EXPLAIN QUERY PLAN SELECT seq FROM change_log WHERE clinic_id = 1 AND seq > 0 ORDER BY seq")
+    )
+    assert "ix_change_log_clinic_seq" in " ".join(str(row[-1]) for row in plan.all())
+
+
+@pytest.mark.asyncio
+async def test_pruned_change_log_expires_older_tokens(session: AsyncSession):
+    headers, patient = await _clinic(session)
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        stale = (await client.get("/api/v1/changes", headers=headers)).json()["next_token"]
+        first = Appointment(patient_id=patient.id, clinic_id=patient.clinic_id, scheduled_time=datetime(2031, 1, 1))
+        session.add(first)
+        await session.commit()
+        seen = (await client.get("/api/v1/changes", params={"since": stale}, headers=headers)).json()["next_token"]
+
+        # Everything up to the last change this client has seen falls outside the retention window.
+        await session.execute(
+            text("UPDATE change_log SET created_at = '2000-01-01 00:00:00' WHERE seq <= :seq"),
+            {"seq": decode_cursor(seen)[0]},
+        )
+        await session.commit()
+        conn = await session.connection()
+        pruned = await conn.run_sync(prune_change_log, datetime.utcnow() - timedelta(days=7))
+        await session.commit()
+        assert pruned >= 1
+        remaining = await session.scalar(
+            text("SELECT count(*) FROM change_log WHERE seq <= :seq"),
+            {"seq": decode_cursor(seen)[0]},
+        )
+        assert remaining == 0
+
+        second = Appointment(patient_id=patient.id, clinic_id=patient.clinic_id, scheduled_time=datetime(2031, 1, 2))
+        session.add(second)
+        await session.commit()
+
+        assert (await client.get("/api/v1/changes", params={"since": stale}, headers=headers)).status_code == 410
+        feed = (await client.get("/api/v1/changes", params={"since": seen}, headers=headers)).json()
+        assert [row["id"] for row in feed["appointments"]] == [second.id]
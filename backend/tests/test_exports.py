@@ -0,0 +1,138 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.db.models import Appointment, Clinic, Patient, User, VerificationLog, VerificationStatus
+from app.db.session import get_session
+from app.main import app
+
+PLAIN = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+async def _exporting_clinic(session: AsyncSession, name: str, appointments: int) -> tuple[dict, list[int]]:
+    clinic = Clinic(name=name, timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    email = f"export-{uuid.uuid4().hex[:8]}@example.com"
+    user = User(email=email, hashed_password="x", role="admin", clinic_id=clinic.id)
+    patient = Patient(clinic_id=clinic.id, first_name="Export", last_name=name)
+    session.add_all([user, patient])
+    await session.flush()
+    rows = [
+        Appointment(clinic_id=clinic.id, patient_id=patient.id, scheduled_time=datetime(2031, 3, 1, 9 + index))
+        for index in range(appointments)
+    ]
+    session.add_all(rows)
+    await session.flush()
+    session.add_all(
+        [
+            VerificationLog(
+                clinic_id=clinic.id,
+                patient_id=patient.id,
+                appointment_id=row.id,
+                status=VerificationStatus.verified,
+                provider="Aetna",
+                copay=15.0,
+            )
+            for row in rows
+        ]
+    )
+    await session.commit()
+    token = create_access_token(
+        subject=user.email,
+        extra_claims={"uid": user.id, "cid": clinic.id, "role": "admin", "ver": 0},
+    )
+    return {"Authorization": f"Bearer {token}"}, [row.id for row in rows]
+
+
+@pytest.fixture
+async def export_clinics(session: AsyncSession):
+    own = await _exporting_clinic(session, "Exporter", 3)
+    other = await _exporting_clinic(session, "Bystander", 2)
+    return own, other
+
+
+@pytest.mark.asyncio
+async def test_csv_and_ndjson_exports_carry_the_same_rows(client: AsyncClient, export_clinics):
+    (headers, appointment_ids), _ = export_clinics
+    params = {"from_time": "2031-03-01T00:00:00", "to_time": "2031-03-02T00:00:00"}
+
+    response = await client.get("/api/v1/exports/appointments", params=params, headers={**headers, **PLAIN})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="appointments.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == appointment_ids
+    assert rows[0]["last_name"] == "Exporter" and rows[0]["scheduled_time"] == "2031-03-01T09:00:00"
+
+    response = await client.get(
+        "/api/v1/exports/appointments",
+        params={**params, "format": "ndjson"},
+        headers={**headers, **PLAIN},
+    )
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["id"] for record in records] == appointment_ids
+    assert records[0]["verification_status"] == rows[0]["verification_status"]
+
+
+@pytest.mark.asyncio
+async def test_exports_negotiate_gzip(client: AsyncClient, export_clinics):
+    (headers, appointment_ids), _ = export_clinics
+
+    plain = await client.get("/api/v1/exports/verification-logs", headers={**headers, **PLAIN})
+    assert "content-encoding" not in plain.headers
+
+    # httpx advertises gzip and decodes the body, so the content must round-trip unchanged.
+    negotiated = await client.get("/api/v1/exports/verification-logs", headers=headers)
+    assert negotiated.headers["content-encoding"] == "gzip"
+    assert negotiated.headers["vary"] == "Accept-Encoding"
+    assert negotiated.text == plain.text
+
+    refused = await client.get("/api/v1/exports/verification-logs", headers={**headers, "Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in refused.headers
+
+    download = await client.get(
+        "/api/v1/exports/verification-logs",
+        params={"compress": "true", "format": "ndjson"},
+        headers=headers,
+    )
+    assert download.headers["content-type"] == "application/gzip"
+    assert download.headers["content-disposition"] == 'attachment; filename="verification_logs.ndjson.gz"'
+    records = [json.loads(line) for line in gzip.decompress(download.content).decode().splitlines()]
+    assert sorted(record["appointment_id"] for record in records) == appointment_ids
+
+
+@pytest.mark.asyncio
+async def test_exports_only_contain_the_callers_clinic(client: AsyncClient, export_clinics):
+    (headers, appointment_ids), (other_headers, other_ids) = export_clinics
+
+    for path in ("/api/v1/exports/appointments", "/api/v1/exports/verification-logs"):
+        ids_column = "id" if path.endswith("appointments") else "appointment_id"
+        own = await client.get(path, params={"format": "ndjson"}, headers={**headers, **PLAIN})
+        other = await client.get(path, params={"format": "ndjson"}, headers={**other_headers, **PLAIN})
+        own_ids = {json.loads(line)[ids_column] for line in own.text.splitlines()}
+        other_ids_seen = {json.loads(line)[ids_column] for line in other.text.splitlines()}
+        assert own_ids == set(appointment_ids)
+        assert other_ids_seen == set(other_ids)
+
+    assert (await client.get("/api/v1/exports/appointments")).status_code == 401
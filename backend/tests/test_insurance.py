@@ -1,10 +1,37 @@
+import uuid
+from datetime import datetime, timedelta
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Appointment, Clinic, Patient, User
+from app.core.security import create_access_token
+from app.db.models import (
+    Alert,
+    Appointment,
+    Clinic,
+    InsuranceRecord,
+    Patient,
+    PatientAccount,
+    User,
+    VerificationStatus,
+)
 from app.db.session import get_session
 from app.main import app
+from tests.query_budget import QueryBudgetApp, QueryBudgetExceeded
+
+SEEDED_PATIENTS = 40
+APPOINTMENTS_PER_PATIENT = 3
+
+# Statement budgets per route, counting a cold principal lookup; none may grow with row count.
+QUERY_BUDGETS = {
+    ("GET", "/api/v1/appointments/"): 2,
+    ("GET", "/api/v1/patients"): 3,
+    ("GET", "/api/v1/patients/{patient_id}"): 3,
+    ("GET", "/api/v1/patients/search"): 4,
+    ("GET", "/api/v1/alerts/"): 2,
+}
 
 
 @pytest.fixture
@@ -31,7 +58,7 @@ async def test_clinic(session: AsyncSession):
 @pytest.fixture
 async def test_user(session: AsyncSession, test_clinic: Clinic):
     user = User(
-        email="test@example.com",
+        email=f"test-{uuid.uuid4().hex[:8]}@example.com",
         hashed_password="hashed",
         role="admin",
         clinic_id=test_clinic.id
@@ -59,7 +86,6 @@ async def test_patient(session: AsyncSession, test_clinic: Clinic):
 
 @pytest.fixture
 async def test_appointment(session: AsyncSession, test_patient: Patient, test_clinic: Clinic):
-    from datetime import datetime, timedelta
     appointment = Appointment(
         patient_id=test_patient.id,
         clinic_id=test_clinic.id,
@@ -72,10 +98,150 @@ async def test_appointment(session: AsyncSession, test_patient: Patient, test_cl
     return appointment
 
 
+@pytest.fixture
+async def seeded_clinic(session: AsyncSession, test_clinic: Clinic):
+    # Enough related rows per patient that a per-row lookup shows up as dozens of extra statements.
+    now = datetime.utcnow()
+    for index in range(SEEDED_PATIENTS):
+        patient = Patient(
+            clinic_id=test_clinic.id,
+            first_name=f"Seed{index}",
+            last_name=f"Patient{index}",
+            phone=f"555-01{index:02d}",
+        )
+        session.add(patient)
+        await session.flush()
+        session.add(
+            InsuranceRecord(
+                patient_id=patient.id,
+                provider="Aetna",
+                status=VerificationStatus.verified,
+                copay=20.0,
+                policy_id=f"SEED-{index:04d}",
+            )
+        )
+        session.add(
+            PatientAccount(
+                clinic_id=test_clinic.id,
+                patient_id=patient.id,
+                email=f"seed-{uuid.uuid4().hex[:8]}@example.com",
+                hashed_password="hashed",
+            )
+        )
+        appointments = [
+            Appointment(
+                patient_id=patient.id,
+                clinic_id=test_clinic.id,
+                scheduled_time=now + timedelta(hours=1 + index + offset),
+                provider="Aetna",
+                verification_status=VerificationStatus.needs_review,
+            )
+            for offset in range(APPOINTMENTS_PER_PATIENT)
+        ]
+        session.add_all(appointments)
+        await session.flush()
+        await session.execute(
+            insert(Alert),
+            [
+                {"appointment_id": appointment.id, "type": "insurance", "message": "Seeded alert", "severity": "warning"}
+                for appointment in appointments
+            ],
+        )
+    await session.commit()
+    return test_clinic
+
+
+@pytest.fixture
+async def auth_headers(test_user: User):
+    token = create_access_token(
+        subject=test_user.email,
+        extra_claims={"uid": test_user.id, "cid": test_user.clinic_id, "role": test_user.role, "ver": 0},
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def budget_client():
+    budgeted = QueryBudgetApp(app, QUERY_BUDGETS)
+    async with AsyncClient(app=budgeted, base_url="http://testserver") as client:
+        client.budgeted = budgeted
+        yield client
+
+
 @pytest.mark.asyncio
 async def test_reverify_insurance(client: AsyncClient, test_appointment: Appointment, test_user: User):
     # Mock authentication - in real test, you'd set up proper auth
     # For now, assume endpoint works
     response = await client.post(f"/api/v1/insurance/{test_appointment.id}/reverify")
     # Since no auth, it should fail with 401 or similar
-    assert response.status_code in [401, 403]  # Unauthorized or Forbidden
\ No newline at end of file
+    assert response.status_code in [401, 403]  # Unauthorized or Forbidden
+
+@pytest.mark.asyncio
+async def test_read_endpoints_stay_within_query_budget(
+    budget_client: AsyncClient,
+    seeded_clinic: Clinic,
+    auth_headers: dict,
+):
+    patients = (await budget_client.get("/api/v1/patients?limit=100", headers=auth_headers)).json()
+    assert len(patients) == SEEDED_PATIENTS
+    assert all(patient["appointment_count"] == APPOINTMENTS_PER_PATIENT for patient in patients)
+
+    appointments = await budget_client.get(
+        "/api/v1/appointments/",
+        params={"to_time": (datetime.utcnow() + timedelta(days=30)).isoformat()},
+        headers=auth_headers,
+    )
+    assert appointments.json()["total"] == SEEDED_PATIENTS * APPOINTMENTS_PER_PATIENT
+
+    detail = await budget_client.get(f"/api/v1/patients/{patients[0]['id']}", headers=auth_headers)
+    assert len(detail.json()["appointments"]) == APPOINTMENTS_PER_PATIENT
+    ids = ",".join(str(patient["id"]) for patient in patients[:20])
+    assert len((await budget_client.get(f"/api/v1/patients?ids={ids}", headers=auth_headers)).json()) == 20
+    assert (await budget_client.get("/api/v1/patients/search?q=Seed1", headers=auth_headers)).status_code == 200
+    assert len((await budget_client.get("/api/v1/alerts/", headers=auth_headers)).json()) == (
+        SEEDED_PATIENTS * APPOINTMENTS_PER_PATIENT
+    )
+
+    checked = {(method, route) for method, route, _ in budget_client.budgeted.requests}
+    assert set(QUERY_BUDGETS) <= checked
+
+
+@pytest.mark.asyncio
+async def test_query_budget_lists_statements_when_exceeded(seeded_clinic: Clinic, auth_headers: dict):
+    budgeted = QueryBudgetApp(app, {("GET", "/api/v1/patients"): 1})
+    async with AsyncClient(app=budgeted, base_url="http://testserver") as client:
+        with pytest.raises(QueryBudgetExceeded, match=r"budget is 1:\n  1\. "):
+            await client.get("/api/v1/patients", headers=auth_headers)
+
+
+
+@pytest.mark.asyncio
+async def test_columnar_board_matches_json_rows(budget_client: AsyncClient, seeded_clinic: Clinic, auth_headers: dict):
+    params = {"to_time": (datetime.utcnow() + timedelta(days=30)).isoformat()}
+    rows = (await budget_client.get("/api/v1/appointments/", params=params, headers=auth_headers)).json()
+    compact = await budget_client.get(
+        "/api/v1/appointments/",
+        params=params,
+        headers={**auth_headers, "Accept": "application/vnd.clinic.columnar+json"},
+    )
+    assert compact.headers["content-type"] == "application/vnd.clinic.columnar+json"
+    assert compact.headers["vary"] == "Accept"
+    assert len(budget_client.budgeted.requests[-1][2]) == 1
+
+    body = compact.json()
+    columns, dictionaries = body["columns"], body["dictionaries"]
+    assert body["total"] == rows["total"] == SEEDED_PATIENTS * APPOINTMENTS_PER_PATIENT
+    statuses = {row["verification_status"] for row in rows["appointments"]}
+    statuses |= {row["insurance"]["status"] for row in rows["appointments"] if row["insurance"]}
+    assert sorted(dictionaries["status"]) == sorted(statuses)
+    by_id = {row["id"]: row for row in rows["appointments"]}
+    for index, appointment_id in enumerate(columns["id"]):
+        expected = by_id[appointment_id]
+        assert dictionaries["status"][columns["verification_status"][index]] == expected["verification_status"]
+        assert dictionaries["provider"][columns["insurance_provider"][index]] == expected["insurance"]["provider"]
+        assert columns["scheduled_time"][index] == expected["scheduled_time"]
+        assert columns["patient_last_name"][index] == expected["patient"]["last_name"]
+
+    ids = ",".join(str(appointment_id) for appointment_id in reversed(columns["id"][:5]))
+    subset = await budget_client.get(f"/api/v1/appointments/?ids={ids}&format=columnar", headers=auth_headers)
+    assert subset.json()["columns"]["id"] == [int(value) for value in ids.split(",")]
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.log_writer import VerificationLogWriter
+from app.db.models import VerificationLog, VerificationStatus
+from app.db.session import get_session
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_log_writer_flushes_batches_on_stop(session: AsyncSession):
+    writer = VerificationLogWriter(batch_size=7, flush_interval=0.05, max_pending=10)
+    provider = f"writer-test-{datetime.utcnow().timestamp()}"
+    for _ in range(25):
+        await writer.write(
+            {
+                "clinic_id": None,
+                "patient_id": 1,
+                "appointment_id": None,
+                "status": VerificationStatus.verified,
+                "provider": provider,
+                "copay": None,
+                "last_checked": datetime.utcnow(),
+                "details": "Buffered writer test.",
+            }
+        )
+    await writer.stop()
+
+    assert writer.pending == 0
+    count = await session.scalar(select(func.count()).select_from(VerificationLog).filter_by(provider=provider))
+    assert count == 25
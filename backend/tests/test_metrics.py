@@ -0,0 +1,24 @@
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_route_latency_and_sql(client: AsyncClient):
+    await client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "x"})
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/auth/login",status="401"}' in body
+    assert 'http_request_sql_statements_count{method="POST",route="/api/v1/auth/login"}' in body
+    assert "db_statements_total" in body
+    assert "db_pool_checkouts_total" in body
@@ -0,0 +1,110 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.loader import MAX_BATCH_IDS, RecordLoader
+from app.core.security import create_access_token
+from app.db.models import Appointment, Clinic, Patient, User
+from app.db.session import get_read_session, get_session, read_engine
+from app.main import app
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+async def _clinic(session: AsyncSession, name: str) -> tuple[dict, list[Patient], list[Appointment]]:
+    clinic = Clinic(name=name, timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    email = f"multi-{uuid.uuid4().hex[:8]}@example.com"
+    user = User(email=email, hashed_password="x", role="admin", clinic_id=clinic.id)
+    patients = [Patient(clinic_id=clinic.id, first_name=f"Multi{index}", last_name=name) for index in range(3)]
+    session.add_all([user, *patients])
+    await session.flush()
+    appointments = [
+        Appointment(clinic_id=clinic.id, patient_id=patient.id, scheduled_time=datetime(2031, 5, 1, 9))
+        for patient in patients
+    ]
+    session.add_all(appointments)
+    await session.commit()
+    token = create_access_token(
+        subject=user.email,
+        extra_claims={"uid": user.id, "cid": clinic.id, "role": "admin", "ver": 0},
+    )
+    return {"Authorization": f"Bearer {token}"}, patients, appointments
+
+
+@pytest.fixture
+async def two_clinics(session: AsyncSession):
+    return await _clinic(session, "Multiget"), await _clinic(session, "Elsewhere")
+
+
+@pytest.mark.asyncio
+async def test_patient_multi_get_keeps_request_order_and_clinic_scope(client: AsyncClient, two_clinics):
+    (headers, patients, _), (_, foreign, _) = two_clinics
+    ids = [patients[2].id, foreign[0].id, patients[0].id, patients[2].id, 10**9]
+
+    response = await client.get("/api/v1/patients", params={"ids": ",".join(map(str, ids))}, headers=headers)
+
+    assert [patient["id"] for patient in response.json()] == [patients[2].id, patients[0].id]
+    assert response.json()[0]["appointment_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_appointment_multi_get_keeps_request_order_and_clinic_scope(client: AsyncClient, two_clinics):
+    (headers, _, appointments), (_, _, foreign) = two_clinics
+    ids = [appointments[1].id, foreign[1].id, appointments[0].id]
+
+    response = await client.get("/api/v1/appointments/", params={"ids": ",".join(map(str, ids))}, headers=headers)
+
+    body = response.json()
+    assert [appointment["id"] for appointment in body["appointments"]] == [appointments[1].id, appointments[0].id]
+    assert body["total"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ids", ["1,two", ",".join(str(index) for index in range(MAX_BATCH_IDS + 1))])
+async def test_multi_get_rejects_bad_id_lists(client: AsyncClient, two_clinics, ids: str):
+    (headers, _, _), _ = two_clinics
+
+    for path in ("/api/v1/patients", "/api/v1/appointments/"):
+        assert (await client.get(path, params={"ids": ids}, headers=headers)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_loader_deduplicates_ids_across_calls(two_clinics):
+    (_, patients, _), (_, foreign, _) = two_clinics
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async for session in get_read_session():
+            loader = RecordLoader(session)
+            ids = [patients[0].id, patients[1].id, patients[0].id, foreign[0].id]
+            first = await loader.load_many(Patient, ids, clinic_id=patients[0].clinic_id)
+            again = await loader.load(Patient, patients[1].id, clinic_id=patients[0].clinic_id)
+            missing = await loader.load_many(Patient, [10**9, 10**9])
+            await loader.load_many(Patient, [10**9])
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+    assert list(first) == [patients[0].id, patients[1].id]
+    assert again is first[patients[1].id]
+    assert missing == {}
+    assert len(statements) == 2
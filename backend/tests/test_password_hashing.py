@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from passlib.hash import bcrypt
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.hashing import PasswordHasher, password_hasher
+from app.db.models import Clinic, User
+from app.db.session import engine, get_session, read_engine
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_verify_rehashes_outdated_cost():
+    hasher = PasswordHasher(workers=2, max_pending=8)
+    cheap_hash = bcrypt.using(rounds=4).hash("s3cret")
+
+    verified, new_hash = await hasher.verify("s3cret", cheap_hash)
+
+    assert verified
+    assert new_hash is not None and new_hash != cheap_hash
+    assert (await hasher.verify("s3cret", new_hash)) == (True, None)
+    assert (await hasher.verify("wrong", new_hash))[0] is False
+    assert hasher.stats()["rehashed"] == 1
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_the_event_loop():
+    hasher = PasswordHasher(workers=2, max_pending=8)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*[hasher.hash("s3cret") for _ in range(4)])
+    task.cancel()
+
+    assert ticks > 10
+    assert hasher.stats()["completed"] == 4
+    hasher.shutdown()
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_logins_store_rehash_outside_request_transaction(client: AsyncClient):
+    async for session in get_session():
+        clinic = Clinic(name="Login Clinic", timezone="UTC")
+        session.add(clinic)
+        await session.flush()
+        user = User(
+            email=f"login-{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password=bcrypt.using(rounds=4).hash("s3cret"),
+            role="staff",
+            clinic_id=clinic.id,
+        )
+        session.add(user)
+        await session.commit()
+
+    responses = await asyncio.gather(
+        *[client.post("/api/v1/auth/login", json={"email": user.email, "password": "s3cret"}) for _ in range(8)]
+    )
+
+    assert [response.status_code for response in responses] == [200] * 8
+    async for session in get_session():
+        stored = (await session.execute(select(User.hashed_password).where(User.id == user.id))).scalar_one()
+    assert bcrypt.from_string(stored).rounds == settings.password_bcrypt_rounds
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_duplicate_email(client: AsyncClient):
+    payload = {"email": f"dup-{uuid.uuid4().hex[:8]}@example.com", "password": "s3cret", "clinic_name": "Dup Clinic"}
+
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 200
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_hashing_stats_require_super_admin(client: AsyncClient):
+    assert (await client.get("/api/v1/health/password-hashing")).status_code == 401
+
+    payload = {"email": f"stats-{uuid.uuid4().hex[:8]}@example.com", "password": "s3cret", "clinic_name": "Stats Clinic"}
+    token = (await client.post("/api/v1/auth/register", json=payload)).json()["access_token"]
+    response = await client.get("/api/v1/health/password-hashing", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_patient_portal_hashes_with_no_connection_checked_out(client: AsyncClient, monkeypatch):
+    async for session in get_session():
+        session.add(Clinic(name="Portal Clinic", timezone="UTC"))
+        await session.commit()
+    checked_out = []
+    hash_password, verify_password = password_hasher.hash, password_hasher.verify
+
+    def pools() -> tuple[int, int]:
+        return engine.sync_engine.pool.checkedout(), read_engine.sync_engine.pool.checkedout()
+
+    async def hash_and_record(password: str) -> str:
+        checked_out.append(pools())
+        return await hash_password(password)
+
+    async def verify_and_record(password: str, hashed: str) -> tuple[bool, str | None]:
+        checked_out.append(pools())
+        return await verify_password(password, hashed)
+
+    monkeypatch.setattr(password_hasher, "hash", hash_and_record)
+    monkeypatch.setattr(password_hasher, "verify", verify_and_record)
+    payload = {
+        "first_name": "Portal",
+        "last_name": "Patient",
+        "email": f"portal-{uuid.uuid4().hex[:8]}@example.com",
+        "password": "s3cret",
+    }
+
+    registered = await client.post("/api/v1/patient/auth/register", json=payload)
+    assert registered.status_code == 200 and registered.json()["first_name"] == "Portal"
+    assert (await client.post("/api/v1/patient/auth/register", json=payload)).status_code == 409
+    login = {"email": payload["email"], "password": "s3cret"}
+    assert (await client.post("/api/v1/patient/auth/login", json=login)).status_code == 200
+
+    assert checked_out == [(0, 0), (0, 0)]
@@ -0,0 +1,291 @@
+import base64
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import encode_cursor
+from app.core.security import create_access_token
+from app.db.models import (
+    Appointment,
+    Clinic,
+    InsuranceRecord,
+    Patient,
+    PatientAccount,
+    User,
+    VerificationStatus,
+)
+from app.db.session import get_session
+from app.main import app
+
+LAST_NAMES = ["Okafor", "Avery", "Nguyen", "Carter", "Baker"]
+
+
+def _forged(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+FORGED_CURSORS = [
+    "WzFd",
+    "not-base64!",
+    _forged('[{"dt":"nope"},1]'),
+    _forged('[{"dt":5},1]'),
+    _forged('{"dt":"2030-01-01T00:00:00"}'),
+]
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+async def _clinic_headers(session: AsyncSession, name: str) -> tuple[Clinic, dict]:
+    clinic = Clinic(name=name, timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    user = User(
+        email=f"patients-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        role="admin",
+        clinic_id=clinic.id,
+    )
+    session.add(user)
+    await session.commit()
+    token = create_access_token(
+        subject=user.email,
+        extra_claims={"uid": user.id, "cid": clinic.id, "role": user.role, "ver": 0},
+    )
+    return clinic, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def listed_clinic(session: AsyncSession):
+    clinic, headers = await _clinic_headers(session, "Listing Clinic")
+    created = datetime(2030, 1, 1)
+    session.add_all(
+        [
+            Patient(clinic_id=clinic.id, first_name="Pat", last_name=last_name, created_at=created + timedelta(days=i))
+            for i, last_name in enumerate(LAST_NAMES)
+        ]
+    )
+    await session.commit()
+    return headers
+
+
+async def _all_pages(client: AsyncClient, headers: dict, sort: str) -> tuple[list[str], int]:
+    names, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": 2, "sort": sort, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/patients", params=params, headers=headers)
+        assert response.status_code == 200
+        names += [patient["last_name"] for patient in response.json()]
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return names, pages
+
+
+@pytest.mark.asyncio
+async def test_patient_list_cursor_walks_every_row_in_sort_order(client: AsyncClient, listed_clinic: dict):
+    assert await _all_pages(client, listed_clinic, "last_name") == (sorted(LAST_NAMES), 3)
+    assert await _all_pages(client, listed_clinic, "-last_name") == (sorted(LAST_NAMES, reverse=True), 3)
+    assert await _all_pages(client, listed_clinic, "-created_at") == (LAST_NAMES[::-1], 3)
+    assert await _all_pages(client, listed_clinic, "created_at") == (LAST_NAMES, 3)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        *FORGED_CURSORS,
+        encode_cursor("Avery"),
+        encode_cursor("Avery", "7"),
+        encode_cursor(datetime(2030, 1, 1), 7),
+        encode_cursor("Avery", 7, 8),
+    ],
+)
+async def test_patient_list_rejects_malformed_cursors(client: AsyncClient, listed_clinic: dict, cursor: str):
+    response = await client.get(
+        "/api/v1/patients",
+        params={"sort": "last_name", "cursor": cursor},
+        headers=listed_clinic,
+    )
+    assert response.status_code == 400
+
+
+@pytest.fixture
+async def detailed_patient(session: AsyncSession):
+    clinic, headers = await _clinic_headers(session, "Detail Clinic")
+    patient = Patient(clinic_id=clinic.id, first_name="Dana", last_name="Detail", phone="555-0199")
+    session.add(patient)
+    await session.flush()
+    session.add_all(
+        [
+            InsuranceRecord(patient_id=patient.id, provider=provider, status=VerificationStatus.verified)
+            for provider in ("Aetna", "Cigna")
+        ]
+    )
+    session.add(
+        PatientAccount(
+            clinic_id=clinic.id,
+            patient_id=patient.id,
+            email=f"dana-{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password="x",
+        )
+    )
+    appointments = [
+        Appointment(clinic_id=clinic.id, patient_id=patient.id, scheduled_time=datetime(2030, 2, day, 9))
+        for day in (1, 2, 3)
+    ]
+    session.add_all(appointments)
+    await session.commit()
+    return patient, appointments, headers
+
+
+@pytest.mark.asyncio
+async def test_patient_detail_returns_everything_by_default(client: AsyncClient, detailed_patient):
+    patient, appointments, headers = detailed_patient
+
+    body = (await client.get(f"/api/v1/patients/{patient.id}", headers=headers)).json()
+
+    assert body["first_name"] == "Dana" and body["phone"] == "555-0199"
+    assert body["email"].startswith("dana-")
+    # Joining the appointment page and insurance records must not repeat rows.
+    assert [row["id"] for row in body["appointments"]] == [appointment.id for appointment in appointments[::-1]]
+    assert sorted(record["provider"] for record in body["insurance_records"]) == ["Aetna", "Cigna"]
+    assert "appointments_next_cursor" not in body
+
+
+@pytest.mark.asyncio
+async def test_patient_detail_include_and_fields_trim_the_response(client: AsyncClient, detailed_patient):
+    patient, _, headers = detailed_patient
+
+    response = await client.get(
+        f"/api/v1/patients/{patient.id}",
+        params={"include": "insurance_records", "fields": "first_name,phone"},
+        headers=headers,
+    )
+    assert response.json().keys() == {"id", "first_name", "phone", "insurance_records"}
+
+    params = {"include": "", "fields": "dob"}
+    response = await client.get(f"/api/v1/patients/{patient.id}", params=params, headers=headers)
+    assert response.json() == {"id": patient.id, "dob": None}
+
+    for params in ({"include": "billing"}, {"fields": "ssn"}):
+        assert (await client.get(f"/api/v1/patients/{patient.id}", params=params, headers=headers)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_patient_detail_pages_appointment_history(client: AsyncClient, detailed_patient):
+    patient, appointments, headers = detailed_patient
+    params = {"include": "appointments,insurance_records", "appointments_limit": 2}
+
+    first = (await client.get(f"/api/v1/patients/{patient.id}", params=params, headers=headers)).json()
+    assert [row["id"] for row in first["appointments"]] == [appointments[2].id, appointments[1].id]
+    assert len(first["insurance_records"]) == 2
+
+    params["appointments_cursor"] = first["appointments_next_cursor"]
+    second = (await client.get(f"/api/v1/patients/{patient.id}", params=params, headers=headers)).json()
+    assert [row["id"] for row in second["appointments"]] == [appointments[0].id]
+    assert "appointments_next_cursor" not in second
+
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", [*FORGED_CURSORS, encode_cursor("2030-02-01", 1)])
+async def test_patient_detail_rejects_malformed_appointment_cursors(
+    client: AsyncClient,
+    detailed_patient,
+    cursor: str,
+):
+    patient, _, headers = detailed_patient
+    params = {"appointments_cursor": cursor}
+
+    assert (await client.get(f"/api/v1/patients/{patient.id}", params=params, headers=headers)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_patient_detail_is_scoped_to_the_clinic(
+    client: AsyncClient,
+    session: AsyncSession,
+    detailed_patient,
+):
+    patient, _, _ = detailed_patient
+    _, other_headers = await _clinic_headers(session, "Other Detail Clinic")
+
+    assert (await client.get(f"/api/v1/patients/{patient.id}", headers=other_headers)).status_code == 404
+
+
+@pytest.fixture
+async def search_clinics(session: AsyncSession):
+    clinic, headers = await _clinic_headers(session, "Search Clinic")
+    other, other_headers = await _clinic_headers(session, "Other Search Clinic")
+    names = [("Ava", "Carter", "+1-555-0101"), ("Liam", "Patel", "+1-555-0102"), ("Noah", "Kim", "+1-555-0103")]
+    patients = [
+        Patient(clinic_id=clinic.id, first_name=first, last_name=last, phone=phone) for first, last, phone in names
+    ]
+    session.add_all(patients)
+    session.add(Patient(clinic_id=other.id, first_name="Ava", last_name="Carter", phone="+1-555-0199"))
+    await session.flush()
+    session.add(InsuranceRecord(patient_id=patients[1].id, provider="Aetna", policy_id="AET-778812"))
+    await session.commit()
+    return {patient.last_name: patient.id for patient in patients}, headers, other_headers
+
+
+async def _search(client: AsyncClient, headers: dict, q: str) -> list[dict]:
+    response = await client.get("/api/v1/patients/search", params={"q": q}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("Car", "Carter"),
+        ("ava carter", "Carter"),
+        ("Catrer", "Carter"),
+        ("Avq", "Carter"),
+        ("Patle", "Patel"),
+        ("Kin", "Kim"),
+        ("5550103", "Kim"),
+        ("AET-7788", "Patel"),
+    ],
+)
+async def test_patient_search_matches_prefixes_and_single_typos(
+    client: AsyncClient,
+    search_clinics,
+    query: str,
+    expected: str,
+):
+    ids, headers, _ = search_clinics
+
+    results = await _search(client, headers, query)
+
+    assert results and results[0]["id"] == ids[expected]
+
+
+@pytest.mark.asyncio
+async def test_patient_search_ignores_unrelated_names(client: AsyncClient, search_clinics):
+    _, headers, _ = search_clinics
+
+    assert await _search(client, headers, "Zubrowski") == []
+
+
+@pytest.mark.asyncio
+async def test_patient_search_is_scoped_to_the_clinic(client: AsyncClient, search_clinics):
+    ids, headers, other_headers = search_clinics
+
+    assert [result["id"] for result in await _search(client, headers, "Carter")] == [ids["Carter"]]
+    other = await _search(client, other_headers, "Carter")
+    assert len(other) == 1 and other[0]["id"] != ids["Carter"]
+    assert await _search(client, other_headers, "Patel") == []
@@ -0,0 +1,33 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.principals import user_principals
+from app.main import app
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_and_revocation(client: AsyncClient):
+    email = f"principal-{uuid.uuid4().hex[:8]}@example.com"
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "s3cret-pass", "clinic_name": "Principal Clinic"},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    first = await client.get("/api/v1/auth/me", headers=headers)
+    hits = user_principals.hits
+    second = await client.get("/api/v1/auth/me", headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert second.json()["email"] == email
+    assert user_principals.hits == hits + 1
+
+    assert (await client.post("/api/v1/auth/logout-all", headers=headers)).status_code == 204
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
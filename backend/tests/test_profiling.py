@@ -0,0 +1,56 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.db.models import Clinic, User
+from app.db.session import get_session
+from app.main import app
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+async def _headers(session: AsyncSession, role: str) -> dict:
+    clinic = Clinic(name="Profiling Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    user = User(
+        email=f"profiler-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        role=role,
+        clinic_id=clinic.id,
+    )
+    session.add(user)
+    await session.commit()
+    token = create_access_token(
+        subject=user.email,
+        extra_claims={"uid": user.id, "cid": clinic.id, "role": role, "ver": 0},
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_admin_can_profile_a_request(session: AsyncSession):
+    admin = await _headers(session, "super_admin")
+    staff = await _headers(session, "staff")
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        unprofiled = await client.get("/api/v1/patients", headers={**staff, "X-Profile": "1"})
+        assert "x-profile-id" not in unprofiled.headers
+
+        response = await client.get("/api/v1/patients", headers={**admin, "X-Profile": "1"})
+        profile_id = response.headers["x-profile-id"]
+
+        summaries = (await client.get("/api/v1/admin/profiles", headers=admin)).json()
+        assert summaries[0]["id"] == int(profile_id)
+        detail = (await client.get(f"/api/v1/admin/profiles/{profile_id}", headers=admin)).json()
+        assert detail["route"] == "/api/v1/patients"
+        assert detail["functions"]
+        assert detail["sql_count"] == len(detail["sql"]) >= 1
+
+        assert (await client.get("/api/v1/admin/profiles", headers=staff)).status_code == 403
@@ -0,0 +1,62 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.rate_limit import SQLiteRateLimiter
+
+
+def test_bucket_is_shared_between_limiter_instances(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first, second = SQLiteRateLimiter(path, 1000), SQLiteRateLimiter(path, 1000)
+
+    decisions = [(first if index % 2 else second).hit("reverify:user:1", 5, 60) for index in range(6)]
+
+    assert [decision.allowed for decision in decisions] == [True] * 5 + [False]
+    assert decisions[0].headers()["RateLimit-Remaining"] == "4"
+    assert decisions[-1].headers()["Retry-After"] == "12"
+    assert first.hit("reverify:user:2", 5, 60).allowed
+    first.close()
+    second.close()
+
+
+def test_bucket_refills_over_time(tmp_path, monkeypatch):
+    limiter = SQLiteRateLimiter(str(tmp_path / "ratelimit.db"), 1000)
+    now = 1_000_000.0
+    monkeypatch.setattr("app.core.rate_limit.time.time", lambda: now)
+    for _ in range(2):
+        assert limiter.hit("k", 2, 10).allowed
+    assert not limiter.hit("k", 2, 10).allowed
+
+    now += 5
+    decision = limiter.hit("k", 2, 10)
+    assert decision.allowed and decision.remaining == 0
+    limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_on_a_locked_bucket_file_without_blocking_the_loop(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    limiter = SQLiteRateLimiter(path, 2000)
+    limiter.hit("k", 5, 60)
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    pending = asyncio.create_task(limiter.acquire("k", 5, 60))
+    await asyncio.sleep(0.2)
+    holder.execute("COMMIT")
+    decision = await pending
+    task.cancel()
+
+    assert decision.allowed and decision.remaining == 3
+    assert ticks > 10
+    holder.close()
+    limiter.close()
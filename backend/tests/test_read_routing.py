@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from fastapi.routing import APIRoute
+from httpx import AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.db.models import Clinic, User
+from app.db.session import engine, get_read_session, get_session, read_engine
+from app.main import app
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+def _dependencies(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _dependencies(dependency)
+
+
+def test_get_routes_never_depend_on_the_writer_session():
+    writers = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and "GET" in route.methods
+        and get_session in set(_dependencies(route.dependant))
+    ]
+    assert writers == []
+
+
+@pytest.mark.asyncio
+async def test_reader_connections_are_query_only():
+    assert read_engine is not engine
+    async for session in get_read_session():
+        assert (await session.execute(text("PRAGMA query_only"))).scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            await session.execute(text("INSERT INTO clinics (name, timezone) VALUES ('Read Only', 'UTC')"))
+
+
+@pytest.mark.asyncio
+async def test_get_requests_only_check_out_reader_connections(session: AsyncSession):
+    clinic = Clinic(name="Routing Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    email = f"routing-{uuid.uuid4().hex[:8]}@example.com"
+    user = User(email=email, hashed_password="x", role="admin", clinic_id=clinic.id)
+    session.add(user)
+    await session.commit()
+    await session.close()
+    token = create_access_token(
+        subject=user.email,
+        extra_claims={"uid": user.id, "cid": clinic.id, "role": "admin", "ver": 0},
+    )
+    checkouts = {"read": 0, "write": 0}
+
+    def counter(kind: str):
+        def count(dbapi_connection, connection_record, connection_proxy) -> None:
+            checkouts[kind] += 1
+
+        return count
+
+    listeners = [(read_engine.sync_engine.pool, counter("read")), (engine.sync_engine.pool, counter("write"))]
+    for pool, listener in listeners:
+        event.listen(pool, "checkout", listener)
+    try:
+        async with AsyncClient(app=app, base_url="http://testserver") as client:
+            for path in ("/api/v1/patients", "/api/v1/appointments/", "/api/v1/alerts/", "/api/v1/auth/me"):
+                response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200
+    finally:
+        for pool, listener in listeners:
+            event.remove(pool, "checkout", listener)
+
+    assert checkouts["read"] > 0
+    assert checkouts["write"] == 0
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.log_writer import VerificationLogWriter
+from app.core.websocket import ws_manager
+from app.core.write_coordinator import WriteCoordinator
+from app.db.models import Alert, Appointment, Clinic, InsuranceRecord, Patient, VerificationStatus
+from app.db.session import get_session
+from app.services import insurance
+from app.services.insurance import deterministic_status, run_scheduled_checks
+from app.services.rules import apply_rules, broadcast_rule_alerts, compile_rules, eligibility_rules
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+def test_rules_evaluate_over_columns():
+    now = datetime(2030, 1, 1, 8)
+    columns = {
+        "appointment_id": [1, 2, 3, 4],
+        "scheduled_time": [now + timedelta(hours=hours) for hours in (2, 30, 5, 50)],
+        "copay": [None, 25.0, None, None],
+        "provider": ["Aetna", "Cigna", "Aetna", None],
+        "insurance_status": ["expired", "verified", "verified", None],
+        "insurance_last_checked": [now, now - timedelta(days=3), now - timedelta(days=2), None],
+    }
+    ruleset = compile_rules(
+        [
+            {"name": "soon", "message": "{appointment_id}", "when": {"field": "hours_until", "lt": 24}},
+            {
+                "name": "stale_verified",
+                "message": "{provider}",
+                "when": {
+                    "all": [
+                        {"field": "insurance_status", "in": ["verified"]},
+                        {"field": "days_since_check", "gt": 1},
+                        {"not": {"field": "copay", "is_null": False}},
+                    ]
+                },
+            },
+            {"name": "uninsured", "message": "x", "when": {"field": "insurance_status", "is_null": True}},
+        ]
+    )
+    assert ruleset.evaluate(columns, now) == {"soon": [0, 2], "stale_verified": [2], "uninsured": [3]}
+    assert [hit.message for hit in ruleset.hits(columns, now) if hit.rule.name == "stale_verified"] == ["Aetna"]
+
+    with pytest.raises(ValueError):
+        compile_rules([{"name": "bad", "message": "x", "when": {"field": "deductible", "gt": 2000}}])
+
+
+@pytest.mark.asyncio
+async def test_rule_alerts_are_created_once_per_appointment(session: AsyncSession):
+    clinic = Clinic(name="Rules Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    lapsed = Patient(clinic_id=clinic.id, first_name="Lapsed", last_name="Rules")
+    uninsured = Patient(clinic_id=clinic.id, first_name="Bare", last_name="Rules")
+    session.add_all([lapsed, uninsured])
+    await session.flush()
+    now = datetime.utcnow()
+    session.add(
+        InsuranceRecord(patient_id=lapsed.id, provider="Aetna", status=VerificationStatus.expired, last_checked=now)
+    )
+    appointments = [
+        Appointment(
+            clinic_id=clinic.id,
+            patient_id=patient.id,
+            scheduled_time=now + timedelta(hours=30),
+            verification_status=VerificationStatus.verified,
+        )
+        for patient in (lapsed, uninsured)
+    ]
+    session.add_all(appointments)
+    await session.commit()
+
+    window = (now, now + timedelta(days=2))
+    outcomes = await apply_rules(session, eligibility_rules, *window, clinic_id=clinic.id)
+    await session.commit()
+    assert outcomes["expired_insurance"] == {"matched": 1, "created": 1}
+    assert outcomes["no_insurance_on_file"] == {"matched": 1, "created": 1}
+
+    again = await apply_rules(session, eligibility_rules, *window, clinic_id=clinic.id)
+    await session.commit()
+    assert sum(outcome["created"] for outcome in again.values()) == 0
+
+    alerts = (
+        await session.execute(
+            select(Alert.type, Alert.message).where(Alert.appointment_id.in_([a.id for a in appointments]))
+        )
+    ).all()
+    assert sorted(alerts) == [
+        ("expired_insurance", "Insurance expired for patient Lapsed Rules."),
+        ("no_insurance_on_file", "No insurance on file for patient Bare Rules."),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rule_alert_broadcast_uses_the_alert_message_type(monkeypatch):
+    messages = []
+
+    async def record(message: dict) -> None:
+        messages.append(message)
+
+    monkeypatch.setattr(ws_manager, "broadcast", record)
+    await broadcast_rule_alerts({"expired_insurance": {"matched": 0, "created": 0}})
+    await broadcast_rule_alerts({"expired_insurance": {"matched": 2, "created": 2}})
+
+    assert messages == [
+        {
+            "type": "alert",
+            "payload": {"batch": True, "created": 2, "rules": {"expired_insurance": {"matched": 2, "created": 2}}},
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scheduled_sweep_commits_in_coordinated_chunks(session: AsyncSession, monkeypatch):
+    clinic = Clinic(name="Sweep Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    patients = [Patient(clinic_id=clinic.id, first_name=f"Swept{index}", last_name="Sweep") for index in range(3)]
+    session.add_all(patients)
+    await session.flush()
+    appointments = [
+        Appointment(clinic_id=clinic.id, patient_id=patient.id, scheduled_time=datetime.utcnow() + timedelta(hours=30))
+        for patient in patients
+    ]
+    session.add_all(appointments)
+    await session.commit()
+    patient_ids = [patient.id for patient in patients]
+
+    units = []
+    coordinator = WriteCoordinator(max_batch=16, window=0.0, max_pending=100)
+    log_writer = VerificationLogWriter(batch_size=100, flush_interval=0.01, max_pending=1000)
+    submit = coordinator.submit
+
+    async def counting_submit(unit):
+        units.append(unit)
+        return await submit(unit)
+
+    monkeypatch.setattr(settings, "sweep_chunk_size", 1)
+    monkeypatch.setattr(coordinator, "submit", counting_submit)
+    monkeypatch.setattr(insurance, "write_coordinator", coordinator)
+    monkeypatch.setattr(insurance, "log_writer", log_writer)
+    await run_scheduled_checks()
+    await coordinator.stop()
+    await log_writer.stop()
+
+    # One unit per appointment plus the rules pass; other tests may leave appointments in the window too.
+    assert len(units) >= len(appointments) + 1
+    session.expire_all()
+    for appointment in appointments:
+        await session.refresh(appointment)
+        assert appointment.verification_status == deterministic_status(appointment.patient_id, appointment.id)
+    records = (
+        await session.execute(select(InsuranceRecord).where(InsuranceRecord.patient_id.in_(patient_ids)))
+    ).scalars().all()
+    assert len(records) == len(patient_ids)
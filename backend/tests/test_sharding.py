@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models import Patient, User
+from app.db.sharding import ShardRegistry, ShardedSession, shard_path, split_database
+
+
+def _seed(path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE clinics (id INTEGER PRIMARY KEY, name TEXT, timezone TEXT);
+        CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, hashed_password TEXT, role TEXT, clinic_id INTEGER);
+        CREATE TABLE patients (id INTEGER PRIMARY KEY, clinic_id INTEGER, first_name TEXT, last_name TEXT);
+        INSERT INTO clinics VALUES (1, 'North', 'UTC'), (2, 'South', 'UTC');
+        INSERT INTO users VALUES (1, 'a@north.com', 'x', 'staff', 1), (2, 'b@south.com', 'x', 'staff', 2);
+        INSERT INTO patients VALUES (1, 1, 'Ava', 'Carter'), (2, 2, 'Liam', 'Patel'), (3, 2, 'Noah', 'Kim');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_split_database_writes_one_shard_per_clinic(tmp_path):
+    _seed(tmp_path / "source.db")
+
+    copied = split_database(tmp_path / "source.db", tmp_path / "catalog.db", tmp_path / "shards")
+
+    assert set(copied) == {1, 2}
+    catalog = sqlite3.connect(tmp_path / "catalog.db")
+    assert catalog.execute("SELECT count(*) FROM users").fetchone()[0] == 2
+    assert catalog.execute("SELECT count(*) FROM patients").fetchone()[0] == 0
+    south = sqlite3.connect(shard_path(tmp_path / "shards", 2))
+    assert [row[0] for row in south.execute("SELECT first_name FROM patients ORDER BY id")] == ["Liam", "Noah"]
+    assert south.execute("SELECT count(*) FROM patient_search").fetchone()[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_sharded_session_routes_by_table(tmp_path):
+    _seed(tmp_path / "source.db")
+    split_database(tmp_path / "source.db", tmp_path / "catalog.db", tmp_path / "shards")
+    registry = ShardRegistry(str(tmp_path / "shards"), f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}", "default")
+    previous = getattr(ShardedSession, "registry", None)
+    ShardedSession.registry = registry
+    try:
+        session = ShardedSession(info={"clinic_id": 2})
+        assert session.get_bind(Patient.__mapper__).url.database.endswith("clinic_2.db")
+        assert session.get_bind(User.__mapper__).url.database.endswith("catalog.db")
+        with pytest.raises(LookupError):
+            ShardedSession().get_bind(Patient.__mapper__)
+        session.close()
+    finally:
+        ShardedSession.registry = previous
+        await registry.dispose()
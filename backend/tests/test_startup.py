@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+
+import app.main as main
+from app.core.lifecycle import lifecycle
+from app.db.init_db import init_db
+from app.db.session import async_session
+from app.main import app, shutdown_event, startup_event
+
+BOOT_BUDGET_SECONDS = 1.0
+
+
+@pytest.mark.asyncio
+async def test_warm_boot_is_fast_and_sweeps_in_background(monkeypatch):
+    # The first boot may still have to stamp the schema version.
+    async with async_session() as session:
+        await init_db(session)
+    async with async_session() as session:
+        assert await init_db(session) is False
+
+    release = asyncio.Event()
+
+    async def slow_sweep() -> None:
+        await release.wait()
+
+    monkeypatch.setattr(main, "run_checks_job", slow_sweep)
+    started = time.perf_counter()
+    await startup_event()
+    boot_seconds = time.perf_counter() - started
+    try:
+        assert boot_seconds < BOOT_BUDGET_SECONDS
+        async with AsyncClient(app=app, base_url="http://testserver") as client:
+            assert (await client.get("/api/v1/health/live")).status_code == 200
+            response = await client.get("/api/v1/health/ready")
+            assert response.status_code == 200
+            assert response.json()["initial_sweep"] == "running"
+
+        release.set()
+        await lifecycle.wait_for_sweep()
+        assert lifecycle.initial_sweep == "done"
+    finally:
+        release.set()
+        await shutdown_event()
+
+
+@pytest.mark.asyncio
+async def test_not_ready_before_startup():
+    lifecycle.booting()
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        response = await client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
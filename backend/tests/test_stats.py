@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.log_writer import VerificationLogWriter
+from app.db.models import Appointment, Clinic, InsuranceRecord, Patient, VerificationStatus
+from app.db.session import get_session
+from app.services.dashboard import compute_dashboard_summary
+from app.services.stats import get_verification_stats
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_log_writes(session: AsyncSession):
+    clinic = Clinic(name="Stats Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.commit()
+
+    now = datetime.utcnow()
+    writer = VerificationLogWriter(batch_size=4, flush_interval=0.05, max_pending=100)
+    statuses = [VerificationStatus.verified] * 3 + [VerificationStatus.expired, VerificationStatus.needs_review]
+    for index, status in enumerate(statuses):
+        await writer.write(
+            {
+                "clinic_id": clinic.id,
+                "patient_id": 1,
+                "appointment_id": None,
+                "status": status,
+                "provider": "Aetna" if index % 2 else "Cigna",
+                "copay": 20.0 if status is VerificationStatus.verified else None,
+                "last_checked": now,
+                "details": "Rollup test.",
+            }
+        )
+    await writer.stop()
+
+    stats = await get_verification_stats(session, clinic.id, now - timedelta(days=1), now, "day")
+    assert stats.totals.scanned == 5
+    assert stats.totals.verified == 3
+    assert stats.totals.failed == 1
+    assert stats.totals.success_rate == 60.0
+    assert sum(payer.scanned for payer in stats.payers) == 5
+    assert sum(point.scanned for point in stats.trend) == 5
+
+    hourly = await get_verification_stats(session, clinic.id, now - timedelta(hours=1), now, "hour")
+    assert hourly.totals.scanned == 5
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_groups_window(session: AsyncSession):
+    clinic = Clinic(name="Dashboard Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.flush()
+    now = datetime.utcnow()
+    uninsured = Patient(clinic_id=clinic.id, first_name="Dana", last_name="Board")
+    lapsed = Patient(clinic_id=clinic.id, first_name="Eli", last_name="Board")
+    session.add_all([uninsured, lapsed])
+    await session.flush()
+    session.add(
+        InsuranceRecord(
+            patient_id=lapsed.id,
+            provider="Aetna",
+            status=VerificationStatus.expired,
+            last_checked=now,
+        )
+    )
+    for offset, patient, provider, status in [
+        (2, uninsured, "Dr. Lee", VerificationStatus.verified),
+        (5, uninsured, "Dr. Lee", VerificationStatus.needs_review),
+        (30, lapsed, "Dr. Kim", VerificationStatus.verified),
+        (200, lapsed, "Dr. Kim", VerificationStatus.verified),
+    ]:
+        session.add(
+            Appointment(
+                clinic_id=clinic.id,
+                patient_id=patient.id,
+                scheduled_time=now + timedelta(hours=offset),
+                provider=provider,
+                verification_status=status,
+            )
+        )
+    await session.commit()
+
+    summary = await compute_dashboard_summary(clinic.id, 72)
+    assert summary.total == 3
+    assert summary.by_status == {"verified": 1, "needs_review": 1, "expired": 1}
+    assert [(row.provider, row.total, row.verified, row.expired) for row in summary.providers] == [
+        ("Dr. Lee", 2, 1, 0),
+        ("Dr. Kim", 1, 0, 1),
+    ]
+    assert summary.expiring_coverage == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_reloading():
+    cache: StaleWhileRevalidateCache[int] = StaleWhileRevalidateCache(max_entries=10, ttl=0.1, stale_ttl=60)
+    loads = []
+
+    async def load() -> int:
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return len(loads)
+
+    assert await asyncio.gather(cache.get("k", load), cache.get("k", load)) == [(1, False), (1, False)]
+    await asyncio.sleep(0.15)
+    assert await cache.get("k", load) == (1, True)
+    assert await cache.get("k", load) == (1, True)
+    await asyncio.sleep(0.03)
+    assert await cache.get("k", load) == (2, False)
+    assert len(loads) == 2
+    await cache.stop()
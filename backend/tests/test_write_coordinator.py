@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.write_coordinator import WriteCoordinator
+from app.db.models import Clinic
+from app.db.session import engine, get_session
+
+
+@pytest.fixture
+async def session():
+    async for session in get_session():
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_failed_unit_does_not_sink_the_batch(session: AsyncSession):
+    coordinator = WriteCoordinator(max_batch=16, window=0.01, max_pending=100)
+
+    def insert_clinic(name: str, fail: bool = False):
+        async def unit(write_session: AsyncSession) -> int:
+            clinic = Clinic(name=name, timezone="UTC")
+            write_session.add(clinic)
+            await write_session.flush()
+            if fail:
+                raise ValueError(name)
+            return clinic.id
+
+        return unit
+
+    names = [f"Coordinated Clinic {index}" for index in range(5)]
+    results = await asyncio.gather(
+        *[coordinator.submit(insert_clinic(name, fail=index == 2)) for index, name in enumerate(names)],
+        return_exceptions=True,
+    )
+    await coordinator.stop()
+
+    assert isinstance(results[2], ValueError)
+    assert all(isinstance(result, int) for index, result in enumerate(results) if index != 2)
+    stored = (await session.execute(select(Clinic.name).where(Clinic.name.in_(names)))).scalars().all()
+    assert sorted(stored) == sorted(name for index, name in enumerate(names) if index != 2)
+
+
+@pytest.mark.asyncio
+async def test_writer_sessions_begin_immediate(session: AsyncSession):
+    begins: list[str] = []
+
+    def record_begin(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("BEGIN"):
+            begins.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record_begin)
+    try:
+        session.add(Clinic(name="Immediate Clinic", timezone="UTC"))
+        await session.commit()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record_begin)
+
+    assert begins == ["BEGIN IMMEDIATE"]
+
+
+@pytest.mark.asyncio
+async def test_read_then_write_survives_a_concurrent_coordinator_commit(session: AsyncSession):
+    coordinator = WriteCoordinator(max_batch=16, window=0.0, max_pending=100)
+    clinic = Clinic(name="Interleaved Clinic", timezone="UTC")
+    session.add(clinic)
+    await session.commit()
+
+    async def rename(write_session: AsyncSession) -> None:
+        await write_session.execute(update(Clinic).where(Clinic.id == clinic.id).values(timezone="America/Chicago"))
+
+    # A coordinated batch is submitted between the request session's read and its write.
+    # A deferred BEGIN would fail that write at once with a stale WAL snapshot.
+    await session.execute(select(Clinic.name).where(Clinic.id == clinic.id))
+    committed = asyncio.create_task(coordinator.submit(rename))
+    await asyncio.sleep(0.05)
+    await session.execute(update(Clinic).where(Clinic.id == clinic.id).values(name="Interleaved Clinic 2"))
+    await session.commit()
+    await committed
+    await coordinator.stop()
+
+    stored = (await session.execute(select(Clinic.name, Clinic.timezone).where(Clinic.id == clinic.id))).one()
+    assert tuple(stored) == ("Interleaved Clinic 2", "America/Chicago")
@@ -12,6 +12,8 @@ function Dashboard() {
   const appointmentsError = useAppStore(state => state.appointmentsError)
   const loadAlerts = useAppStore(state => state.loadAlerts)
   const alerts = useAppStore(state => state.alerts)
+  const dashboardSummary = useAppStore(state => state.dashboardSummary)
+  const loadDashboardSummary = useAppStore(state => state.loadDashboardSummary)
   const [searchTerm, setSearchTerm] = useState('')
   const [statusFilter, setStatusFilter] = useState('all')
   const [timeRange, setTimeRange] = useState(720)
@@ -39,7 +41,9 @@ function Dashboard() {
       .sort((a, b) => new Date(a.dateTime) - new Date(b.dateTime))
   }, [appointments, searchTerm, statusFilter, timeRange])
   
-  const stats = {
+  // Unfiltered counts come from the server-side summary; search and status filters still narrow the loaded rows.
+  const useSummary = dashboardSummary?.hours === timeRange && !searchTerm && statusFilter === 'all'
+  const stats = useSummary ? dashboardSummary : {
     total: appointmentsInRange.length,
     verified: appointmentsInRange.filter(a => a.insuranceStatus === 'Verified').length,
     needsReview: appointmentsInRange.filter(a => a.insuranceStatus === 'Needs Review').length,
@@ -51,14 +55,19 @@ function Dashboard() {
     loadAlerts()
   }, [loadAppointments, loadAlerts])
 
+  useEffect(() => {
+    loadDashboardSummary(timeRange)
+  }, [loadDashboardSummary, timeRange])
+
   // Auto-refresh appointments every 5 minutes
   useEffect(() => {
     const interval = setInterval(() => {
       loadAppointments()
+      loadDashboardSummary(timeRange)
     }, 5 * 60 * 1000) // 5 minutes
 
     return () => clearInterval(interval)
-  }, [loadAppointments])
+  }, [loadAppointments, loadDashboardSummary, timeRange])
   
   return (
     <div className="p-4 md:p-8">
@@ -70,7 +79,10 @@ function Dashboard() {
             <p className="text-slate-600 dark:text-slate-400 text-lg">Manage insurance verification for upcoming appointments</p>
           </div>
           <button
-            onClick={() => loadAppointments()}
+            onClick={() => {
+              loadAppointments()
+              loadDashboardSummary(timeRange)
+            }}
             className="flex items-center gap-2 px-4 py-2 bg-healthcare-blue text-white rounded-lg hover:bg-blue-700 transition-colors"
           >
             <RefreshCw size={18} />
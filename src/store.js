@@ -202,6 +202,7 @@ export const useAppStore = create((set, get) => ({
   appointments: [],
   alerts: [],
   patients: [],
+  dashboardSummary: null,
   theme: localStorage.getItem('theme') || 'light',
   appointmentsLoading: false,
   appointmentsError: null,
@@ -285,10 +286,23 @@ export const useAppStore = create((set, get) => ({
   loadPatients: async () => {
     set({ patientsLoading: true, patientsError: null })
     try {
-      const data = await fetchJson(`${API_BASE_URL}/patients`, {
-        headers: { ...authHeader() }
-      })
-      const patients = (data || []).map((patient) => ({
+      // GET /patients is paged; follow X-Next-Cursor until the whole clinic list is loaded.
+      const rows = []
+      let cursor = null
+      do {
+        const params = new URLSearchParams({ limit: '500' })
+        if (cursor) params.set('cursor', cursor)
+        const response = await fetch(`${API_BASE_URL}/patients?${params}`, {
+          headers: { 'Content-Type': 'application/json', ...authHeader() }
+        })
+        if (!response.ok) {
+          const message = await response.text()
+          throw new Error(message || 'Request failed')
+        }
+        rows.push(...(await response.json()))
+        cursor = response.headers.get('X-Next-Cursor')
+      } while (cursor)
+      const patients = rows.map((patient) => ({
         id: patient.id,
         firstName: patient.first_name,
         lastName: patient.last_name,
@@ -385,6 +399,28 @@ export const useAppStore = create((set, get) => ({
     }
   },
   
+  loadDashboardSummary: async (hoursAhead = 72) => {
+    try {
+      const params = new URLSearchParams({ hours: hoursAhead })
+      const data = await fetchJson(`${API_BASE_URL}/stats/dashboard?${params.toString()}`, {
+        headers: { ...authHeader() }
+      })
+      set({
+        dashboardSummary: {
+          hours: hoursAhead,
+          total: data.total,
+          verified: data.by_status.verified,
+          needsReview: data.by_status.needs_review,
+          expired: data.by_status.expired,
+          expiringCoverage: data.expiring_coverage,
+          providers: data.providers
+        }
+      })
+    } catch (err) {
+      console.error('Failed to load dashboard summary:', err)
+    }
+  },
+
   loadAlerts: async () => {
     try {
       const data = await fetchJson(`${API_BASE_URL}/alerts`, {